@@ -12,18 +12,46 @@ A containerized boxing analysis API that provides:
 Connects to Google Cloud Firestore for data persistence.
 """
 import os
+import atexit
+import hashlib
+import itertools
+import multiprocessing
+import queue
+from bisect import bisect_left, bisect_right
+import secrets
+import shutil
 import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from functools import wraps
 from pathlib import Path
 
-from flask import Flask, request, jsonify, make_response
+from flask import Flask, request, jsonify, make_response, g
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from google.api_core.exceptions import FailedPrecondition
 from google.cloud import firestore
 import jwt
+import numpy as np
 from jwt.exceptions import InvalidTokenError
 from passlib.context import CryptContext
+from pydantic import BaseModel, ValidationError
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
 
 # Import video analysis modules
 try:
@@ -39,15 +67,106 @@ except ImportError:
 # ============================================================================
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "10"))
+pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=BCRYPT_ROUNDS, deprecated="auto")
+# Max concurrent bcrypt hashes/verifies (bcrypt releases the GIL; more than one per core just thrashes)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 4)))
 
 # JWT Configuration
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-this-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+_ALGORITHMS = [ALGORITHM]
+
+# Reusable PyJWT instance with verification options pinned once at import
+_jwt = jwt.PyJWT(options={
+    "verify_signature": True,
+    "verify_exp": True,
+    "require": ["exp", "sub"]
+})
+
+# Numeric round fields averaged by /api/dashboard_stats
+DASHBOARD_FIELDS = ('pressure_score', 'ring_control_score', 'defense_score', 'clean_shots_taken')
+
+# Fields of the most recent round needed for the next game plan (its strategy
+# was computed and stored when the round was logged)
+GAME_PLAN_FIELDS = ['strategy_title', 'strategy_text', 'date']
+
+# Firestore clients to round-robin across (spreads load over gRPC channels)
+FIRESTORE_CLIENT_POOL_SIZE = int(os.getenv("FIRESTORE_CLIENT_POOL_SIZE", str(os.cpu_count() or 4)))
+
+# Worker threads for overlapping independent Firestore reads within a request
+FIRESTORE_IO_WORKERS = int(os.getenv("FIRESTORE_IO_WORKERS", "10"))
+
+# Buffer /api/log_round writes and commit them in background WriteBatches
+# (the round id is returned before the write is durable)
+BUFFER_ROUND_WRITES = os.getenv("BUFFER_ROUND_WRITES", "false").lower() == "true"
+ROUND_WRITE_BATCH_SIZE = 500  # Firestore WriteBatch limit
+ROUND_WRITE_FLUSH_MS = int(os.getenv("ROUND_WRITE_FLUSH_MS", "200"))
+# Commit attempts per buffered batch before its rounds are re-queued
+ROUND_WRITE_MAX_ATTEMPTS = int(os.getenv("ROUND_WRITE_MAX_ATTEMPTS", "5"))
+ROUND_WRITE_RETRY_BASE_MS = int(os.getenv("ROUND_WRITE_RETRY_BASE_MS", "200"))
+
+# Upper bound on rounds accepted by /api/log_rounds
+MAX_ROUNDS_PER_REQUEST = 2000
+
+# Worker processes for background MediaPipe video analysis. Each gunicorn
+# worker has its own pool, so by default the cores are split between them.
+VIDEO_ANALYSIS_WORKERS = int(os.getenv(
+    "VIDEO_ANALYSIS_WORKERS",
+    str(max(1, (os.cpu_count() or 2) // int(os.getenv("GUNICORN_WORKERS", "2"))))
+))
+
+# Analysis jobs still "processing" after this long are reported as failed:
+# the worker (or instance) that owned them is assumed to have died
+VIDEO_JOB_TIMEOUT_SECONDS = int(os.getenv("VIDEO_JOB_TIMEOUT_SECONDS", "1800"))
+
+# Buffer size for copying uploaded videos to disk (werkzeug's save() uses 16 KB)
+UPLOAD_COPY_BUFFER_SIZE = 1024 * 1024
+
+# Validated token cache (process-local, bounded by each token's exp claim)
+TOKEN_CACHE_MAXSIZE = int(os.getenv("TOKEN_CACHE_MAXSIZE", "10000"))
+# Longest a cached Firestore profile may authenticate requests (caps the
+# user cache TTL for id lookups), so deactivations are picked up quickly
+TOKEN_CACHE_USER_TTL_SECONDS = int(os.getenv("TOKEN_CACHE_USER_TTL_SECONDS", "10"))
+
+# Firestore user documents cached by id and username (process-local)
+USER_CACHE_MAXSIZE = int(os.getenv("USER_CACHE_MAXSIZE", "5000"))
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (falls back to Flask's default for unknown types)."""
+
+    option = (
+        orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if ORJSON_AVAILABLE else 0
+    )
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self.option | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
 
 # Initialize Flask app
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+# Compress JSON responses (rounds_history can run to hundreds of KB), Brotli first
+if COMPRESS_AVAILABLE:
+    app.config.update(
+        COMPRESS_ALGORITHM=['br', 'gzip'],
+        COMPRESS_BR_LEVEL=4,
+        COMPRESS_LEVEL=4,
+        COMPRESS_MIN_SIZE=500
+    )
+    Compress(app)
 # Enable CORS for all routes, origins, and methods
 CORS(app, resources={r"/*": {
     "origins": "*",
@@ -57,49 +176,183 @@ CORS(app, resources={r"/*": {
     "supports_credentials": False
 }})
 
-# Initialize Firestore client
+# Preflight responses are identical for every route, so build the headers once.
+# Flask-CORS skips responses that already carry Access-Control-Allow-Origin.
+_PREFLIGHT_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+    'Access-Control-Max-Age': '7200'
+}
+
+
+@app.before_request
+def _short_circuit_preflight():
+    """Answer CORS preflight requests before routing to a view."""
+    if request.method == 'OPTIONS':
+        return '', 204, _PREFLIGHT_HEADERS
+
+# Initialize a small pool of Firestore clients (one gRPC channel each)
 try:
-    _firestore_client = firestore.Client()
-    _rounds_collection = _firestore_client.collection('rounds')
-    _users_collection = _firestore_client.collection('users')
+    _client_pool = [firestore.Client() for _ in range(max(1, FIRESTORE_CLIENT_POOL_SIZE))]
+    _firestore_client = _client_pool[0]
     print("[OK] Connected to Firestore successfully")
 except Exception as e:
     print(f"[WARNING] Firestore initialization warning: {e}")
+    _client_pool = []
     _firestore_client = None
-    _rounds_collection = None
-    _users_collection = None
+
+_client_cycle = itertools.cycle(_client_pool)
+_client_cycle_lock = threading.Lock()
+
+
+def _next_client() -> firestore.Client:
+    """Pick the next Firestore client from the pool (round-robin)."""
+    with _client_cycle_lock:
+        return next(_client_cycle)
+
+
+def _rounds_collection():
+    """Rounds collection on the next pooled client."""
+    return _next_client().collection('rounds')
+
+
+def _users_collection():
+    """Users collection on the next pooled client."""
+    return _next_client().collection('users')
+
+# The Firestore client is thread-safe, so one pool serves all requests
+_executor = ThreadPoolExecutor(max_workers=FIRESTORE_IO_WORKERS)
+
+def _video_jobs_collection():
+    """Video analysis jobs collection on the next pooled client."""
+    return _next_client().collection('video_jobs')
+
+
+_video_pool: Optional[ProcessPoolExecutor] = None
+_video_pool_lock = threading.Lock()
+
+
+def _video_executor() -> ProcessPoolExecutor:
+    """Process pool for MediaPipe analysis, created on first use."""
+    global _video_pool
+    with _video_pool_lock:
+        if _video_pool is None:
+            # spawn, not fork: forking after gRPC threads start is unsafe
+            _video_pool = ProcessPoolExecutor(
+                max_workers=VIDEO_ANALYSIS_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _video_pool
+
+
+# ============================================================================
+# Buffered Round Writes
+# ============================================================================
+
+_round_write_queue: "queue.Queue[Tuple[Any, dict]]" = queue.Queue()
+
+
+def _commit_round_writes(pending: List[Tuple[Any, dict]]) -> bool:
+    """
+    Commit buffered (doc_ref, round_doc) pairs in a single WriteBatch.
+    
+    The ids were already returned to clients, so a failed commit is retried
+    with exponential backoff (set() on a pre-generated id is idempotent).
+    If every attempt fails the pairs are put back on the queue for a later
+    flush rather than dropped. Returns whether the batch was committed.
+    """
+    try:
+        for attempt in range(ROUND_WRITE_MAX_ATTEMPTS):
+            try:
+                batch = _next_client().batch()
+                for doc_ref, round_doc in pending:
+                    batch.set(doc_ref, round_doc)
+                batch.commit()
+                return True
+            except Exception as e:
+                app.logger.warning(
+                    f"Flushing {len(pending)} buffered rounds failed "
+                    f"(attempt {attempt + 1}/{ROUND_WRITE_MAX_ATTEMPTS}): {str(e)}"
+                )
+                if attempt + 1 < ROUND_WRITE_MAX_ATTEMPTS:
+                    time.sleep(ROUND_WRITE_RETRY_BASE_MS * (2 ** attempt) / 1000.0)
+        app.logger.error(
+            f"Re-queueing {len(pending)} buffered rounds after "
+            f"{ROUND_WRITE_MAX_ATTEMPTS} failed commits: "
+            f"{', '.join(doc_ref.id for doc_ref, _ in pending)}"
+        )
+        for item in pending:
+            _round_write_queue.put(item)
+        return False
+    finally:
+        for _ in pending:
+            _round_write_queue.task_done()
+
+
+def _round_writer_loop() -> None:
+    """Drain the write queue, flushing every ROUND_WRITE_BATCH_SIZE docs or ROUND_WRITE_FLUSH_MS."""
+    while True:
+        pending = [_round_write_queue.get()]
+        deadline = time.monotonic() + ROUND_WRITE_FLUSH_MS / 1000.0
+        while len(pending) < ROUND_WRITE_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                pending.append(_round_write_queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        _commit_round_writes(pending)
+
+
+if BUFFER_ROUND_WRITES and _firestore_client is not None:
+    threading.Thread(target=_round_writer_loop, name="round-writer", daemon=True).start()
+    # Wait for queued rounds to be committed before the worker exits
+    atexit.register(_round_write_queue.join)
 
 
 # ============================================================================
 # Password & JWT Functions
 # ============================================================================
 
+# bcrypt work runs on a bounded pool so a burst of logins can't take every core
+# away from the request threads serving authenticated (token-cached) traffic
+_password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return _password_executor.submit(pwd_context.verify, plain_password, hashed_password).result()
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password using bcrypt."""
-    return pwd_context.hash(password)
+    return _password_executor.submit(pwd_context.hash, password).result()
+
+
+# Verified against on unknown usernames so login timing doesn't reveal which users exist
+_DUMMY_HASH = get_password_hash("dummy-password-for-timing")
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        ttl_seconds = int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+        ttl_seconds = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    to_encode["exp"] = int(time.time()) + ttl_seconds
+    encoded_jwt = _jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
 def decode_token(token: str) -> Optional[dict]:
     """Decode and validate a JWT token."""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _jwt.decode(token, SECRET_KEY, algorithms=_ALGORITHMS)
         return payload
     except InvalidTokenError:
         return None
@@ -107,28 +360,115 @@ def decode_token(token: str) -> Optional[dict]:
         return None
 
 
+# ============================================================================
+# Caches
+# ============================================================================
+
+class _TTLCache:
+    """Thread-safe LRU cache whose entries expire at a per-entry deadline."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        """Return the cached value for key, or None if absent/expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Any, value: Any, expires_at: float) -> None:
+        """Store value until the epoch time expires_at, evicting the least recently used."""
+        if expires_at <= time.time():
+            return
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Any) -> None:
+        """Drop key if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# blake2b(token) -> decoded payload; only successful validations are stored.
+# Profiles are not kept here: the user cache owns their freshness.
+_token_cache = _TTLCache(TOKEN_CACHE_MAXSIZE)
+
+# ('id' | 'username', value) -> user dict loaded from Firestore
+_user_cache = _TTLCache(USER_CACHE_MAXSIZE)
+
+
+def _token_cache_key(token: str) -> bytes:
+    """Hash a raw bearer token into a compact cache key."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _token_cache_get(key: bytes) -> Optional[dict]:
+    """Return the cached payload for a token key, or None if absent/expired."""
+    return _token_cache.get(key)
+
+
+def _token_cache_put(key: bytes, payload: dict) -> None:
+    """Cache a validated token until its exp claim (capped at the access token lifetime)."""
+    now = time.time()
+    max_ttl = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    _token_cache.set(key, payload, min(float(payload.get('exp', now)), now + max_ttl))
+
+
+def _cache_user(user: dict) -> None:
+    """
+    Cache a Firestore user under both its id and username.
+
+    Id entries authenticate requests, so they expire after at most
+    TOKEN_CACHE_USER_TTL_SECONDS: that bounds how long a deactivated user
+    keeps access.
+    """
+    now = time.time()
+    _user_cache.set(
+        ('id', user['id']), user,
+        now + min(USER_CACHE_TTL_SECONDS, TOKEN_CACHE_USER_TTL_SECONDS)
+    )
+    _user_cache.set(('username', user['username']), user, now + USER_CACHE_TTL_SECONDS)
+
+
 # ============================================================================
 # User Store Functions
 # ============================================================================
 
 def create_user(username: str, email: str, password: str, full_name: str = None) -> dict:
     """Create a new user."""
-    if _users_collection is None:
+    if _firestore_client is None:
         raise Exception("Firestore not available")
     
-    # Check if username exists
-    existing = list(_users_collection.where('username', '==', username).limit(1).get())
-    if existing:
-        raise ValueError(f"Username '{username}' already exists")
-    
-    # Check if email exists
-    existing = list(_users_collection.where('email', '==', email).limit(1).get())
-    if existing:
+    # Check username and email uniqueness in a single query
+    existing = next(_users_collection().where(filter=firestore.Or([
+        firestore.FieldFilter('username', '==', username),
+        firestore.FieldFilter('email', '==', email)
+    ])).limit(1).stream(), None)
+    if existing is not None:
+        if (existing.to_dict() or {}).get('username') == username:
+            raise ValueError(f"Username '{username}' already exists")
         raise ValueError(f"Email '{email}' already exists")
     
     # Create user document
-    import uuid
-    user_id = str(uuid.uuid4())
+    user_id = secrets.token_hex(16)
     user_doc = {
         'id': user_id,
         'username': username,
@@ -140,58 +480,102 @@ def create_user(username: str, email: str, password: str, full_name: str = None)
         'is_verified': False
     }
     
-    _users_collection.document(user_id).set(user_doc)
+    _users_collection().document(user_id).set(user_doc)
     user_doc.pop('hashed_password')
     return user_doc
 
 
 def get_user_by_username(username: str) -> Optional[dict]:
     """Get user by username."""
-    if _users_collection is None:
+    if _firestore_client is None:
         return None
-    docs = list(_users_collection.where('username', '==', username).limit(1).get())
-    if not docs:
+    user = _user_cache.get(('username', username))
+    if user is not None:
+        return user
+    doc = next(_users_collection().where(filter=firestore.FieldFilter('username', '==', username)).limit(1).stream(), None)
+    if doc is None:
         return None
-    return docs[0].to_dict()
+    user = doc.to_dict()
+    _cache_user(user)
+    return user
 
 
 def get_user_by_id(user_id: str) -> Optional[dict]:
     """Get user by ID."""
-    if _users_collection is None:
+    if _firestore_client is None:
         return None
-    doc = _users_collection.document(user_id).get()
+    user = _user_cache.get(('id', user_id))
+    if user is not None:
+        return user
+    doc = _users_collection().document(user_id).get()
     if not doc.exists:
         return None
-    return doc.to_dict()
+    user = doc.to_dict()
+    _cache_user(user)
+    return user
 
 
 # ============================================================================
 # Authentication Decorators
 # ============================================================================
 
-def get_current_user() -> Optional[dict]:
-    """Get current user from request Authorization header."""
-    auth_header = request.headers.get('Authorization')
-    if not auth_header:
+def _extract_bearer_token(auth_header: Optional[str]) -> Optional[str]:
+    """Return the token from a 'Bearer <token>' header without splitting the whole string."""
+    if not auth_header or len(auth_header) < 8 or auth_header[:7].lower() != 'bearer ':
         return None
-    
-    parts = auth_header.split()
-    if len(parts) != 2 or parts[0].lower() != 'bearer':
+    token = auth_header[7:].strip()
+    if not token or ' ' in token:
         return None
-    
-    token = parts[1]
-    payload = decode_token(token)
-    if not payload:
+    return token
+
+
+def _claims_user(payload: dict) -> Optional[dict]:
+    """Build a lightweight user dict from signed session claims, if the token carries them."""
+    if 'username' not in payload or 'is_active' not in payload:
         return None
-    
-    user_id = payload.get('sub')
-    if not user_id:
+    return {
+        'id': payload['sub'],
+        'username': payload['username'],
+        'is_active': payload['is_active']
+    }
+
+
+def get_current_user(full: bool = False) -> Optional[dict]:
+    """
+    Get current user from request Authorization header.
+
+    By default the user is built from the token's signed claims (id, username,
+    is_active) without touching Firestore. Pass full=True when the caller needs
+    the stored profile (email, full_name, ...); tokens issued without session
+    claims always fall back to Firestore.
+    """
+    token = _extract_bearer_token(request.headers.get('Authorization'))
+    if token is None:
         return None
     
-    user = get_user_by_id(user_id)
+    cache_key = _token_cache_key(token)
+    payload = _token_cache_get(cache_key)
+    cached = payload is not None
+    if not cached:
+        payload = decode_token(token)
+        if not payload or not payload.get('sub'):
+            return None
+    
+    if not full:
+        claims_user = _claims_user(payload)
+        if claims_user is not None:
+            if not claims_user['is_active']:
+                return None
+            if not cached:
+                _token_cache_put(cache_key, payload)
+            return claims_user
+    
+    # Served from the user cache for at most TOKEN_CACHE_USER_TTL_SECONDS
+    user = get_user_by_id(payload['sub'])
     if not user or not user.get('is_active', False):
         return None
-    
+    if not cached:
+        _token_cache_put(cache_key, payload)
     return user
 
 
@@ -205,95 +589,259 @@ def require_auth(f):
                 'status': 'error',
                 'message': 'Authentication required'
             }), 401
+        g.current_user = user
         return f(*args, **kwargs)
     return decorated_function
 
 
+def current_user() -> Optional[dict]:
+    """Return the user authenticated by require_auth for this request."""
+    return g.get('current_user')
+
+
+# ============================================================================
+# Request Models
+# ============================================================================
+
+class RoundIn(BaseModel):
+    """Validated /api/log_round payload."""
+    pressure_score: float
+    ring_control_score: float
+    defense_score: float
+    clean_shots_taken: int
+    notes: Optional[str] = ''
+
+
+def _round_payload_error(error: ValidationError) -> str:
+    """Turn a RoundIn validation error into the API's error message."""
+    errors = error.errors()
+    if any(e['type'] in ('json_invalid', 'model_type') for e in errors):
+        return 'Invalid or missing JSON payload'
+    missing_fields = [str(e['loc'][0]) for e in errors if e['type'] == 'missing']
+    if missing_fields:
+        return f'Missing required fields: {", ".join(missing_fields)}'
+    return f'Invalid data type: {errors[0]["loc"][0]}: {errors[0]["msg"]}'
+
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
 def calculate_danger(round_data: Dict[str, Any]) -> float:
     """Calculate danger score from round metrics."""
-    clean = round_data.get('clean_shots_taken', 0) / 5.0
-    defense = (10 - round_data.get('defense_score', 5)) / 10.0
-    control = (10 - round_data.get('ring_control_score', 5)) / 10.0
-    score = (0.5 * clean) + (0.3 * defense) + (0.2 * control)
+    get = round_data.get
+    score = (
+        0.5 * (get('clean_shots_taken', 0) / 5.0)
+        + 0.3 * ((10 - get('defense_score', 5)) / 10.0)
+        + 0.2 * ((10 - get('ring_control_score', 5)) / 10.0)
+    )
     return max(0.0, min(score, 1.0))
 
 
+# Strategies ordered by rising danger; _STRATEGY_THRESHOLDS are the lower bounds of the upper tiers
+_STRATEGY_THRESHOLDS = (0.4, 0.7)
+_STRATEGIES = (
+    (
+        "PRESSURE_BODY",
+        "Walk him down. Invest in the body and arms. Bully, clinch, drown him."
+    ),
+    (
+        "RING_CUTTING",
+        "Smart pressure. Cut exits, feint to draw counters. No ego wars. Control space."
+    ),
+    (
+        "DEFENSE_FIRST",
+        "High guard, active feet. Max 2-punch combos. Pump the jab, angle off. Do not trade."
+    ),
+)
+
+
 def get_strategy(danger_score: float) -> Tuple[str, str]:
     """Get recommended boxing strategy based on danger score."""
-    if danger_score >= 0.7:
-        return (
-            "DEFENSE_FIRST",
-            "High guard, active feet. Max 2-punch combos. Pump the jab, angle off. Do not trade."
-        )
-    elif danger_score >= 0.4:
-        return (
-            "RING_CUTTING",
-            "Smart pressure. Cut exits, feint to draw counters. No ego wars. Control space."
-        )
-    else:
-        return (
-            "PRESSURE_BODY",
-            "Walk him down. Invest in the body and arms. Bully, clinch, drown him."
-        )
+    return _STRATEGIES[bisect_right(_STRATEGY_THRESHOLDS, danger_score)]
+
+
+# Column order of the metrics array taken by calculate_danger_batch
+_DANGER_METRICS = ('clean_shots_taken', 'defense_score', 'ring_control_score')
+
+
+def calculate_danger_batch(rounds: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_danger over an (N, 3) array.
+    
+    Columns are [clean_shots_taken, defense_score, ring_control_score]; the
+    arithmetic matches calculate_danger term for term, so scores are identical.
+    Works in place on two scratch arrays rather than one temporary per operation.
+    """
+    score = np.divide(rounds[:, 0], 5.0)
+    score *= 0.5
+    term = np.subtract(10, rounds[:, 1])
+    term /= 10.0
+    term *= 0.3
+    score += term
+    np.subtract(10, rounds[:, 2], out=term)
+    term /= 10.0
+    term *= 0.2
+    score += term
+    return np.clip(score, 0.0, 1.0, out=score)
+
+
+def get_strategy_batch(danger_scores: np.ndarray) -> List[Tuple[str, str]]:
+    """Get the strategy for each danger score (same tiers as get_strategy)."""
+    tiers = np.searchsorted(_STRATEGY_THRESHOLDS, danger_scores, side='right')
+    return [_STRATEGIES[tier] for tier in tiers.tolist()]
+
+
+def _round_doc(user: dict, round_fields: Dict[str, Any], danger_score: float,
+               strategy: Tuple[str, str]) -> Dict[str, Any]:
+    """Assemble the Firestore document for a scored round."""
+    return {
+        'user_id': user['id'],
+        'username': user['username'],
+        **round_fields,
+        'danger_score': danger_score,
+        'strategy_title': strategy[0],
+        'strategy_text': strategy[1],
+        'date': firestore.SERVER_TIMESTAMP
+    }
+
+
+def _build_round_doc(user: dict, round_in: RoundIn) -> Dict[str, Any]:
+    """Build the Firestore document for a validated round, with danger score and strategy."""
+    round_fields = round_in.model_dump()
+    danger_score = calculate_danger(round_fields)
+    return _round_doc(user, round_fields, danger_score, get_strategy(danger_score))
+
+
+def _build_round_docs(user: dict, rounds_in: List[RoundIn]) -> List[Dict[str, Any]]:
+    """Build documents for many validated rounds, scoring them in one vectorized pass."""
+    rounds_fields = [r.model_dump() for r in rounds_in]
+    # Fill the (N, 3) metrics buffer straight from the dicts, no per-round tuples
+    metrics = np.fromiter(
+        (f[key] for f in rounds_fields for key in _DANGER_METRICS),
+        dtype=np.float64,
+        count=len(rounds_fields) * len(_DANGER_METRICS)
+    ).reshape(-1, len(_DANGER_METRICS))
+    danger_scores = calculate_danger_batch(metrics)
+    strategies = get_strategy_batch(danger_scores)
+    return [
+        _round_doc(user, fields, danger, strategy)
+        for fields, danger, strategy in zip(rounds_fields, danger_scores.tolist(), strategies)
+    ]
+
+
+def _parse_fields_param(raw: Optional[str]):
+    """
+    Parse a comma-separated ?fields= list into a Firestore projection.
+    
+    Returns None when no projection was requested, False when a field name
+    is invalid, otherwise the field list (always including 'date', which the
+    history is ordered by; 'id' is the document id, not a stored field).
+    """
+    if not raw:
+        return None
+    fields = ['date']
+    for name in raw.split(','):
+        name = name.strip()
+        if not name or name in ('id', 'date') or name in fields:
+            continue
+        if not name.isidentifier():
+            return False
+        fields.append(name)
+    return fields
 
 
 def _to_iso(ts) -> Optional[str]:
     """Convert Firestore timestamp to ISO format string."""
     if ts is None:
         return None
-    try:
+    if isinstance(ts, datetime):  # includes Firestore's DatetimeWithNanoseconds
         return ts.isoformat()
-    except Exception:
+    if isinstance(ts, (int, float)):
         try:
-            return datetime.fromtimestamp(float(ts)).isoformat()
-        except Exception:
+            return datetime.fromtimestamp(ts).isoformat()
+        except (OverflowError, OSError, ValueError):
             return str(ts)
+    return str(ts)
+
+
+# (epoch second, ISO string) of the last formatted timestamp
+_now_iso_cache: Tuple[int, str] = (0, '')
+
+
+def _utc_now_iso() -> str:
+    """Current UTC time as an ISO string, reformatted at most once per second."""
+    global _now_iso_cache
+    second = int(time.time())
+    cached = _now_iso_cache
+    if cached[0] != second:
+        cached = (second, datetime.fromtimestamp(second, timezone.utc).isoformat())
+        _now_iso_cache = cached
+    return cached[1]
+
+
+def _round_to_dict(doc) -> Dict[str, Any]:
+    """Convert a round snapshot to a JSON-ready dict with its id and ISO date."""
+    data = doc.to_dict() or {}
+    data['id'] = doc.id
+    data['date'] = _to_iso(data.get('date'))
+    return data
 
 
 # ============================================================================
 # Public Endpoints
 # ============================================================================
 
+# Static API description served by root(), encoded once at import
+_ROOT_INFO = {
+    'service': 'JKD Coach',
+    'version': '1.0.0',
+    'description': 'AI-Powered Boxing Coach API with JWT Authentication',
+    'tagline': 'Be Water. Train Smarter.',
+    'authentication': 'JWT Bearer Token',
+    'endpoints': {
+        'public': {
+            'health': '/health',
+            'register': '/auth/register (POST)',
+            'login': '/auth/login (POST)'
+        },
+        'protected': {
+            'me': '/auth/me (GET)',
+            'log_round': '/api/log_round (POST)',
+            'log_rounds': '/api/log_rounds (POST)',
+            'analyze_video': '/api/analyze_video (POST - multipart/form-data)',
+            'analyze_video_status': '/api/analyze_video/{job_id} (GET)',
+            'dashboard_stats': '/api/dashboard_stats (GET)',
+            'rounds_history': '/api/rounds_history (GET)',
+            'delete_round': '/api/rounds/{id} (DELETE)'
+        }
+    }
+}
+_ROOT_BODY = (app.json.dumps(_ROOT_INFO) + '\n').encode()
+
+# /health body around the timestamp, which is the only part that changes
+_HEALTH_BODY_PREFIX = b'{"status":"healthy","timestamp":"'
+_HEALTH_BODY_SUFFIX = {
+    True: b'","firestore":"connected"}\n',
+    False: b'","firestore":"disconnected"}\n'
+}
+
+
 @app.route('/')
 def root():
     """Root endpoint with API information."""
-    return jsonify({
-        'service': 'JKD Coach',
-        'version': '1.0.0',
-        'description': 'AI-Powered Boxing Coach API with JWT Authentication',
-        'tagline': 'Be Water. Train Smarter.',
-        'authentication': 'JWT Bearer Token',
-        'endpoints': {
-            'public': {
-                'health': '/health',
-                'register': '/auth/register (POST)',
-                'login': '/auth/login (POST)'
-            },
-            'protected': {
-                'me': '/auth/me (GET)',
-                'log_round': '/api/log_round (POST)',
-                'analyze_video': '/api/analyze_video (POST - multipart/form-data)',
-                'dashboard_stats': '/api/dashboard_stats (GET)',
-                'rounds_history': '/api/rounds_history (GET)',
-                'delete_round': '/api/rounds/{id} (DELETE)'
-            }
-        }
-    })
+    return app.response_class(_ROOT_BODY, mimetype='application/json')
 
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
-    firestore_status = "connected" if _firestore_client is not None else "disconnected"
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.utcnow().isoformat(),
-        'firestore': firestore_status
-    }), 200
+    body = (
+        _HEALTH_BODY_PREFIX
+        + _utc_now_iso().encode()
+        + _HEALTH_BODY_SUFFIX[_firestore_client is not None]
+    )
+    return app.response_class(body, mimetype='application/json'), 200
 
 
 # ============================================================================
@@ -303,7 +851,7 @@ def health_check():
 @app.route('/auth/register', methods=['POST'])
 def register():
     """Register a new user."""
-    if _users_collection is None:
+    if _firestore_client is None:
         return jsonify({
             'status': 'error',
             'message': 'Authentication not available'
@@ -369,7 +917,7 @@ def register():
 @app.route('/auth/login', methods=['POST'])
 def login():
     """Login and get JWT access token."""
-    if _users_collection is None:
+    if _firestore_client is None:
         return jsonify({
             'status': 'error',
             'message': 'Authentication not available'
@@ -395,6 +943,7 @@ def login():
         # Get user
         user = get_user_by_username(username)
         if not user:
+            verify_password(password, _DUMMY_HASH)
             return jsonify({
                 'status': 'error',
                 'message': 'Incorrect username or password'
@@ -417,7 +966,7 @@ def login():
         # Create access token
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={'sub': user['id'], 'username': user['username']},
+            data={'sub': user['id'], 'username': user['username'], 'is_active': True},
             expires_delta=access_token_expires
         )
         
@@ -439,7 +988,7 @@ def login():
 @require_auth
 def get_current_user_info():
     """Get current authenticated user information."""
-    user = get_current_user()
+    user = get_current_user(full=True)
     return jsonify({
         'id': user['id'],
         'username': user['username'],
@@ -458,53 +1007,36 @@ def get_current_user_info():
 @require_auth
 def log_round():
     """Log a new boxing round with danger score and strategy calculation."""
-    if _rounds_collection is None:
+    if _firestore_client is None:
         return jsonify({
             'status': 'error',
             'message': 'Firestore not available'
         }), 503
     
     try:
-        user = get_current_user()
-        payload = request.get_json()
-        
-        if not payload:
-            return jsonify({
-                'status': 'error',
-                'message': 'Invalid or missing JSON payload'
-            }), 400
-        
-        # Validate required fields
-        required_fields = ['pressure_score', 'ring_control_score', 'defense_score', 'clean_shots_taken']
-        missing_fields = [field for field in required_fields if field not in payload]
+        user = current_user()
         
-        if missing_fields:
+        # Parse and validate the JSON body in one pass
+        try:
+            round_in = RoundIn.model_validate_json(request.get_data(cache=False))
+        except ValidationError as e:
             return jsonify({
                 'status': 'error',
-                'message': f'Missing required fields: {", ".join(missing_fields)}'
+                'message': _round_payload_error(e)
             }), 400
         
-        # Calculate danger score and strategy
-        danger_score = calculate_danger(payload)
-        strategy_title, strategy_text = get_strategy(danger_score)
-        
-        # Prepare document with user association
-        round_doc = {
-            'user_id': user['id'],
-            'username': user['username'],
-            'pressure_score': float(payload['pressure_score']),
-            'ring_control_score': float(payload['ring_control_score']),
-            'defense_score': float(payload['defense_score']),
-            'clean_shots_taken': int(payload['clean_shots_taken']),
-            'notes': payload.get('notes', ''),
-            'danger_score': danger_score,
-            'strategy_title': strategy_title,
-            'strategy_text': strategy_text,
-            'date': firestore.SERVER_TIMESTAMP
-        }
+        # Calculate danger score and strategy, and prepare the document
+        round_doc = _build_round_doc(user, round_in)
+        danger_score = round_doc['danger_score']
+        strategy_title = round_doc['strategy_title']
+        strategy_text = round_doc['strategy_text']
         
-        # Store in Firestore
-        doc_ref, _ = _rounds_collection.add(round_doc)
+        # Store in Firestore (buffered writes return the pre-generated id immediately)
+        if BUFFER_ROUND_WRITES:
+            doc_ref = _rounds_collection().document()
+            _round_write_queue.put((doc_ref, round_doc))
+        else:
+            _, doc_ref = _rounds_collection().add(round_doc)
         
         return jsonify({
             'status': 'success',
@@ -529,24 +1061,241 @@ def log_round():
         }), 500
 
 
+@app.route('/api/log_rounds', methods=['POST'])
+@require_auth
+def log_rounds():
+    """Log several boxing rounds at once using batched Firestore writes."""
+    if _firestore_client is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Firestore not available'
+        }), 503
+    
+    try:
+        user = current_user()
+        # Parse the raw body with the app's JSON provider (orjson when installed),
+        # skipping get_json's mimetype/charset handling and its cached copy of the body
+        try:
+            payload = app.json.loads(request.get_data(cache=False))
+        except ValueError:
+            payload = None
+        items = payload.get('rounds') if isinstance(payload, dict) else payload
+        
+        if not isinstance(items, list) or not items:
+            return jsonify({
+                'status': 'error',
+                'message': 'Expected a non-empty list of rounds'
+            }), 400
+        
+        if len(items) > MAX_ROUNDS_PER_REQUEST:
+            return jsonify({
+                'status': 'error',
+                'message': f'At most {MAX_ROUNDS_PER_REQUEST} rounds per request'
+            }), 400
+        
+        # Validate every round before writing any of them
+        rounds_in = []
+        for index, item in enumerate(items):
+            try:
+                rounds_in.append(RoundIn.model_validate(item))
+            except ValidationError as e:
+                return jsonify({
+                    'status': 'error',
+                    'message': f'Round {index}: {_round_payload_error(e)}'
+                }), 400
+        round_docs = _build_round_docs(user, rounds_in)
+        
+        # One WriteBatch per ROUND_WRITE_BATCH_SIZE docs, committed concurrently.
+        # Each batch is atomic; the request as a whole is not, so a failed batch
+        # is reported per round instead of failing the rounds that were written.
+        rounds_collection = _rounds_collection()
+        doc_refs = [rounds_collection.document() for _ in round_docs]
+        futures = []
+        for start in range(0, len(round_docs), ROUND_WRITE_BATCH_SIZE):
+            batch = _next_client().batch()
+            for doc_ref, round_doc in zip(
+                doc_refs[start:start + ROUND_WRITE_BATCH_SIZE],
+                round_docs[start:start + ROUND_WRITE_BATCH_SIZE]
+            ):
+                batch.set(doc_ref, round_doc)
+            futures.append((start, _executor.submit(batch.commit)))
+        
+        committed = []
+        failed_indexes = []
+        for start, future in futures:
+            indexes = range(start, min(start + ROUND_WRITE_BATCH_SIZE, len(round_docs)))
+            try:
+                future.result()
+                committed.extend(indexes)
+            except Exception as e:
+                app.logger.error(f"Round batch at index {start} failed: {str(e)}")
+                failed_indexes.extend(indexes)
+        
+        if not committed:
+            return jsonify({
+                'status': 'error',
+                'message': 'Failed to write rounds'
+            }), 500
+        
+        rounds_out = [
+            {
+                'index': index,
+                'id': doc_refs[index].id,
+                'danger_score': round_docs[index]['danger_score'],
+                'strategy': {
+                    'title': round_docs[index]['strategy_title'],
+                    'text': round_docs[index]['strategy_text']
+                }
+            }
+            for index in committed
+        ]
+        if failed_indexes:
+            # Only the rounds listed in failed_indexes need to be resent
+            return jsonify({
+                'status': 'partial',
+                'message': f'{len(failed_indexes)} of {len(round_docs)} rounds were not written',
+                'rounds': rounds_out,
+                'failed_indexes': failed_indexes,
+                'total': len(rounds_out)
+            }), 207
+        
+        return jsonify({
+            'status': 'success',
+            'rounds': rounds_out,
+            'total': len(rounds_out)
+        }), 200
+    
+    except Exception as e:
+        app.logger.error(f"Error logging rounds: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f'Internal server error: {str(e)}'
+        }), 500
+
+
+def _store_video_round(user: dict, round_name: str, video_filename: str,
+                       notes: str, metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Score analyzed video metrics, store the round and build the API response."""
+    # Calculate danger and form scores
+    enriched_metrics = video_form_and_danger(metrics)
+
+    # Get danger score and focus recommendation
+    danger_score = enriched_metrics['video_danger_score']
+    form_score = enriched_metrics['video_form_score']
+    focus_next_round = enriched_metrics['video_focus_next_round']
+
+    # Generate coaching strategy based on danger score
+    strategy_title, strategy_text = get_strategy(danger_score)
+
+    # Prepare document for Firestore
+    round_doc = {
+        'user_id': user['id'],
+        'username': user['username'],
+        'round_name': round_name,
+        'video_filename': video_filename,
+        'notes': notes,
+
+        # Video metrics
+        'total_frames': enriched_metrics['total_frames'],
+        'pose_frames': enriched_metrics['pose_frames'],
+        'pose_coverage': enriched_metrics['pose_coverage'],
+        'guard_down_ratio': enriched_metrics['guard_down_ratio'],
+        'avg_left_guard_height': enriched_metrics['avg_left_guard_height'],
+        'avg_right_guard_height': enriched_metrics['avg_right_guard_height'],
+        'avg_hip_rotation': enriched_metrics['avg_hip_rotation'],
+        'avg_stance_width': enriched_metrics['avg_stance_width'],
+        'head_movement_score': enriched_metrics['head_movement_score'],
+
+        # Scores and recommendations
+        'danger_score': danger_score,
+        'form_score': form_score,
+        'focus_next_round': focus_next_round,
+        'strategy_title': strategy_title,
+        'strategy_text': strategy_text,
+
+        'date': firestore.SERVER_TIMESTAMP,
+        'analysis_type': 'video'
+    }
+
+    # Store in Firestore
+    _, doc_ref = _rounds_collection().add(round_doc)
+
+    # Generate coaching feedback
+    coaching_feedback = generate_video_coaching(enriched_metrics, strategy_text)
+
+    return {
+        'status': 'success',
+        'id': doc_ref.id,
+        'metrics': {
+            'total_frames': enriched_metrics['total_frames'],
+            'pose_coverage': round(enriched_metrics['pose_coverage'] * 100, 1),
+            'guard_down_ratio': round(enriched_metrics['guard_down_ratio'] * 100, 1),
+            'avg_left_guard_height': round(enriched_metrics['avg_left_guard_height'], 3),
+            'avg_right_guard_height': round(enriched_metrics['avg_right_guard_height'], 3),
+            'avg_hip_rotation': round(enriched_metrics['avg_hip_rotation'], 1),
+            'avg_stance_width': round(enriched_metrics['avg_stance_width'], 3),
+            'head_movement_score': round(enriched_metrics['head_movement_score'], 3),
+        },
+        'scores': {
+            'danger_score': round(danger_score, 2),
+            'form_score': round(form_score, 1),
+            'focus_next_round': focus_next_round
+        },
+        'strategy': {
+            'title': strategy_title,
+            'text': strategy_text
+        },
+        'coaching': coaching_feedback
+    }
+
+
+def _complete_video_job(job_ref, user: dict, round_name: str, video_filename: str,
+                        notes: str, temp_path: str, future) -> None:
+    """Store a finished analysis and record the outcome on its job document."""
+    try:
+        body = _store_video_round(user, round_name, video_filename, notes, future.result())
+        job_ref.update({'status': 'done', 'result': body})
+    except ValueError as e:
+        job_ref.update({
+            'status': 'error',
+            'code': 400,
+            'message': f'Video analysis error: {str(e)}'
+        })
+    except Exception as e:
+        app.logger.error(f"Error analyzing video: {str(e)}")
+        job_ref.update({
+            'status': 'error',
+            'code': 500,
+            'message': f'Internal server error: {str(e)}'
+        })
+    finally:
+        # Clean up temporary file
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+
 @app.route('/api/analyze_video', methods=['POST'])
 @require_auth
 def analyze_video():
-    """Analyze a boxing video and extract metrics using MediaPipe pose detection."""
+    """
+    Queue a boxing video for MediaPipe pose analysis.
+    
+    Returns 202 with a job id; poll /api/analyze_video/<job_id> for the result.
+    """
     if not VIDEO_ANALYSIS_AVAILABLE:
         return jsonify({
             'status': 'error',
             'message': 'Video analysis not available - missing dependencies'
         }), 503
 
-    if _rounds_collection is None:
+    if _firestore_client is None:
         return jsonify({
             'status': 'error',
             'message': 'Firestore not available'
         }), 503
 
     try:
-        user = get_current_user()
+        user = current_user()
 
         # Check if video file was uploaded
         if 'video' not in request.files:
@@ -567,136 +1316,136 @@ def analyze_video():
         round_name = request.form.get('round_name', 'video_round')
         notes = request.form.get('notes', '')
 
-        # Save uploaded video to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as temp_file:
-            temp_path = temp_file.name
-            video_file.save(temp_path)
+        # Stream uploaded video to a temporary file in large chunks
+        temp_fd, temp_path = tempfile.mkstemp(suffix='.mp4')
 
         try:
-            # Analyze video using MediaPipe
-            app.logger.info(f"Analyzing video: {video_file.filename}")
-            metrics = analyze_video_file(temp_path)
+            with os.fdopen(temp_fd, 'wb') as temp_file:
+                shutil.copyfileobj(video_file.stream, temp_file, UPLOAD_COPY_BUFFER_SIZE)
+
+            # Job status lives in Firestore so any worker can answer the poll
+            job_ref = _video_jobs_collection().document()
+            job_ref.set({
+                'user_id': user['id'],
+                'status': 'processing',
+                'video_filename': video_file.filename,
+                'created_at': firestore.SERVER_TIMESTAMP
+            })
+
+            app.logger.info(f"Queued video analysis {job_ref.id}: {video_file.filename}")
+            future = _video_executor().submit(analyze_video_file, temp_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
 
-            # Calculate danger and form scores
-            enriched_metrics = video_form_and_danger(metrics)
+        # Firestore writes happen on the I/O pool, not the process pool's callback thread
+        future.add_done_callback(lambda f: _executor.submit(
+            _complete_video_job, job_ref, user, round_name,
+            video_file.filename, notes, temp_path, f
+        ))
 
-            # Get danger score and focus recommendation
-            danger_score = enriched_metrics['video_danger_score']
-            form_score = enriched_metrics['video_form_score']
-            focus_next_round = enriched_metrics['video_focus_next_round']
+        return jsonify({
+            'status': 'accepted',
+            'job_id': job_ref.id,
+            'status_url': f'/api/analyze_video/{job_ref.id}'
+        }), 202
 
-            # Generate coaching strategy based on danger score
-            strategy_title, strategy_text = get_strategy(danger_score)
+    except Exception as e:
+        app.logger.error(f"Error queuing video analysis: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f'Internal server error: {str(e)}'
+        }), 500
 
-            # Prepare document for Firestore
-            round_doc = {
-                'user_id': user['id'],
-                'username': user['username'],
-                'round_name': round_name,
-                'video_filename': video_file.filename,
-                'notes': notes,
-
-                # Video metrics
-                'total_frames': enriched_metrics['total_frames'],
-                'pose_frames': enriched_metrics['pose_frames'],
-                'pose_coverage': enriched_metrics['pose_coverage'],
-                'guard_down_ratio': enriched_metrics['guard_down_ratio'],
-                'avg_left_guard_height': enriched_metrics['avg_left_guard_height'],
-                'avg_right_guard_height': enriched_metrics['avg_right_guard_height'],
-                'avg_hip_rotation': enriched_metrics['avg_hip_rotation'],
-                'avg_stance_width': enriched_metrics['avg_stance_width'],
-                'head_movement_score': enriched_metrics['head_movement_score'],
-
-                # Scores and recommendations
-                'danger_score': danger_score,
-                'form_score': form_score,
-                'focus_next_round': focus_next_round,
-                'strategy_title': strategy_title,
-                'strategy_text': strategy_text,
-
-                'date': firestore.SERVER_TIMESTAMP,
-                'analysis_type': 'video'
-            }
 
-            # Store in Firestore
-            doc_ref, _ = _rounds_collection.add(round_doc)
+@app.route('/api/analyze_video/<job_id>', methods=['GET'])
+@require_auth
+def get_video_analysis(job_id):
+    """Get the status, or the result once finished, of a queued video analysis."""
+    if _firestore_client is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Firestore not available'
+        }), 503
 
-            # Generate coaching feedback
-            coaching_feedback = generate_video_coaching(enriched_metrics, strategy_text)
+    try:
+        user = current_user()
+        job = _video_jobs_collection().document(job_id).get()
+        job_data = job.to_dict() if job.exists else None
 
+        # Don't reveal other users' jobs
+        if not job_data or job_data.get('user_id') != user['id']:
             return jsonify({
-                'status': 'success',
-                'id': doc_ref.id,
-                'metrics': {
-                    'total_frames': enriched_metrics['total_frames'],
-                    'pose_coverage': round(enriched_metrics['pose_coverage'] * 100, 1),
-                    'guard_down_ratio': round(enriched_metrics['guard_down_ratio'] * 100, 1),
-                    'avg_left_guard_height': round(enriched_metrics['avg_left_guard_height'], 3),
-                    'avg_right_guard_height': round(enriched_metrics['avg_right_guard_height'], 3),
-                    'avg_hip_rotation': round(enriched_metrics['avg_hip_rotation'], 1),
-                    'avg_stance_width': round(enriched_metrics['avg_stance_width'], 3),
-                    'head_movement_score': round(enriched_metrics['head_movement_score'], 3),
-                },
-                'scores': {
-                    'danger_score': round(danger_score, 2),
-                    'form_score': round(form_score, 1),
-                    'focus_next_round': focus_next_round
-                },
-                'strategy': {
-                    'title': strategy_title,
-                    'text': strategy_text
-                },
-                'coaching': coaching_feedback
-            }), 200
-
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+                'status': 'error',
+                'message': 'Analysis job not found'
+            }), 404
+
+        if job_data['status'] == 'done':
+            return jsonify(job_data['result']), 200
+
+        if job_data['status'] == 'error':
+            return jsonify({
+                'status': 'error',
+                'message': job_data.get('message')
+            }), job_data.get('code', 500)
+
+        # The job only lives as a future in the process that queued it; if
+        # that process died, nothing will ever finish the document
+        created_at = job_data.get('created_at')
+        if created_at and datetime.now(timezone.utc) - created_at > timedelta(seconds=VIDEO_JOB_TIMEOUT_SECONDS):
+            return jsonify({
+                'status': 'error',
+                'message': 'Video analysis timed out; please upload the video again'
+            }), 504
 
-    except ValueError as e:
         return jsonify({
-            'status': 'error',
-            'message': f'Video analysis error: {str(e)}'
-        }), 400
+            'status': 'processing',
+            'job_id': job_id
+        }), 202
+
     except Exception as e:
-        app.logger.error(f"Error analyzing video: {str(e)}")
+        app.logger.error(f"Error getting video analysis: {str(e)}")
         return jsonify({
             'status': 'error',
             'message': f'Internal server error: {str(e)}'
         }), 500
 
 
+# Coaching lines for generate_video_coaching, indexed like _STRATEGIES:
+# risk tiers share _STRATEGY_THRESHOLDS (lower bound inclusive), guard tiers
+# start strictly above each of _GUARD_THRESHOLDS
+_RISK_FEEDBACK = (
+    "[LOW RISK] Good defensive fundamentals.",
+    "[MODERATE RISK] Some defensive concerns to address.",
+    "[HIGH RISK] Your danger score is critically high.",
+)
+_GUARD_THRESHOLDS = (0.15, 0.3)
+_GUARD_FEEDBACK = (
+    "Solid guard discipline ({:.0f}% down).",
+    "Guard dropping {:.0f}% of frames - needs work.",
+    "Guard down {:.0f}% of the time - MAJOR concern.",
+)
+
+
 def generate_video_coaching(metrics: Dict[str, Any], strategy_text: str) -> str:
     """Generate coaching feedback based on video metrics."""
-    danger_score = metrics['video_danger_score']
     guard_down_ratio = metrics['guard_down_ratio']
     pose_coverage = metrics['pose_coverage']
+    hip_rotation = metrics['avg_hip_rotation']
 
-    feedback_parts = []
-
-    # Danger level assessment
-    if danger_score >= 0.7:
-        feedback_parts.append("[HIGH RISK] Your danger score is critically high.")
-    elif danger_score >= 0.4:
-        feedback_parts.append("[MODERATE RISK] Some defensive concerns to address.")
-    else:
-        feedback_parts.append("[LOW RISK] Good defensive fundamentals.")
-
-    # Guard discipline
-    if guard_down_ratio > 0.3:
-        feedback_parts.append(f"Guard down {guard_down_ratio*100:.0f}% of the time - MAJOR concern.")
-    elif guard_down_ratio > 0.15:
-        feedback_parts.append(f"Guard dropping {guard_down_ratio*100:.0f}% of frames - needs work.")
-    else:
-        feedback_parts.append(f"Solid guard discipline ({guard_down_ratio*100:.0f}% down).")
+    feedback_parts = [
+        # Danger level assessment
+        _RISK_FEEDBACK[bisect_right(_STRATEGY_THRESHOLDS, metrics['video_danger_score'])],
+        # Guard discipline
+        _GUARD_FEEDBACK[bisect_left(_GUARD_THRESHOLDS, guard_down_ratio)].format(guard_down_ratio * 100),
+    ]
 
     # Pose tracking quality
     if pose_coverage < 0.5:
         feedback_parts.append(f"Low tracking coverage ({pose_coverage*100:.0f}%) - video quality issue or angles.")
 
     # Hip rotation
-    hip_rotation = metrics['avg_hip_rotation']
     if hip_rotation < 25:
         feedback_parts.append(f"Hip rotation weak ({hip_rotation:.0f} degrees) - work on stance and pivots.")
     elif hip_rotation > 40:
@@ -712,60 +1461,53 @@ def generate_video_coaching(metrics: Dict[str, Any], strategy_text: str) -> str:
 @require_auth
 def get_dashboard_stats():
     """Get aggregated statistics for the authenticated user."""
-    if _rounds_collection is None:
+    if _firestore_client is None:
         return jsonify({
             'status': 'error',
             'message': 'Firestore not available'
         }), 503
     
     try:
-        user = get_current_user()
+        user = current_user()
         
-        # Query only the current user's rounds
-        docs = list(_rounds_collection.where('user_id', '==', user['id']).stream())
-        count = len(docs)
+        # Aggregate the current user's rounds server-side
+        user_rounds = _rounds_collection().where(filter=firestore.FieldFilter('user_id', '==', user['id']))
+        aggregation = user_rounds.count(alias='total_rounds')
+        for key in DASHBOARD_FIELDS:
+            aggregation = aggregation.sum(key, alias=key)
+        aggregation_future = _executor.submit(aggregation.get)
         
-        totals = {
-            'pressure_score': 0.0,
-            'ring_control_score': 0.0,
-            'defense_score': 0.0,
-            'clean_shots_taken': 0.0
-        }
+        # Most recent round (uses the user_id + date DESC composite index),
+        # fetched concurrently with the aggregation
+        recent_future = _executor.submit(
+            user_rounds
+            .select(GAME_PLAN_FIELDS)
+            .order_by('date', direction=firestore.Query.DESCENDING)
+            .limit(1)
+            .get
+        )
         
-        most_recent = None
-        most_recent_date = None
-        
-        for d in docs:
-            data = d.to_dict() or {}
-            
-            # Accumulate totals
-            for key in totals:
-                try:
-                    totals[key] += float(data.get(key, 0.0) or 0.0)
-                except Exception:
-                    totals[key] += 0.0
-            
-            # Track most recent round
-            date_val = data.get('date')
-            if date_val is not None:
-                if most_recent_date is None or date_val > most_recent_date:
-                    most_recent_date = date_val
-                    most_recent = data
+        results = {r.alias: r.value for r in aggregation_future.result()[0]}
+        count = int(results.get('total_rounds') or 0)
+        recent_docs = list(recent_future.result())
+        most_recent = (recent_docs[0].to_dict() or {}) if recent_docs else None
+        most_recent_date = most_recent.get('date') if most_recent else None
         
         # Calculate averages
         if count == 0:
-            averages = {k: 0.0 for k in totals}
+            averages = {k: 0.0 for k in DASHBOARD_FIELDS}
         else:
-            averages = {k: round(totals[k] / count, 2) for k in totals}
+            averages = {
+                k: round(float(results.get(k) or 0.0) / count, 2)
+                for k in DASHBOARD_FIELDS
+            }
         
-        # Generate next game plan based on most recent round
+        # Next game plan: the strategy stored with the most recent round
         next_game_plan = {'title': None, 'text': None}
         if most_recent:
-            danger_score = calculate_danger(most_recent)
-            strategy_title, strategy_text = get_strategy(danger_score)
             next_game_plan = {
-                'title': strategy_title,
-                'text': strategy_text
+                'title': most_recent.get('strategy_title'),
+                'text': most_recent.get('strategy_text')
             }
         
         return jsonify({
@@ -787,40 +1529,39 @@ def get_dashboard_stats():
 @require_auth
 def get_rounds_history():
     """Get history of user's rounds, sorted by date (most recent first)."""
-    if _rounds_collection is None:
+    if _firestore_client is None:
         return jsonify({
             'status': 'error',
             'message': 'Firestore not available'
         }), 503
     
     try:
-        user = get_current_user()
+        user = current_user()
         
         # Get limit from query parameter
         limit = request.args.get('limit', default=100, type=int)
-        limit = min(limit, 1000)
+        limit = max(1, min(limit, 1000))
         
-        # Query only the current user's rounds
-        docs = list(
-            _rounds_collection
-            .where('user_id', '==', user['id'])
+        # Optional projection, e.g. ?fields=danger_score,strategy_title
+        fields = _parse_fields_param(request.args.get('fields'))
+        if fields is False:
+            return jsonify({
+                'status': 'error',
+                'message': 'Invalid fields parameter'
+            }), 400
+        
+        # Query only the current user's rounds, most recent first
+        # (served by the user_id + date DESC composite index)
+        query = _rounds_collection().where(filter=firestore.FieldFilter('user_id', '==', user['id']))
+        if fields:
+            query = query.select(fields)
+        docs = (
+            query
+            .order_by('date', direction=firestore.Query.DESCENDING)
             .limit(limit)
             .stream()
         )
-        
-        rounds = []
-        for d in docs:
-            data = d.to_dict() or {}
-            data['id'] = d.id
-            
-            # Convert Firestore timestamp to ISO string
-            date_val = data.get('date')
-            data['date'] = _to_iso(date_val)
-            
-            rounds.append(data)
-        
-        # Sort by date descending (most recent first)
-        rounds.sort(key=lambda x: x.get('date') or '', reverse=True)
+        rounds = [_round_to_dict(d) for d in docs]
         
         return jsonify({
             'rounds': rounds,
@@ -839,18 +1580,18 @@ def get_rounds_history():
 @require_auth
 def delete_round(round_id):
     """Delete a specific round."""
-    if _rounds_collection is None:
+    if _firestore_client is None:
         return jsonify({
             'status': 'error',
             'message': 'Firestore not available'
         }), 503
     
     try:
-        user = get_current_user()
+        user = current_user()
         
-        # Get the round document
-        doc_ref = _rounds_collection.document(round_id)
-        doc = doc_ref.get()
+        # Get the round's owner (the only field the check needs)
+        doc_ref = _rounds_collection().document(round_id)
+        doc = doc_ref.get(field_paths=['user_id'])
         
         if not doc.exists:
             return jsonify({
@@ -866,8 +1607,14 @@ def delete_round(round_id):
                 'message': 'Not authorized to delete this round'
             }), 403
         
-        # Delete the round
-        doc_ref.delete()
+        # Delete the round, only if it is unchanged since the ownership check
+        try:
+            doc_ref.delete(option=firestore.Client.write_option(last_update_time=doc.update_time))
+        except FailedPrecondition:
+            return jsonify({
+                'status': 'error',
+                'message': 'Round was modified, please retry'
+            }), 409
         
         return jsonify({
             'status': 'success',
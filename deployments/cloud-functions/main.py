@@ -4,15 +4,17 @@ Cloud Functions HTTP entry point for SAMMO Fight IQ.
 Routes:
 - POST /log_round -> store round in Firestore
 - GET  /dashboard_stats -> aggregated stats and next game plan
-- GET  /rounds_history -> list of rounds sorted by date (desc)
+- GET  /rounds_history -> most recent rounds sorted by date (desc), ?limit= (default 100, clamped to 1..1000)
 
 All responses include CORS headers.
 """
 from typing import Any, Dict, List, Optional, Tuple
 import os
+from bisect import bisect_right
 from datetime import datetime
 
 import functions_framework
+import numpy as np
 from flask import jsonify, make_response
 from google.cloud import firestore
 
@@ -38,26 +40,40 @@ def calculate_danger(round_data):
     return max(0.0, min(score, 1.0))
 
 
+# Strategies ordered by rising danger; _STRATEGY_THRESHOLDS are the lower bounds of the upper tiers
+_STRATEGY_THRESHOLDS = (0.4, 0.7)
+_STRATEGIES = (
+    (
+        "PRESSURE_BODY",
+        "Walk him down. Invest in the body and arms. Bully, clinch, drown him."
+    ),
+    (
+        "RING_CUTTING",
+        "Smart pressure. Cut exits, feint to draw counters. No ego wars. Control space."
+    ),
+    (
+        "DEFENSE_FIRST",
+        "High guard, active feet. Max 2-punch combos. Pump the jab, angle off. Do not trade."
+    ),
+)
+
+
 def get_strategy(danger_score):
-    if danger_score >= 0.7:
-        return "DEFENSE_FIRST", "High guard, active feet. Max 2-punch combos. Pump the jab, angle off. Do not trade."
-    elif danger_score >= 0.4:
-        return "RING_CUTTING", "Smart pressure. Cut exits, feint to draw counters. No ego wars. Control space."
-    else:
-        return "PRESSURE_BODY", "Walk him down. Invest in the body and arms. Bully, clinch, drown him."
+    return _STRATEGIES[bisect_right(_STRATEGY_THRESHOLDS, danger_score)]
 
 
 def _to_iso(ts) -> Optional[str]:
     if ts is None:
         return None
-    # Firestore timestamps are datetime-like
-    try:
+    # Firestore timestamps are datetime subclasses
+    if isinstance(ts, datetime):
         return ts.isoformat()
-    except Exception:
+    if isinstance(ts, (int, float)):
         try:
-            return datetime.fromtimestamp(float(ts)).isoformat()
-        except Exception:
+            return datetime.fromtimestamp(ts).isoformat()
+        except (OverflowError, OSError, ValueError):
             return str(ts)
+    return str(ts)
 
 
 def _handle_log_round(request) -> Tuple[Any, int, Dict[str, str]]:
@@ -70,38 +86,46 @@ def _handle_log_round(request) -> Tuple[Any, int, Dict[str, str]]:
     # Add server timestamp
     payload['date'] = firestore.SERVER_TIMESTAMP
 
-    doc_ref, _ = _rounds_collection.add(payload)
+    _, doc_ref = _rounds_collection.add(payload)
     body = {'status': 'success', 'id': doc_ref.id}
     headers = _cors_headers()
     return jsonify(body), 200, headers
 
 
-def _handle_dashboard_stats(request) -> Tuple[Any, int, Dict[str, str]]:
-    docs = list(_rounds_collection.stream())
-    count = 0
-    totals = {'pressure_score': 0.0, 'ring_control_score': 0.0, 'defense_score': 0.0, 'clean_shots_taken': 0.0}
-    most_recent = None
-    most_recent_date = None
+def _as_float(value) -> float:
+    try:
+        return float(value or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
 
-    for d in docs:
-        data = d.to_dict() or {}
-        count += 1
-        for key in totals:
-            try:
-                totals[key] += float(data.get(key, 0.0) or 0.0)
-            except Exception:
-                totals[key] += 0.0
 
-        date_val = data.get('date')
-        if date_val is not None:
-            if most_recent_date is None or date_val > most_recent_date:
-                most_recent_date = date_val
-                most_recent = data
+def _handle_dashboard_stats(request) -> Tuple[Any, int, Dict[str, str]]:
+    fields = ('pressure_score', 'ring_control_score', 'defense_score', 'clean_shots_taken')
+    # Only fetch the fields the stats need, not notes/strategy text; newest
+    # first, so the most recent round is simply the first one
+    docs = (
+        _rounds_collection
+        .select(list(fields) + ['date'])
+        .order_by('date', direction=firestore.Query.DESCENDING)
+        .stream()
+    )
+    rounds = [d.to_dict() or {} for d in docs]
+    count = len(rounds)
+
+    # Fill one flat (N * 4) buffer, then sum per field in C
+    scores = np.fromiter(
+        (_as_float(data.get(key)) for data in rounds for key in fields),
+        dtype=np.float64,
+        count=count * len(fields),
+    ).reshape(count, len(fields))
 
     if count == 0:
-        averages = {k: 0.0 for k in totals}
+        averages = {k: 0.0 for k in fields}
     else:
-        averages = {k: (totals[k] / count) for k in totals}
+        averages = dict(zip(fields, (scores.sum(axis=0) / count).tolist()))
+
+    most_recent = rounds[0] if rounds else None
+    most_recent_date = most_recent.get('date') if most_recent else None
 
     next_game_plan = (None, None)
     if most_recent:
@@ -121,7 +145,14 @@ def _handle_dashboard_stats(request) -> Tuple[Any, int, Dict[str, str]]:
 
 
 def _handle_rounds_history(request) -> Tuple[Any, int, Dict[str, str]]:
-    docs = list(_rounds_collection.stream())
+    # Most recent N rounds, sorted and cut by Firestore (every round gets a server timestamp)
+    limit = max(1, min(request.args.get('limit', default=100, type=int), 1000))
+    docs = (
+        _rounds_collection
+        .order_by('date', direction=firestore.Query.DESCENDING)
+        .limit(limit)
+        .stream()
+    )
     rounds: List[Dict[str, Any]] = []
     for d in docs:
         data = d.to_dict() or {}
@@ -130,12 +161,6 @@ def _handle_rounds_history(request) -> Tuple[Any, int, Dict[str, str]]:
         data['date'] = _to_iso(date_val)
         rounds.append(data)
 
-    # Sort by date desc; items with None date go to the end
-    def _date_key(item):
-        return item.get('date') or ''
-
-    rounds.sort(key=_date_key, reverse=True)
-
     headers = _cors_headers()
     return jsonify({'rounds': rounds}), 200, headers
 
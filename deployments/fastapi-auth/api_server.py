@@ -3,13 +3,21 @@ FastAPI server for SAMMO Fight IQ with JWT authentication.
 
 Provides authenticated REST API endpoints for boxing analysis and coaching.
 """
-from typing import Dict, List, Any, Optional
-from datetime import datetime
-
+import asyncio
+import os
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime, timezone
+
+import orjson
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel, Field
 
+from google.api_core.exceptions import FailedPrecondition
 from google.cloud import firestore
 
 from src.auth.routes import router as auth_router
@@ -20,7 +28,8 @@ from src.auth.models import UserInDB
 app = FastAPI(
     title="SAMMO Fight IQ API",
     description="AI-Powered Boxing Coach API with JWT Authentication",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -35,10 +44,63 @@ app.add_middleware(
 # Include authentication routes
 app.include_router(auth_router)
 
-# Initialize Firestore client
-_firestore_client = firestore.Client()
+# Initialize Firestore client (async, so handlers await Firestore instead of
+# blocking the event loop on each gRPC round-trip)
+_firestore_client = firestore.AsyncClient()
 _rounds_collection = _firestore_client.collection('rounds')
 
+# Numeric round fields averaged by /api/dashboard_stats
+DASHBOARD_FIELDS = ('pressure_score', 'ring_control_score', 'defense_score', 'clean_shots_taken')
+
+# Fields of the most recent round needed for the next game plan (its strategy
+# was computed and stored when the round was logged)
+GAME_PLAN_FIELDS = ['strategy_title', 'strategy_text', 'date']
+
+# Per-user dashboard/history response cache (process-local; other workers may
+# serve data up to the TTL old after a write)
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "30"))
+RESPONSE_CACHE_MAX_USERS = int(os.getenv("RESPONSE_CACHE_MAX_USERS", "10000"))
+
+
+class _UserResponseCache:
+    """
+    LRU of users, each holding TTL-bound responses keyed by request variant.
+
+    Only touched from the event loop thread, so no locking is needed.
+    Invalidating a user drops all of their variants at once.
+    """
+
+    def __init__(self, ttl: float, max_users: int):
+        self.ttl = ttl
+        self.max_users = max_users
+        self._users: "OrderedDict[str, Dict[Any, Tuple[float, Any]]]" = OrderedDict()
+
+    def get(self, user_id: str, key: Any) -> Optional[Any]:
+        entry = self._users.get(user_id, {}).get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        self._users.move_to_end(user_id)
+        return entry[1]
+
+    def set(self, user_id: str, key: Any, value: Any) -> None:
+        self._users.setdefault(user_id, {})[key] = (time.monotonic() + self.ttl, value)
+        self._users.move_to_end(user_id)
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        self._users.pop(user_id, None)
+
+
+_dashboard_cache = _UserResponseCache(RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_MAX_USERS)
+_history_cache = _UserResponseCache(RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_MAX_USERS)
+
+
+def _invalidate_user_responses(user_id: str) -> None:
+    """Drop cached dashboard and history responses after the user's rounds change."""
+    _dashboard_cache.invalidate(user_id)
+    _history_cache.invalidate(user_id)
+
 
 # Request/Response Models
 class RoundData(BaseModel):
@@ -94,25 +156,69 @@ def calculate_danger(round_data: Dict[str, Any]) -> float:
     return max(0.0, min(score, 1.0))
 
 
+def _parse_fields_param(raw: Optional[str]):
+    """
+    Parse a comma-separated ?fields= list into a Firestore projection.
+
+    Returns None when no projection was requested, False when a field name
+    is invalid, otherwise the field list (always including 'date', which the
+    history is ordered by; 'id' is the document id, not a stored field).
+    """
+    if not raw:
+        return None
+    fields = ['date']
+    for name in raw.split(','):
+        name = name.strip()
+        if not name or name in ('id', 'date') or name in fields:
+            continue
+        if not name.isidentifier():
+            return False
+        fields.append(name)
+    return fields
+
+
+# Strategies ordered by rising danger; _STRATEGY_THRESHOLDS are the lower bounds of the upper tiers
+_STRATEGY_THRESHOLDS = (0.4, 0.7)
+_STRATEGIES = (
+    ("PRESSURE_BODY", "Walk him down. Invest in the body and arms. Bully, clinch, drown him."),
+    ("RING_CUTTING", "Smart pressure. Cut exits, feint to draw counters. No ego wars. Control space."),
+    ("DEFENSE_FIRST", "High guard, active feet. Max 2-punch combos. Pump the jab, angle off. Do not trade."),
+)
+
+
 def get_strategy(danger_score: float) -> tuple[str, str]:
     """Get boxing strategy based on danger score."""
-    if danger_score >= 0.7:
-        return "DEFENSE_FIRST", "High guard, active feet. Max 2-punch combos. Pump the jab, angle off. Do not trade."
-    elif danger_score >= 0.4:
-        return "RING_CUTTING", "Smart pressure. Cut exits, feint to draw counters. No ego wars. Control space."
-    else:
-        return "PRESSURE_BODY", "Walk him down. Invest in the body and arms. Bully, clinch, drown him."
+    return _STRATEGIES[bisect_right(_STRATEGY_THRESHOLDS, danger_score)]
+
+
+# (epoch second, ISO string) of the last formatted timestamp
+_now_iso_cache: Tuple[int, str] = (0, "")
+
+
+def _utc_now_iso() -> str:
+    """Current UTC time as an ISO string, reformatted at most once per second."""
+    global _now_iso_cache
+    second = int(time.time())
+    cached = _now_iso_cache
+    if cached[0] != second:
+        cached = (second, datetime.fromtimestamp(second, timezone.utc).isoformat())
+        _now_iso_cache = cached
+    return cached[1]
 
 
 # API Routes
+# Static API description served by root(), encoded once at import
+_ROOT_BODY = orjson.dumps({
+    "message": "SAMMO Fight IQ API",
+    "version": "1.0.0",
+    "docs": "/docs"
+})
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
-    return {
-        "message": "SAMMO Fight IQ API",
-        "version": "1.0.0",
-        "docs": "/docs"
-    }
+    return Response(_ROOT_BODY, media_type="application/json")
 
 
 @app.post("/api/log_round", response_model=RoundResponse)
@@ -132,13 +238,14 @@ async def log_round(
     Returns:
         Round ID, danger score, and recommended strategy
     """
-    # Calculate danger score
-    danger_score = calculate_danger(round_data.dict())
+    # Serialize once; the same dict feeds scoring and the stored document
+    round_fields = round_data.model_dump()
+    danger_score = calculate_danger(round_fields)
     strategy_title, strategy_text = get_strategy(danger_score)
 
     # Prepare document with user association
     round_doc = {
-        **round_data.dict(),
+        **round_fields,
         'user_id': current_user.id,
         'username': current_user.username,
         'danger_score': danger_score,
@@ -148,17 +255,19 @@ async def log_round(
     }
 
     # Store in Firestore
-    doc_ref, _ = _rounds_collection.add(round_doc)
-
-    return RoundResponse(
-        status="success",
-        id=doc_ref.id,
-        danger_score=danger_score,
-        strategy={
+    _, doc_ref = await _rounds_collection.add(round_doc)
+    _invalidate_user_responses(current_user.id)
+
+    # Fixed-shape body built directly; RoundResponse stays as the documented schema
+    return ORJSONResponse({
+        "status": "success",
+        "id": doc_ref.id,
+        "danger_score": danger_score,
+        "strategy": {
             "title": strategy_title,
             "text": strategy_text
         }
-    )
+    })
 
 
 @app.get("/api/dashboard_stats", response_model=DashboardStats)
@@ -176,59 +285,60 @@ async def get_dashboard_stats(
     Returns:
         Dashboard statistics including averages and game plan
     """
-    # Query only the current user's rounds
-    docs = list(
-        _rounds_collection
-        .where('user_id', '==', current_user.id)
-        .stream()
+    cached = _dashboard_cache.get(current_user.id, None)
+    if cached is not None:
+        return cached
+
+    # Aggregate the current user's rounds server-side
+    user_rounds = _rounds_collection.where(filter=firestore.FieldFilter('user_id', '==', current_user.id))
+    aggregation = user_rounds.count(alias='total_rounds')
+    for key in DASHBOARD_FIELDS:
+        aggregation = aggregation.sum(key, alias=key)
+
+    # Most recent round (uses the user_id + date DESC composite index),
+    # fetched concurrently with the aggregation
+    aggregation_result, recent_docs = await asyncio.gather(
+        aggregation.get(),
+        user_rounds
+        .select(GAME_PLAN_FIELDS)
+        .order_by('date', direction=firestore.Query.DESCENDING)
+        .limit(1)
+        .get()
     )
 
-    count = len(docs)
-    totals = {
-        'pressure_score': 0.0,
-        'ring_control_score': 0.0,
-        'defense_score': 0.0,
-        'clean_shots_taken': 0.0
-    }
-    most_recent = None
-    most_recent_date = None
-
-    for d in docs:
-        data = d.to_dict() or {}
-        for key in totals:
-            try:
-                totals[key] += float(data.get(key, 0.0) or 0.0)
-            except Exception:
-                totals[key] += 0.0
-
-        date_val = data.get('date')
-        if date_val is not None:
-            if most_recent_date is None or date_val > most_recent_date:
-                most_recent_date = date_val
-                most_recent = data
+    results = {r.alias: r.value for r in aggregation_result[0]}
+    count = int(results.get('total_rounds') or 0)
+    most_recent = (recent_docs[0].to_dict() or {}) if recent_docs else None
+    most_recent_date = most_recent.get('date') if most_recent else None
 
+    # Sums treat missing fields as 0, matching the old per-document loop
     if count == 0:
-        averages = {k: 0.0 for k in totals}
+        averages = {k: 0.0 for k in DASHBOARD_FIELDS}
     else:
-        averages = {k: (totals[k] / count) for k in totals}
+        averages = {k: float(results.get(k) or 0.0) / count for k in DASHBOARD_FIELDS}
 
+    # The strategy was computed and stored when the round was logged
     next_game_plan = {"title": None, "text": None}
     if most_recent:
-        danger_score = calculate_danger(most_recent)
-        strategy_title, strategy_text = get_strategy(danger_score)
-        next_game_plan = {"title": strategy_title, "text": strategy_text}
+        next_game_plan = {
+            "title": most_recent.get("strategy_title"),
+            "text": most_recent.get("strategy_text")
+        }
 
-    return DashboardStats(
+    stats = DashboardStats(
         averages=averages,
         most_recent_round_date=most_recent_date.isoformat() if most_recent_date else None,
         next_game_plan=next_game_plan,
         total_rounds=count
     )
+    _dashboard_cache.set(current_user.id, None, stats)
+    return stats
 
 
 @app.get("/api/rounds_history", response_model=RoundHistoryResponse)
 async def get_rounds_history(
     limit: int = 100,
+    fields: Optional[str] = None,
     current_user: UserInDB = Depends(get_current_user)
 ):
     """
@@ -238,21 +348,38 @@ async def get_rounds_history(
 
     Args:
         limit: Maximum number of rounds to return
+        fields: Optional comma-separated round fields to return (default: all)
         current_user: Authenticated user from JWT token
 
     Returns:
         List of user's boxing rounds
     """
-    # Query only the current user's rounds
-    docs = list(
-        _rounds_collection
-        .where('user_id', '==', current_user.id)
+    projection = _parse_fields_param(fields)
+    if projection is False:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid fields parameter"
+        )
+
+    cache_key = (limit, tuple(projection) if projection else None)
+    cached = _history_cache.get(current_user.id, cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached)
+
+    # Query only the current user's most recent rounds
+    # (served by the user_id + date DESC composite index)
+    query = _rounds_collection.where(filter=firestore.FieldFilter('user_id', '==', current_user.id))
+    if projection:
+        query = query.select(projection)
+    docs = (
+        query
+        .order_by('date', direction=firestore.Query.DESCENDING)
         .limit(limit)
         .stream()
     )
 
     rounds = []
-    for d in docs:
+    async for d in docs:
         data = d.to_dict() or {}
         data['id'] = d.id
 
@@ -268,13 +395,11 @@ async def get_rounds_history(
 
         rounds.append(data)
 
-    # Sort by date descending
-    rounds.sort(key=lambda x: x.get('date') or '', reverse=True)
-
-    return RoundHistoryResponse(
-        rounds=rounds,
-        total=len(rounds)
-    )
+    # The rounds are already plain dicts; serialize them directly rather than
+    # validating them through RoundHistoryResponse again
+    history = {'rounds': rounds, 'total': len(rounds)}
+    _history_cache.set(current_user.id, cache_key, history)
+    return ORJSONResponse(history)
 
 
 @app.delete("/api/rounds/{round_id}")
@@ -297,9 +422,9 @@ async def delete_round(
     Raises:
         HTTPException: If round not found or unauthorized
     """
-    # Get the round document
+    # Get the round's owner (the only field the check needs)
     doc_ref = _rounds_collection.document(round_id)
-    doc = doc_ref.get()
+    doc = await doc_ref.get(field_paths=['user_id'])
 
     if not doc.exists:
         raise HTTPException(
@@ -315,8 +440,17 @@ async def delete_round(
             detail="Not authorized to delete this round"
         )
 
-    # Delete the round
-    doc_ref.delete()
+    # Delete the round, only if it is unchanged since the ownership check
+    try:
+        await doc_ref.delete(
+            option=_firestore_client.write_option(last_update_time=doc.update_time)
+        )
+    except FailedPrecondition:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Round was modified, please retry"
+        )
+    _invalidate_user_responses(current_user.id)
 
     return {"status": "success", "message": "Round deleted"}
 
@@ -331,7 +465,7 @@ async def health_check():
     """
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _utc_now_iso()
     }
 
 
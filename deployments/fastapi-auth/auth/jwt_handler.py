@@ -3,17 +3,48 @@ JWT token generation and validation utilities.
 
 Handles JWT token creation, validation, and decoding using HS256 algorithm.
 """
+import asyncio
+import base64
+import binascii
+import hashlib
+import hmac
+import json
 import os
-from datetime import datetime, timedelta
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
 import jwt
 from jwt.exceptions import InvalidTokenError
 from passlib.context import CryptContext
 
+from .cache import TTLCache
 from .models import TokenData
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Argon2id cost parameters (memory in KiB). Lanes default to 1: the
+# password pool below already spreads concurrent logins across cores.
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "4096"))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "1"))
+
+# Password hashing context: new hashes are Argon2id (argon2-cffi backend);
+# legacy bcrypt hashes still verify and are flagged for rehash
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated=["bcrypt"],
+    argon2__type="ID",
+    argon2__time_cost=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=ARGON2_PARALLELISM,
+    argon2__digest_size=32,
+    argon2__salt_size=16,
+)
 
 # JWT Configuration
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-this-in-production")
@@ -21,6 +52,34 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
 
+# Recent password verification results. Kept small and short-lived so it only
+# absorbs repeated logins, not brute-force attempts (each guess is a new key).
+VERIFY_CACHE_MAXSIZE = int(os.getenv("VERIFY_CACHE_MAXSIZE", "1024"))
+VERIFY_CACHE_TTL_SECONDS = int(os.getenv("VERIFY_CACHE_TTL_SECONDS", "30"))
+
+# Decoded access tokens, held until the token's own expiry. Rejected tokens
+# are remembered only briefly, in a separate cache so junk cannot evict them.
+TOKEN_CACHE_MAXSIZE = int(os.getenv("TOKEN_CACHE_MAXSIZE", "50000"))
+INVALID_TOKEN_CACHE_MAXSIZE = int(os.getenv("INVALID_TOKEN_CACHE_MAXSIZE", "4096"))
+INVALID_TOKEN_CACHE_TTL_SECONDS = int(os.getenv("INVALID_TOKEN_CACHE_TTL_SECONDS", "5"))
+
+# Max concurrent password hashes/verifies (both backends release the GIL; more than one per core just thrashes)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 4)))
+
+# Async routes hand password hashing to this pool instead of running it on the event loop
+password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+
+_SECRET_KEY_BYTES = SECRET_KEY.encode()
+# Keyed once at import; each MAC starts from a copy of this state instead of
+# re-keying HMAC-SHA256 per call
+_HMAC_TEMPLATE = hmac.new(_SECRET_KEY_BYTES, digestmod=hashlib.sha256)
+_HASH_PREFIXES = ("$argon2id$", "$2a$", "$2b$", "$2y$")
+_verify_cache = TTLCache(VERIFY_CACHE_MAXSIZE)
+_token_cache = TTLCache(TOKEN_CACHE_MAXSIZE)
+_invalid_token_cache = TTLCache(INVALID_TOKEN_CACHE_MAXSIZE)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -33,12 +92,30 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    # Not an Argon2id or bcrypt hash: reject without asking passlib to identify it
+    if not hashed_password or not hashed_password.startswith(_HASH_PREFIXES):
+        return False
+
+    # Keyed by a MAC over password and stored hash, so the cache never holds
+    # plaintext and a password change (new hash) misses automatically
+    mac = _HMAC_TEMPLATE.copy()
+    mac.update(f"{plain_password}\0{hashed_password}".encode())
+    key = mac.digest()
+    if _verify_cache.get(key):
+        return True
+
+    # Only successes are cached: failed attempts always pay full hashing cost,
+    # for existing users and the login dummy hash alike, so timing does not
+    # reveal which usernames exist
+    result = pwd_context.verify(plain_password, hashed_password)
+    if result:
+        _verify_cache.set(key, True, time.time() + VERIFY_CACHE_TTL_SECONDS)
+    return result
 
 
 def get_password_hash(password: str) -> str:
     """
-    Hash a password using bcrypt.
+    Hash a password using Argon2id.
 
     Args:
         password: Plain text password to hash
@@ -49,6 +126,50 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a stored hash should be replaced after a successful login.
+
+    Args:
+        hashed_password: The stored password hash
+
+    Returns:
+        True for legacy bcrypt hashes or Argon2 hashes with outdated parameters
+    """
+    return pwd_context.needs_update(hashed_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password on the password pool without blocking the event loop.
+
+    Args:
+        plain_password: The plain text password
+        hashed_password: The hashed password to compare against
+
+    Returns:
+        True if password matches, False otherwise
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        password_executor, verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password on the password pool without blocking the event loop.
+
+    Args:
+        password: Plain text password to hash
+
+    Returns:
+        Hashed password string
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        password_executor, get_password_hash, password
+    )
+
+
 def create_access_token(
     data: Dict[str, Any],
     expires_delta: Optional[timedelta] = None
@@ -66,11 +187,12 @@ def create_access_token(
     to_encode = data.copy()
 
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        lifetime = expires_delta.total_seconds()
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        lifetime = ACCESS_TOKEN_EXPIRE_MINUTES * 60
 
-    to_encode.update({"exp": expire})
+    # JWT NumericDate: plain Unix seconds, no datetime round trip
+    to_encode.update({"exp": int(time.time() + lifetime)})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
     return encoded_jwt
@@ -93,16 +215,63 @@ def create_refresh_token(
     to_encode = data.copy()
 
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        lifetime = expires_delta.total_seconds()
     else:
-        expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+        lifetime = REFRESH_TOKEN_EXPIRE_DAYS * 86400
 
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": int(time.time() + lifetime), "type": "refresh"})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
     return encoded_jwt
 
 
+def _b64url_decode(segment: str) -> bytes:
+    """Decode an unpadded base64url JWT segment."""
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _fast_decode(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Verify an HS256 token and return its claims without PyJWT's generic machinery.
+
+    Only the shape of token this module issues takes the fast path (HS256,
+    no nbf/iat claims); anything else falls back to jwt.decode.
+
+    Args:
+        token: The JWT token string to decode
+
+    Returns:
+        The claims dict if the signature is valid and the token is unexpired, None otherwise
+    """
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        header = _json_loads(_b64url_decode(header_b64))
+        if not isinstance(header, dict) or header.get("alg") != ALGORITHM:
+            return None
+
+        mac = _HMAC_TEMPLATE.copy()
+        mac.update(f"{header_b64}.{payload_b64}".encode("ascii"))
+        if not hmac.compare_digest(mac.digest(), _b64url_decode(signature_b64)):
+            return None
+
+        payload = _json_loads(_b64url_decode(payload_b64))
+    except (ValueError, TypeError, binascii.Error):
+        return None
+
+    if not isinstance(payload, dict):
+        return None
+    if "nbf" in payload or "iat" in payload:
+        try:
+            return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except InvalidTokenError:
+            return None
+
+    exp = payload.get("exp")
+    if not isinstance(exp, (int, float)) or exp <= time.time():
+        return None
+    return payload
+
+
 def decode_token(token: str) -> Optional[TokenData]:
     """
     Decode and validate a JWT token.
@@ -113,21 +282,42 @@ def decode_token(token: str) -> Optional[TokenData]:
     Returns:
         TokenData object if valid, None otherwise
     """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    cached = _token_cache.get(key)
+    if cached is not None:
+        return cached
+    if _invalid_token_cache.get(key) is not None:
+        return None
+
+    token_data = _decode_uncached(token)
+    if token_data is None:
+        _invalid_token_cache.set(key, True, time.time() + INVALID_TOKEN_CACHE_TTL_SECONDS)
+    else:
+        _token_cache.set(key, token_data, token_data.exp_ts)
+    return token_data
+
+
+def _decode_uncached(token: str) -> Optional[TokenData]:
+    """Verify a token and build its TokenData, bypassing the token caches."""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _fast_decode(token)
+        if payload is None:
+            return None
+
         user_id: str = payload.get("sub")
         username: str = payload.get("username")
-        exp_timestamp: int = payload.get("exp")
+        exp_timestamp: int = int(payload.get("exp"))
 
         if user_id is None or username is None:
             return None
 
-        exp = datetime.fromtimestamp(exp_timestamp)
+        exp = datetime.fromtimestamp(exp_timestamp, timezone.utc).replace(tzinfo=None)
 
         return TokenData(
             user_id=user_id,
             username=username,
-            exp=exp
+            exp=exp,
+            exp_ts=exp_timestamp
         )
     except InvalidTokenError:
         return None
@@ -150,10 +340,7 @@ def verify_token(token: str) -> bool:
         return False
 
     # Check if token is expired
-    if token_data.exp < datetime.utcnow():
-        return False
-
-    return True
+    return token_data.exp_ts > time.time()
 
 
 def extract_token_from_header(authorization: str) -> Optional[str]:
@@ -166,12 +353,12 @@ def extract_token_from_header(authorization: str) -> Optional[str]:
     Returns:
         The token string if valid format, None otherwise
     """
-    if not authorization:
+    # Prefix check and slice instead of splitting the whole header
+    if not authorization or len(authorization) < 8 or authorization[:7].lower() != "bearer ":
         return None
 
-    parts = authorization.split()
-
-    if len(parts) != 2 or parts[0].lower() != "bearer":
+    token = authorization[7:].strip()
+    if not token or " " in token:
         return None
 
-    return parts[1]
+    return token
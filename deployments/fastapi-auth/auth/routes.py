@@ -7,6 +7,7 @@ from datetime import timedelta
 from typing import Dict, Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPAuthorizationCredentials
 
 from .models import (
@@ -17,7 +18,10 @@ from .models import (
     UserInDB
 )
 from .jwt_handler import (
-    verify_password,
+    verify_password_async,
+    get_password_hash,
+    get_password_hash_async,
+    password_needs_rehash,
     create_access_token,
     create_refresh_token,
     decode_token,
@@ -28,6 +32,10 @@ from .dependencies import get_user_store, get_current_user, get_current_active_u
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+# Verified against when the username is unknown, so a miss costs the same
+# hashing work as a wrong password
+_DUMMY_HASH = get_password_hash("dummy-password-for-timing")
+
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
@@ -50,7 +58,7 @@ async def register(
         HTTPException: If username or email already exists
     """
     try:
-        user = user_store.create_user(user_data)
+        user = await user_store.create_user_async(user_data)
 
         return UserResponse(
             id=user.id,
@@ -77,7 +85,7 @@ async def register(
 async def login(
     credentials: UserLogin,
     user_store: UserStore = Depends(get_user_store)
-) -> Token:
+) -> ORJSONResponse:
     """
     Login and get access token.
 
@@ -94,17 +102,13 @@ async def login(
         HTTPException: If credentials are invalid or user inactive
     """
     # Get user by username
-    user = user_store.get_user_by_username(credentials.username)
+    user = await user_store.get_user_by_username_async(credentials.username)
 
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect username or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    # Verify password (against the dummy hash for unknown users)
+    hashed_password = user.hashed_password if user is not None else _DUMMY_HASH
+    password_ok = await verify_password_async(credentials.password, hashed_password)
 
-    # Verify password
-    if not verify_password(credentials.password, user.hashed_password):
+    if user is None or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -118,6 +122,12 @@ async def login(
             detail="User account is inactive"
         )
 
+    # One-shot migration of legacy bcrypt (or outdated Argon2) hashes; a failed
+    # write just means the next login tries again
+    if password_needs_rehash(user.hashed_password):
+        new_hash = await get_password_hash_async(credentials.password)
+        await user_store.update_password_hash_async(user.id, new_hash)
+
     # Create access token
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -125,11 +135,12 @@ async def login(
         expires_delta=access_token_expires
     )
 
-    return Token(
-        access_token=access_token,
-        token_type="bearer",
-        expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60  # Convert to seconds
-    )
+    # Fixed-shape body built directly; Token stays as the documented schema
+    return ORJSONResponse({
+        "access_token": access_token,
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60  # Convert to seconds
+    })
 
 
 @router.get("/me", response_model=UserResponse)
@@ -162,7 +173,7 @@ async def get_current_user_info(
 async def refresh_token(
     refresh_token_str: str,
     user_store: UserStore = Depends(get_user_store)
-) -> Token:
+) -> ORJSONResponse:
     """
     Refresh access token using refresh token.
 
@@ -187,7 +198,7 @@ async def refresh_token(
         )
 
     # Get user
-    user = user_store.get_user_by_id(token_data.user_id)
+    user = await user_store.get_user_by_id_async(token_data.user_id)
 
     if user is None or not user.is_active:
         raise HTTPException(
@@ -203,11 +214,11 @@ async def refresh_token(
         expires_delta=access_token_expires
     )
 
-    return Token(
-        access_token=access_token,
-        token_type="bearer",
-        expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60
-    )
+    return ORJSONResponse({
+        "access_token": access_token,
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    })
 
 
 @router.post("/verify/{user_id}")
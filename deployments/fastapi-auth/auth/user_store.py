@@ -3,81 +3,319 @@ User storage and management using Firestore.
 
 Provides user CRUD operations with secure password handling.
 """
-import uuid
-from datetime import datetime
-from typing import Optional, List
+import os
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Optional
+from urllib.parse import quote
 from google.cloud import firestore
 
+from .cache import TTLCache
 from .models import UserCreate, UserInDB
-from .jwt_handler import get_password_hash
+from .jwt_handler import get_password_hash, get_password_hash_async
+
+# Users looked up by id, username or email, shared by every UserStore in the
+# process. Lookups that found nothing are remembered for a much shorter time
+# so a new registration on another worker becomes visible quickly.
+USER_CACHE_MAXSIZE = int(os.getenv("USER_CACHE_MAXSIZE", "10000"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+USER_MISS_CACHE_TTL_SECONDS = float(os.getenv("USER_MISS_CACHE_TTL_SECONDS", "5"))
+
+# How old a username/email index read may be. Stale reads can be served by the
+# nearest replica; 0 makes every lookup strongly consistent. Index entries never
+# change once written, so only they are read stale: user documents are always
+# read strongly so deactivations and password changes take effect at once.
+USER_READ_MAX_STALENESS_SECONDS = float(os.getenv("USER_READ_MAX_STALENESS_SECONDS", "15"))
+
+# Lookup index collections: one tiny {'uid': ...} document per username and
+# email, keyed by the value, so lookups are document gets instead of queries
+USERNAME_INDEX_COLLECTION = 'username_to_uid'
+EMAIL_INDEX_COLLECTION = 'email_to_uid'
+
+# Until backfill_lookup_indexes() has run, users created before the indexes
+# have no entries: on an index miss, fall back to querying the users
+# collection (writing the missing entry on a hit) and check uniqueness the
+# same way. Can be turned off once the backfill is done.
+USER_INDEX_LEGACY_FALLBACK = os.getenv("USER_INDEX_LEGACY_FALLBACK", "true").lower() == "true"
+
+# Fields fetched for admin listings that don't need password hashes
+_LISTING_FIELDS = ['id', 'username', 'email', 'full_name', 'created_at', 'is_active', 'is_verified']
+
+_MISSING = object()
+_user_cache = TTLCache(USER_CACHE_MAXSIZE)
+
+
+def _cache_user(user: UserInDB) -> UserInDB:
+    """Cache a user under its id, username and email keys."""
+    expires_at = time.time() + USER_CACHE_TTL_SECONDS
+    for key in (('id', user.id), ('username', user.username), ('email', user.email)):
+        _user_cache.set(key, user, expires_at)
+    return user
+
+
+def _cache_miss(key: tuple) -> None:
+    """Remember briefly that no user matches a lookup key."""
+    _user_cache.set(key, _MISSING, time.time() + USER_MISS_CACHE_TTL_SECONDS)
+
+
+def _update_cached_user(user_id: str, **changes) -> None:
+    """
+    Apply a just-written profile change to this process's cached user.
+
+    Caches the updated copy instead of dropping the entry, so the old state
+    can't be served again until it expires. Uncached users are left alone;
+    their next lookup is a strong read.
+    """
+    user = _user_cache.pop(('id', user_id))
+    if isinstance(user, UserInDB):
+        _cache_user(user.model_copy(update=changes))
+
+
+def _index_doc_id(value: str) -> str:
+    """
+    Document ID for a username or email in a lookup index collection.
+
+    Percent-encodes everything Firestore reserves in IDs ('/', '.' and '__'
+    runs), so any string maps to a distinct, valid ID.
+    """
+    return quote(value, safe='@+-').replace('.', '%2E').replace('_', '%5F')
+
+
+def _raise_if_taken(snapshots, username_ref, email_ref, user_doc: dict) -> None:
+    """Raise ValueError if either index entry among snapshots already exists."""
+    taken = {snap.reference.path for snap in snapshots if snap.exists}
+    for ref, field, label in ((username_ref, 'username', 'Username'), (email_ref, 'email', 'Email')):
+        if ref.path in taken:
+            raise ValueError(f"{label} '{user_doc[field]}' already exists")
+
+
+def _unindexed_user_query(users_collection, field: str, value: str):
+    """Query for a user by field, for users that may be missing from the lookup indexes."""
+    return users_collection.where(filter=firestore.FieldFilter(field, '==', value)).limit(1)
+
+
+def _raise_if_unindexed_taken(snapshots_by_field: dict, user_doc: dict) -> None:
+    """Raise ValueError if a users query found a match for the username or email."""
+    for field, label in (('username', 'Username'), ('email', 'Email')):
+        if snapshots_by_field[field]:
+            raise ValueError(f"{label} '{user_doc[field]}' already exists")
+
+
+def _create_user_writes(transaction, user_ref, username_ref, email_ref, user_doc: dict) -> None:
+    """Queue the user document and its two index entries on a transaction."""
+    transaction.create(user_ref, user_doc)
+    transaction.create(username_ref, {'uid': user_doc['id']})
+    transaction.create(email_ref, {'uid': user_doc['id']})
+
+
+@firestore.transactional
+def _create_user_txn(transaction, user_ref, username_ref, email_ref, user_doc: dict) -> None:
+    """Insert a user and its username/email index entries if both are unused."""
+    # Both index entries come back from one batched read
+    _raise_if_taken(transaction.get_all([username_ref, email_ref]), username_ref, email_ref, user_doc)
+    if USER_INDEX_LEGACY_FALLBACK:
+        _raise_if_unindexed_taken({
+            field: list(transaction.get(_unindexed_user_query(user_ref.parent, field, user_doc[field])))
+            for field in ('username', 'email')
+        }, user_doc)
+    _create_user_writes(transaction, user_ref, username_ref, email_ref, user_doc)
+
+
+@firestore.async_transactional
+async def _create_user_txn_async(transaction, user_ref, username_ref, email_ref, user_doc: dict) -> None:
+    """Async-client version of _create_user_txn."""
+    snapshots = [snap async for snap in await transaction.get_all([username_ref, email_ref])]
+    _raise_if_taken(snapshots, username_ref, email_ref, user_doc)
+    if USER_INDEX_LEGACY_FALLBACK:
+        _raise_if_unindexed_taken({
+            field: [
+                snap async for snap in
+                await transaction.get(_unindexed_user_query(user_ref.parent, field, user_doc[field]))
+            ]
+            for field in ('username', 'email')
+        }, user_doc)
+    _create_user_writes(transaction, user_ref, username_ref, email_ref, user_doc)
+
+
+def _new_user_doc(user_data: UserCreate, hashed_password: str) -> dict:
+    """Firestore document for a new user."""
+    return {
+        'id': secrets.token_hex(16),
+        'username': user_data.username,
+        'email': user_data.email,
+        'full_name': user_data.full_name,
+        'hashed_password': hashed_password,
+        'created_at': firestore.SERVER_TIMESTAMP,
+        'is_active': True,
+        'is_verified': False
+    }
+
+
+def _cache_new_user(user_doc: dict) -> UserInDB:
+    """
+    Cache and return a just-created user without re-reading it.
+
+    created_at is the client clock, within a round trip of the stored server
+    timestamp. Replaces any cached "no such user" entries for the new keys.
+    """
+    return _cache_user(UserInDB.from_doc({**user_doc, 'created_at': datetime.now(timezone.utc)}))
+
+
+def _cache_lookup(key: tuple, doc) -> Optional[UserInDB]:
+    """Cache the outcome of a Firestore lookup under key and return the user, if any."""
+    if doc is None:
+        _cache_miss(key)
+        return None
+    return _cache_user(UserInDB.from_doc(doc.to_dict()))
 
 
 class UserStore:
     """User storage layer using Firestore."""
 
     def __init__(self):
-        """Initialize Firestore client and users collection."""
+        """
+        Initialize Firestore client, users collection and lookup indexes.
+
+        Username and email lookups go through the username_to_uid and
+        email_to_uid index collections; users created before they existed
+        must be backfilled with backfill_lookup_indexes(). Until then they
+        are found by USER_INDEX_LEGACY_FALLBACK queries.
+
+        The *_async methods use a Firestore AsyncClient, created on first use,
+        so FastAPI handlers await RPCs instead of blocking the event loop.
+        """
         self._db = firestore.Client()
         self._users_collection = self._db.collection('users')
+        self._username_index = self._db.collection(USERNAME_INDEX_COLLECTION)
+        self._email_index = self._db.collection(EMAIL_INDEX_COLLECTION)
+        self._async_client = None
+        self.max_staleness_seconds = USER_READ_MAX_STALENESS_SECONDS
+
+    @property
+    def _async_db(self):
+        """Firestore AsyncClient shared by the async methods."""
+        if self._async_client is None:
+            self._async_client = firestore.AsyncClient()
+        return self._async_client
+
+    def _read_time(self) -> Optional[datetime]:
+        """Read timestamp for a lookup that may be stale, or None for a strong read."""
+        if self.max_staleness_seconds <= 0:
+            return None
+        return datetime.now(timezone.utc) - timedelta(seconds=self.max_staleness_seconds)
 
-    def create_user(self, user_data: UserCreate) -> UserInDB:
+    def _get_doc(self, doc_ref, allow_stale: bool = False):
+        """
+        Snapshot of a document, or None if it does not exist.
+
+        With allow_stale (index entries only), tries a stale read first; a
+        miss is re-checked with a strong read so a document written within the
+        staleness window is still found.
+        """
+        read_time = self._read_time() if allow_stale else None
+        doc = doc_ref.get(read_time=read_time) if read_time is not None else doc_ref.get()
+        if not doc.exists and read_time is not None:
+            doc = doc_ref.get()
+        return doc if doc.exists else None
+
+    def _find_by_index(self, index_collection, field: str, value: str):
+        """User document indexed under value in a lookup index collection, or None."""
+        if not value:
+            return None
+        index_ref = index_collection.document(_index_doc_id(value))
+        entry = self._get_doc(index_ref, allow_stale=True)
+        if entry is not None:
+            return self._get_doc(self._users_collection.document(entry.get('uid')))
+        if not USER_INDEX_LEGACY_FALLBACK:
+            return None
+        doc = next(_unindexed_user_query(self._users_collection, field, value).stream(), None)
+        if doc is not None:
+            index_ref.set({'uid': doc.id})
+        return doc
+
+    async def _get_doc_async(self, doc_ref, allow_stale: bool = False):
+        """Async-client version of _get_doc."""
+        read_time = self._read_time() if allow_stale else None
+        doc = await (doc_ref.get(read_time=read_time) if read_time is not None else doc_ref.get())
+        if not doc.exists and read_time is not None:
+            doc = await doc_ref.get()
+        return doc if doc.exists else None
+
+    async def _find_by_index_async(self, index_name: str, field: str, value: str):
+        """Async-client version of _find_by_index."""
+        if not value:
+            return None
+        db = self._async_db
+        index_ref = db.collection(index_name).document(_index_doc_id(value))
+        entry = await self._get_doc_async(index_ref, allow_stale=True)
+        if entry is not None:
+            return await self._get_doc_async(db.collection('users').document(entry.get('uid')))
+        if not USER_INDEX_LEGACY_FALLBACK:
+            return None
+        docs = await _unindexed_user_query(db.collection('users'), field, value).get()
+        if not docs:
+            return None
+        await index_ref.set({'uid': docs[0].id})
+        return docs[0]
+
+    def create_user(self, user_data: UserCreate, hashed_password: Optional[str] = None) -> UserInDB:
         """
         Create a new user with hashed password.
 
+        Args:
+            user_data: User creation data with plain password
+            hashed_password: Precomputed hash of user_data.password, if already hashed
+
+        Returns:
+            Created user object
+
+        Raises:
+            ValueError: If username or email already exists
+        """
+        # Hashed before the transaction, which may run more than once on contention
+        if hashed_password is None:
+            hashed_password = get_password_hash(user_data.password)
+
+        # Uniqueness checks and the write commit atomically in one transaction
+        user_doc = _new_user_doc(user_data, hashed_password)
+        _create_user_txn(
+            self._db.transaction(),
+            self._users_collection.document(user_doc['id']),
+            self._username_index.document(_index_doc_id(user_data.username)),
+            self._email_index.document(_index_doc_id(user_data.email)),
+            user_doc,
+        )
+        return _cache_new_user(user_doc)
+
+    async def create_user_async(self, user_data: UserCreate) -> UserInDB:
+        """
+        Create a user from async code.
+
+        Hashing runs on the password pool and the transaction on the async
+        client, so neither blocks the event loop and network waits don't hold
+        a hashing worker.
+
         Args:
             user_data: User creation data with plain password
 
         Returns:
-            Created user object from database
+            Created user object
 
         Raises:
             ValueError: If username or email already exists
         """
-        # Check if username exists
-        existing = self._users_collection.where(
-            'username', '==', user_data.username
-        ).limit(1).get()
-
-        if len(list(existing)) > 0:
-            raise ValueError(f"Username '{user_data.username}' already exists")
-
-        # Check if email exists
-        existing = self._users_collection.where(
-            'email', '==', user_data.email
-        ).limit(1).get()
-
-        if len(list(existing)) > 0:
-            raise ValueError(f"Email '{user_data.email}' already exists")
-
-        # Create user document
-        user_id = str(uuid.uuid4())
-        user_doc = {
-            'id': user_id,
-            'username': user_data.username,
-            'email': user_data.email,
-            'full_name': user_data.full_name,
-            'hashed_password': get_password_hash(user_data.password),
-            'created_at': firestore.SERVER_TIMESTAMP,
-            'is_active': True,
-            'is_verified': False
-        }
-
-        self._users_collection.document(user_id).set(user_doc)
-
-        # Retrieve the created document to get server timestamp
-        created_doc = self._users_collection.document(user_id).get()
-        doc_data = created_doc.to_dict()
-
-        return UserInDB(
-            id=doc_data['id'],
-            username=doc_data['username'],
-            email=doc_data['email'],
-            full_name=doc_data.get('full_name'),
-            hashed_password=doc_data['hashed_password'],
-            created_at=doc_data['created_at'],
-            is_active=doc_data.get('is_active', True),
-            is_verified=doc_data.get('is_verified', False)
+        hashed_password = await get_password_hash_async(user_data.password)
+        user_doc = _new_user_doc(user_data, hashed_password)
+        db = self._async_db
+        await _create_user_txn_async(
+            db.transaction(),
+            db.collection('users').document(user_doc['id']),
+            db.collection(USERNAME_INDEX_COLLECTION).document(_index_doc_id(user_data.username)),
+            db.collection(EMAIL_INDEX_COLLECTION).document(_index_doc_id(user_data.email)),
+            user_doc,
         )
+        return _cache_new_user(user_doc)
 
     def get_user_by_username(self, username: str) -> Optional[UserInDB]:
         """
@@ -89,25 +327,25 @@ class UserStore:
         Returns:
             User object if found, None otherwise
         """
-        docs = self._users_collection.where(
-            'username', '==', username
-        ).limit(1).get()
+        cached = _user_cache.get(('username', username))
+        if cached is not None:
+            return None if cached is _MISSING else cached
+        return _cache_lookup(('username', username), self._find_by_index(self._username_index, 'username', username))
 
-        docs_list = list(docs)
-        if not docs_list:
-            return None
+    async def get_user_by_username_async(self, username: str) -> Optional[UserInDB]:
+        """
+        Get user by username without blocking the event loop (see get_user_by_username).
 
-        doc_data = docs_list[0].to_dict()
-        return UserInDB(
-            id=doc_data['id'],
-            username=doc_data['username'],
-            email=doc_data['email'],
-            full_name=doc_data.get('full_name'),
-            hashed_password=doc_data['hashed_password'],
-            created_at=doc_data['created_at'],
-            is_active=doc_data.get('is_active', True),
-            is_verified=doc_data.get('is_verified', False)
-        )
+        Args:
+            username: Username to search for
+
+        Returns:
+            User object if found, None otherwise
+        """
+        cached = _user_cache.get(('username', username))
+        if cached is not None:
+            return None if cached is _MISSING else cached
+        return _cache_lookup(('username', username), await self._find_by_index_async(USERNAME_INDEX_COLLECTION, 'username', username))
 
     def get_user_by_email(self, email: str) -> Optional[UserInDB]:
         """
@@ -119,25 +357,25 @@ class UserStore:
         Returns:
             User object if found, None otherwise
         """
-        docs = self._users_collection.where(
-            'email', '==', email
-        ).limit(1).get()
+        cached = _user_cache.get(('email', email))
+        if cached is not None:
+            return None if cached is _MISSING else cached
+        return _cache_lookup(('email', email), self._find_by_index(self._email_index, 'email', email))
 
-        docs_list = list(docs)
-        if not docs_list:
-            return None
+    async def get_user_by_email_async(self, email: str) -> Optional[UserInDB]:
+        """
+        Get user by email without blocking the event loop (see get_user_by_email).
 
-        doc_data = docs_list[0].to_dict()
-        return UserInDB(
-            id=doc_data['id'],
-            username=doc_data['username'],
-            email=doc_data['email'],
-            full_name=doc_data.get('full_name'),
-            hashed_password=doc_data['hashed_password'],
-            created_at=doc_data['created_at'],
-            is_active=doc_data.get('is_active', True),
-            is_verified=doc_data.get('is_verified', False)
-        )
+        Args:
+            email: Email to search for
+
+        Returns:
+            User object if found, None otherwise
+        """
+        cached = _user_cache.get(('email', email))
+        if cached is not None:
+            return None if cached is _MISSING else cached
+        return _cache_lookup(('email', email), await self._find_by_index_async(EMAIL_INDEX_COLLECTION, 'email', email))
 
     def get_user_by_id(self, user_id: str) -> Optional[UserInDB]:
         """
@@ -149,22 +387,27 @@ class UserStore:
         Returns:
             User object if found, None otherwise
         """
-        doc = self._users_collection.document(user_id).get()
+        cached = _user_cache.get(('id', user_id))
+        if cached is not None:
+            return None if cached is _MISSING else cached
+        doc = self._get_doc(self._users_collection.document(user_id))
+        return _cache_lookup(('id', user_id), doc)
 
-        if not doc.exists:
-            return None
+    async def get_user_by_id_async(self, user_id: str) -> Optional[UserInDB]:
+        """
+        Get user by ID without blocking the event loop (see get_user_by_id).
 
-        doc_data = doc.to_dict()
-        return UserInDB(
-            id=doc_data['id'],
-            username=doc_data['username'],
-            email=doc_data['email'],
-            full_name=doc_data.get('full_name'),
-            hashed_password=doc_data['hashed_password'],
-            created_at=doc_data['created_at'],
-            is_active=doc_data.get('is_active', True),
-            is_verified=doc_data.get('is_verified', False)
-        )
+        Args:
+            user_id: User ID to search for
+
+        Returns:
+            User object if found, None otherwise
+        """
+        cached = _user_cache.get(('id', user_id))
+        if cached is not None:
+            return None if cached is _MISSING else cached
+        doc = await self._get_doc_async(self._async_db.collection('users').document(user_id))
+        return _cache_lookup(('id', user_id), doc)
 
     def update_user_verified(self, user_id: str, is_verified: bool) -> bool:
         """
@@ -181,6 +424,47 @@ class UserStore:
             self._users_collection.document(user_id).update({
                 'is_verified': is_verified
             })
+            _update_cached_user(user_id, is_verified=is_verified)
+            return True
+        except Exception:
+            return False
+
+    def update_password_hash(self, user_id: str, hashed_password: str) -> bool:
+        """
+        Replace a user's stored password hash.
+
+        Args:
+            user_id: User ID
+            hashed_password: New password hash
+
+        Returns:
+            True if update successful, False otherwise
+        """
+        try:
+            self._users_collection.document(user_id).update({
+                'hashed_password': hashed_password
+            })
+            _update_cached_user(user_id, hashed_password=hashed_password)
+            return True
+        except Exception:
+            return False
+
+    async def update_password_hash_async(self, user_id: str, hashed_password: str) -> bool:
+        """
+        Replace a user's stored password hash without blocking the event loop.
+
+        Args:
+            user_id: User ID
+            hashed_password: New password hash
+
+        Returns:
+            True if update successful, False otherwise
+        """
+        try:
+            await self._async_db.collection('users').document(user_id).update({
+                'hashed_password': hashed_password
+            })
+            _update_cached_user(user_id, hashed_password=hashed_password)
             return True
         except Exception:
             return False
@@ -199,34 +483,69 @@ class UserStore:
             self._users_collection.document(user_id).update({
                 'is_active': False
             })
+            _update_cached_user(user_id, is_active=False)
             return True
         except Exception:
             return False
 
-    def list_users(self, limit: int = 100) -> List[UserInDB]:
+    def backfill_lookup_indexes(self, batch_size: int = 500) -> int:
+        """
+        Write username/email index entries for every existing user (migration).
+
+        Safe to re-run: entries are overwritten with the same uid.
+
+        Args:
+            batch_size: Writes per batch commit (Firestore allows 500; each user takes two)
+
+        Returns:
+            Number of users indexed
+        """
+        users_per_batch = max(1, batch_size // 2)
+        count = 0
+        batch = self._db.batch()
+        for doc in self._users_collection.select(['username', 'email']).stream():
+            doc_data = doc.to_dict() or {}
+            for index_collection, field in ((self._username_index, 'username'), (self._email_index, 'email')):
+                if doc_data.get(field):
+                    batch.set(index_collection.document(_index_doc_id(doc_data[field])), {'uid': doc.id})
+            count += 1
+            if count % users_per_batch == 0:
+                batch.commit()
+                batch = self._db.batch()
+        batch.commit()
+        return count
+
+    def list_users_iter(self, limit: int = 100, include_hash: bool = False) -> Iterator[UserInDB]:
+        """
+        Iterate over users as Firestore streams them (admin function).
+
+        Args:
+            limit: Maximum number of users to return
+            include_hash: Also fetch hashed_password; otherwise it is left out of
+                the query projection and set to an empty string
+
+        Yields:
+            User objects
+        """
+        query = self._users_collection.limit(limit)
+        if not include_hash:
+            query = query.select(_LISTING_FIELDS)
+
+        for doc in query.stream():
+            doc_data = doc.to_dict()
+            if not include_hash:
+                doc_data['hashed_password'] = ''
+            yield UserInDB.from_doc(doc_data)
+
+    def list_users(self, limit: int = 100, include_hash: bool = True) -> List[UserInDB]:
         """
         List all users (admin function).
 
         Args:
             limit: Maximum number of users to return
+            include_hash: Whether to fetch password hashes (see list_users_iter)
 
         Returns:
             List of user objects
         """
-        docs = self._users_collection.limit(limit).stream()
-        users = []
-
-        for doc in docs:
-            doc_data = doc.to_dict()
-            users.append(UserInDB(
-                id=doc_data['id'],
-                username=doc_data['username'],
-                email=doc_data['email'],
-                full_name=doc_data.get('full_name'),
-                hashed_password=doc_data['hashed_password'],
-                created_at=doc_data['created_at'],
-                is_active=doc_data.get('is_active', True),
-                is_verified=doc_data.get('is_verified', False)
-            ))
-
-        return users
+        return list(self.list_users_iter(limit, include_hash=include_hash))
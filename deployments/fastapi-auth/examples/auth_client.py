@@ -27,6 +27,13 @@ class SammoClient:
         """
         self.base_url = base_url
         self.access_token: Optional[str] = None
+        # One pooled session, so calls after the first reuse the TCP/TLS connection
+        self._session = requests.Session()
+        self._session.headers["Content-Type"] = "application/json"
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self._session.close()
 
     def register(
         self,
@@ -57,7 +64,7 @@ class SammoClient:
             "full_name": full_name
         }
 
-        response = requests.post(f"{self.base_url}/auth/register", json=data)
+        response = self._session.post(f"{self.base_url}/auth/register", json=data)
         response.raise_for_status()
 
         return response.json()
@@ -81,24 +88,21 @@ class SammoClient:
             "password": password
         }
 
-        response = requests.post(f"{self.base_url}/auth/login", json=data)
+        response = self._session.post(f"{self.base_url}/auth/login", json=data)
         response.raise_for_status()
 
         token_data = response.json()
         self.access_token = token_data["access_token"]
+        # Set once on the session instead of passing headers= on every call
+        self._session.headers["Authorization"] = f"Bearer {self.access_token}"
 
         return token_data
 
-    def _get_headers(self) -> Dict[str, str]:
-        """Get headers with authentication token."""
+    def _require_login(self) -> None:
+        """Raise if login() has not stored a token on the session yet."""
         if not self.access_token:
             raise ValueError("Not authenticated. Call login() first.")
 
-        return {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
-
     def get_profile(self) -> Dict[str, Any]:
         """
         Get current user profile.
@@ -109,10 +113,8 @@ class SammoClient:
         Raises:
             requests.HTTPError: If request fails
         """
-        response = requests.get(
-            f"{self.base_url}/auth/me",
-            headers=self._get_headers()
-        )
+        self._require_login()
+        response = self._session.get(f"{self.base_url}/auth/me")
         response.raise_for_status()
 
         return response.json()
@@ -149,10 +151,10 @@ class SammoClient:
             "notes": notes
         }
 
-        response = requests.post(
+        self._require_login()
+        response = self._session.post(
             f"{self.base_url}/api/log_round",
-            json=data,
-            headers=self._get_headers()
+            json=data
         )
         response.raise_for_status()
 
@@ -168,10 +170,8 @@ class SammoClient:
         Raises:
             requests.HTTPError: If request fails
         """
-        response = requests.get(
-            f"{self.base_url}/api/dashboard_stats",
-            headers=self._get_headers()
-        )
+        self._require_login()
+        response = self._session.get(f"{self.base_url}/api/dashboard_stats")
         response.raise_for_status()
 
         return response.json()
@@ -189,10 +189,8 @@ class SammoClient:
         Raises:
             requests.HTTPError: If request fails
         """
-        response = requests.get(
-            f"{self.base_url}/api/rounds_history?limit={limit}",
-            headers=self._get_headers()
-        )
+        self._require_login()
+        response = self._session.get(f"{self.base_url}/api/rounds_history?limit={limit}")
         response.raise_for_status()
 
         return response.json()
@@ -210,10 +208,8 @@ class SammoClient:
         Raises:
             requests.HTTPError: If request fails
         """
-        response = requests.delete(
-            f"{self.base_url}/api/rounds/{round_id}",
-            headers=self._get_headers()
-        )
+        self._require_login()
+        response = self._session.delete(f"{self.base_url}/api/rounds/{round_id}")
         response.raise_for_status()
 
         return response.json()
@@ -321,6 +317,8 @@ def main():
         print(f"\n❌ Error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        client.close()
 
 
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
 """
-SAMMO Fight IQ - Flask Application with JWT Authentication
+SAMMO Fight IQ - Quart Application with JWT Authentication
 
 A containerized boxing analysis API that provides:
 - User registration and login with JWT tokens
@@ -9,24 +9,41 @@ A containerized boxing analysis API that provides:
 - Round history retrieval (protected, user-specific)
 - Round deletion (protected, user-specific)
 
-Connects to Google Cloud Firestore for data persistence.
+Connects to Google Cloud Firestore for data persistence. Handlers are async
+(Quart on Uvicorn), so concurrent requests share one event loop per worker
+while they wait on Firestore instead of each holding a thread.
 """
 import os
+import asyncio
+import time
+from bisect import bisect_right
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
-from flask import Flask, request, jsonify, make_response
-from flask_cors import CORS
+from quart import Quart, request, jsonify
+from quart.json.provider import DefaultJSONProvider
+from quart_cors import cors
+from pydantic import BaseModel, ValidationError
+from google.api_core.exceptions import FailedPrecondition
 from google.cloud import firestore
 from dotenv import load_dotenv
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Import authentication module
 from auth_flask import (
     require_auth,
     optional_auth,
     get_current_user,
+    get_firestore_client,
+    next_firestore_client,
     create_access_token,
-    verify_password,
+    verify_password_async,
     user_store,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
@@ -34,19 +51,124 @@ from auth_flask import (
 # Load environment variables
 load_dotenv()
 
-# Initialize Flask app
-app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
+class OrjsonProvider(DefaultJSONProvider):
+    """Quart JSON provider backed by orjson (falls back to the default for unknown types)."""
+
+    option = (
+        orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if ORJSON_AVAILABLE else 0
+    )
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self.option | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+# Initialize Quart app
+app = Quart(__name__)
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+# Key order is irrelevant to clients; skip the sort pass on the stdlib fallback
+app.json.sort_keys = False
+app = cors(app)  # Enable CORS for all routes
+
+# Most rounds accepted by /api/log_rounds (Firestore's limit for one write batch)
+MAX_ROUNDS_PER_BATCH = 500
 
-# Initialize Firestore client
+# Numeric round fields averaged by /api/dashboard_stats
+DASHBOARD_FIELDS = ('pressure_score', 'ring_control_score', 'defense_score', 'clean_shots_taken')
+
+# Fields of the most recent round needed for the next game plan (its strategy
+# was computed and stored when the round was logged)
+GAME_PLAN_FIELDS = ['strategy_title', 'strategy_text', 'date']
+
+# Per-user dashboard responses, dropped when the user's rounds change. Each
+# worker keeps its own copy, so other workers may serve one up to the TTL old.
+DASHBOARD_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "30"))
+DASHBOARD_CACHE_MAX_USERS = int(os.getenv("DASHBOARD_CACHE_MAX_USERS", "10000"))
+
+# Round fields returned by /api/rounds_history by default (user_id/username
+# only repeat the caller's identity, so they are not fetched)
+ROUND_HISTORY_FIELDS = [
+    'pressure_score', 'ring_control_score', 'defense_score', 'clean_shots_taken',
+    'notes', 'danger_score', 'strategy_title', 'strategy_text', 'date'
+]
+
+# Initialize the Firestore client pool (shared with the auth module)
 try:
-    _firestore_client = firestore.Client()
-    _rounds_collection = _firestore_client.collection('rounds')
+    _firestore_client = get_firestore_client()
     print("✅ Connected to Firestore successfully")
 except Exception as e:
     print(f"⚠️  Firestore initialization warning: {e}")
     _firestore_client = None
-    _rounds_collection = None
+
+
+def _next_client() -> firestore.AsyncClient:
+    """Pick the next Firestore client from the shared pool (round-robin)."""
+    return next_firestore_client()
+
+
+def _rounds_collection():
+    """Rounds collection on the next pooled client."""
+    return _next_client().collection('rounds')
+
+
+# user id -> (monotonic expiry, dashboard payload); only touched from the
+# event loop thread, so no locking is needed
+_dashboard_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+
+def _get_cached_dashboard(user_id: str) -> Optional[Dict[str, Any]]:
+    """Cached dashboard payload for a user, or None if absent or expired."""
+    entry = _dashboard_cache.get(user_id)
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    _dashboard_cache.move_to_end(user_id)
+    return entry[1]
+
+
+def _cache_dashboard(user_id: str, stats: Dict[str, Any]) -> None:
+    """Cache a user's dashboard payload, evicting the least recently used users."""
+    _dashboard_cache[user_id] = (time.monotonic() + DASHBOARD_CACHE_TTL_SECONDS, stats)
+    _dashboard_cache.move_to_end(user_id)
+    while len(_dashboard_cache) > DASHBOARD_CACHE_MAX_USERS:
+        _dashboard_cache.popitem(last=False)
+
+
+def _invalidate_dashboard(user_id: str) -> None:
+    """Drop a user's cached dashboard after their rounds change."""
+    _dashboard_cache.pop(user_id, None)
+
+
+# ============================================================================
+# Request Models
+# ============================================================================
+
+class RoundIn(BaseModel):
+    """Validated /api/log_round payload (and each item of /api/log_rounds)."""
+    pressure_score: float
+    ring_control_score: float
+    defense_score: float
+    clean_shots_taken: int
+    notes: Optional[str] = ''
+
+
+def _round_payload_error(error: ValidationError) -> str:
+    """Turn a RoundIn validation error into the API's error message."""
+    errors = error.errors()
+    if any(e['type'] in ('json_invalid', 'model_type') for e in errors):
+        return 'Invalid or missing JSON payload'
+    missing_fields = [str(e['loc'][0]) for e in errors if e['type'] == 'missing']
+    if missing_fields:
+        return f'Missing required fields: {", ".join(missing_fields)}'
+    return f'Invalid data type: {errors[0]["loc"][0]}: {errors[0]["msg"]}'
 
 
 # ============================================================================
@@ -68,13 +190,35 @@ def calculate_danger(round_data: Dict[str, Any]) -> float:
     Returns:
         Danger score between 0.0 (safe) and 1.0 (high danger)
     """
-    clean = round_data.get('clean_shots_taken', 0) / 5.0
-    defense = (10 - round_data.get('defense_score', 5)) / 10.0
-    control = (10 - round_data.get('ring_control_score', 5)) / 10.0
-    score = (0.5 * clean) + (0.3 * defense) + (0.2 * control)
+    # A few float ops: cheaper than building and hashing a memoization key
+    get = round_data.get
+    score = (
+        0.5 * (get('clean_shots_taken', 0) / 5.0)
+        + 0.3 * ((10 - get('defense_score', 5)) / 10.0)
+        + 0.2 * ((10 - get('ring_control_score', 5)) / 10.0)
+    )
     return max(0.0, min(score, 1.0))
 
 
+# Strategies ordered by rising danger; _STRATEGY_THRESHOLDS are the lower bounds of the upper tiers.
+# Looked up with exact scores (rounding first would move rounds across a threshold).
+_STRATEGY_THRESHOLDS = (0.4, 0.7)
+_STRATEGIES = (
+    (
+        "PRESSURE_BODY",
+        "Walk him down. Invest in the body and arms. Bully, clinch, drown him."
+    ),
+    (
+        "RING_CUTTING",
+        "Smart pressure. Cut exits, feint to draw counters. No ego wars. Control space."
+    ),
+    (
+        "DEFENSE_FIRST",
+        "High guard, active feet. Max 2-punch combos. Pump the jab, angle off. Do not trade."
+    ),
+)
+
+
 def get_strategy(danger_score: float) -> Tuple[str, str]:
     """
     Get recommended boxing strategy based on danger score.
@@ -90,21 +234,55 @@ def get_strategy(danger_score: float) -> Tuple[str, str]:
     Returns:
         Tuple of (strategy_title, strategy_text)
     """
-    if danger_score >= 0.7:
-        return (
-            "DEFENSE_FIRST",
-            "High guard, active feet. Max 2-punch combos. Pump the jab, angle off. Do not trade."
-        )
-    elif danger_score >= 0.4:
-        return (
-            "RING_CUTTING",
-            "Smart pressure. Cut exits, feint to draw counters. No ego wars. Control space."
-        )
-    else:
-        return (
-            "PRESSURE_BODY",
-            "Walk him down. Invest in the body and arms. Bully, clinch, drown him."
-        )
+    return _STRATEGIES[bisect_right(_STRATEGY_THRESHOLDS, danger_score)]
+
+
+def _build_round_doc(round_in: RoundIn, user: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the Firestore document for a validated round, with its danger score and strategy.
+
+    Args:
+        round_in: Validated round metrics
+        user: Authenticated user the round belongs to
+
+    Returns:
+        Round document (dated by the server on write)
+    """
+    round_fields = round_in.model_dump()
+    danger_score = calculate_danger(round_fields)
+    strategy_title, strategy_text = get_strategy(danger_score)
+
+    return {
+        'user_id': user['id'],
+        'username': user['username'],
+        **round_fields,
+        'danger_score': danger_score,
+        'strategy_title': strategy_title,
+        'strategy_text': strategy_text,
+        'date': firestore.SERVER_TIMESTAMP
+    }
+
+
+def _parse_fields_param(raw: Optional[str]):
+    """
+    Parse a comma-separated ?fields= list into a Firestore projection.
+
+    Returns None when no projection was requested, False when a field name
+    is invalid, otherwise the field list (always including 'date', which the
+    history is ordered by; 'id' is the document id, not a stored field).
+    """
+    if not raw:
+        return None
+    fields = ['date']
+    for name in raw.split(','):
+        name = name.strip()
+        if not name or name in ('id', 'date') or name in fields:
+            continue
+        if not name.isidentifier():
+            return False
+        fields.append(name)
+    return fields
+
 
 
 def _to_iso(ts) -> Optional[str]:
@@ -119,61 +297,103 @@ def _to_iso(ts) -> Optional[str]:
     """
     if ts is None:
         return None
-    try:
+    if isinstance(ts, datetime):  # includes Firestore's DatetimeWithNanoseconds
         return ts.isoformat()
-    except Exception:
+    if isinstance(ts, (int, float)):
         try:
-            return datetime.fromtimestamp(float(ts)).isoformat()
-        except Exception:
+            return datetime.fromtimestamp(ts).isoformat()
+        except (OverflowError, OSError, ValueError):
             return str(ts)
+    return str(ts)
+
+
+def _json_bytes(obj: Any) -> bytes:
+    """Encode obj with the app's JSON settings, straight to bytes when orjson is available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=app.json.default, option=OrjsonProvider.option)
+    return app.json.dumps(obj).encode()
+
+
+def _round_json(doc) -> bytes:
+    """Encode a round document (with its id and an ISO date) as JSON bytes."""
+    data = doc.to_dict() or {}
+    data['id'] = doc.id
+
+    # Convert Firestore timestamp to ISO string
+    data['date'] = _to_iso(data.get('date'))
+
+    return _json_bytes(data)
+
+
+# (epoch second, ISO string) of the last formatted timestamp
+_now_iso_cache: Tuple[int, str] = (0, '')
+
+
+def _utc_now_iso() -> str:
+    """Current UTC time as an ISO string, reformatted at most once per second."""
+    global _now_iso_cache
+    second = int(time.time())
+    cached = _now_iso_cache
+    if cached[0] != second:
+        cached = (second, datetime.fromtimestamp(second, timezone.utc).isoformat())
+        _now_iso_cache = cached
+    return cached[1]
 
 
 # ============================================================================
 # Public Endpoints
 # ============================================================================
 
+# Static API description served by root(), encoded once at import
+_ROOT_INFO = {
+    'service': 'SAMMO Fight IQ',
+    'version': '1.0.0',
+    'description': 'AI-Powered Boxing Coach API with JWT Authentication',
+    'authentication': 'JWT Bearer Token',
+    'endpoints': {
+        'public': {
+            'health': '/health',
+            'register': '/auth/register (POST)',
+            'login': '/auth/login (POST)'
+        },
+        'protected': {
+            'me': '/auth/me (GET)',
+            'log_round': '/api/log_round (POST)',
+            'log_rounds': '/api/log_rounds (POST)',
+            'dashboard_stats': '/api/dashboard_stats (GET)',
+            'rounds_history': '/api/rounds_history (GET)',
+            'delete_round': '/api/rounds/{id} (DELETE)'
+        }
+    }
+}
+_ROOT_BODY = (app.json.dumps(_ROOT_INFO) + '\n').encode()
+
+# /health body around the timestamp; connection states are fixed at startup
+_HEALTH_BODY_PREFIX = b'{"status":"healthy","timestamp":"'
+_HEALTH_BODY_SUFFIX = (
+    '","firestore":"{}","authentication":"{}"}}\n'.format(
+        "connected" if _firestore_client is not None else "disconnected",
+        "enabled" if user_store is not None else "disabled",
+    ).encode()
+)
+
+
 @app.route('/')
-def root():
+async def root():
     """Root endpoint with API information."""
-    return jsonify({
-        'service': 'SAMMO Fight IQ',
-        'version': '1.0.0',
-        'description': 'AI-Powered Boxing Coach API with JWT Authentication',
-        'authentication': 'JWT Bearer Token',
-        'endpoints': {
-            'public': {
-                'health': '/health',
-                'register': '/auth/register (POST)',
-                'login': '/auth/login (POST)'
-            },
-            'protected': {
-                'me': '/auth/me (GET)',
-                'log_round': '/api/log_round (POST)',
-                'dashboard_stats': '/api/dashboard_stats (GET)',
-                'rounds_history': '/api/rounds_history (GET)',
-                'delete_round': '/api/rounds/{id} (DELETE)'
-            }
-        }
-    })
+    return app.response_class(_ROOT_BODY, mimetype='application/json')
 
 
 @app.route('/health', methods=['GET'])
-def health_check():
+async def health_check():
     """
     Health check endpoint for OpenShift probes.
 
     Returns:
         JSON with status and timestamp
     """
-    firestore_status = "connected" if _firestore_client is not None else "disconnected"
-    auth_status = "enabled" if user_store is not None else "disabled"
-
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.utcnow().isoformat(),
-        'firestore': firestore_status,
-        'authentication': auth_status
-    }), 200
+    body = _HEALTH_BODY_PREFIX + _utc_now_iso().encode() + _HEALTH_BODY_SUFFIX
+    return app.response_class(body, mimetype='application/json'), 200
 
 
 # ============================================================================
@@ -181,7 +401,7 @@ def health_check():
 # ============================================================================
 
 @app.route('/auth/register', methods=['POST'])
-def register():
+async def register():
     """
     Register a new user.
 
@@ -203,7 +423,7 @@ def register():
         }), 503
 
     try:
-        data = request.get_json()
+        data = await request.get_json()
         if not data:
             return jsonify({
                 'status': 'error',
@@ -227,7 +447,7 @@ def register():
             }), 400
 
         # Create user
-        user = user_store.create_user(
+        user = await user_store.create_user(
             username=data['username'],
             email=data['email'],
             password=data['password'],
@@ -260,7 +480,7 @@ def register():
 
 
 @app.route('/auth/login', methods=['POST'])
-def login():
+async def login():
     """
     Login and get JWT access token.
 
@@ -280,7 +500,7 @@ def login():
         }), 503
 
     try:
-        data = request.get_json()
+        data = await request.get_json()
         if not data:
             return jsonify({
                 'status': 'error',
@@ -297,7 +517,7 @@ def login():
             }), 400
 
         # Get user
-        user = user_store.get_user_by_username(username)
+        user = await user_store.get_user_by_username(username)
         if not user:
             return jsonify({
                 'status': 'error',
@@ -305,7 +525,7 @@ def login():
             }), 401
 
         # Verify password
-        if not verify_password(password, user['hashed_password']):
+        if not await verify_password_async(password, user['hashed_password']):
             return jsonify({
                 'status': 'error',
                 'message': 'Incorrect username or password'
@@ -341,7 +561,7 @@ def login():
 
 @app.route('/auth/me', methods=['GET'])
 @require_auth
-def get_current_user_info():
+async def get_current_user_info():
     """
     Get current authenticated user information.
 
@@ -350,7 +570,7 @@ def get_current_user_info():
     Returns:
         User profile information
     """
-    user = get_current_user()
+    user = await get_current_user()
 
     return jsonify({
         'id': user['id'],
@@ -368,7 +588,7 @@ def get_current_user_info():
 
 @app.route('/api/log_round', methods=['POST'])
 @require_auth
-def log_round():
+async def log_round():
     """
     Log a new boxing round with danger score and strategy calculation.
 
@@ -386,61 +606,38 @@ def log_round():
     Returns:
         JSON with round ID, danger score, and recommended strategy
     """
-    if _rounds_collection is None:
+    if _firestore_client is None:
         return jsonify({
             'status': 'error',
             'message': 'Firestore not available'
         }), 503
 
     try:
-        user = get_current_user()
-        payload = request.get_json()
-
-        if not payload:
-            return jsonify({
-                'status': 'error',
-                'message': 'Invalid or missing JSON payload'
-            }), 400
-
-        # Validate required fields
-        required_fields = ['pressure_score', 'ring_control_score', 'defense_score', 'clean_shots_taken']
-        missing_fields = [field for field in required_fields if field not in payload]
+        user = await get_current_user()
 
-        if missing_fields:
+        # Parse and validate the JSON body in one pass
+        try:
+            round_in = RoundIn.model_validate_json(await request.get_data(cache=False))
+        except ValidationError as e:
             return jsonify({
                 'status': 'error',
-                'message': f'Missing required fields: {", ".join(missing_fields)}'
+                'message': _round_payload_error(e)
             }), 400
 
-        # Calculate danger score and strategy
-        danger_score = calculate_danger(payload)
-        strategy_title, strategy_text = get_strategy(danger_score)
-
-        # Prepare document with user association
-        round_doc = {
-            'user_id': user['id'],
-            'username': user['username'],
-            'pressure_score': float(payload['pressure_score']),
-            'ring_control_score': float(payload['ring_control_score']),
-            'defense_score': float(payload['defense_score']),
-            'clean_shots_taken': int(payload['clean_shots_taken']),
-            'notes': payload.get('notes', ''),
-            'danger_score': danger_score,
-            'strategy_title': strategy_title,
-            'strategy_text': strategy_text,
-            'date': firestore.SERVER_TIMESTAMP
-        }
+        # Prepare document with user association, danger score and strategy
+        round_doc = _build_round_doc(round_in, user)
 
         # Store in Firestore
-        doc_ref, _ = _rounds_collection.add(round_doc)
+        _, doc_ref = await _rounds_collection().add(round_doc)
+        _invalidate_dashboard(user['id'])
 
         return jsonify({
             'status': 'success',
             'id': doc_ref.id,
-            'danger_score': danger_score,
+            'danger_score': round_doc['danger_score'],
             'strategy': {
-                'title': strategy_title,
-                'text': strategy_text
+                'title': round_doc['strategy_title'],
+                'text': round_doc['strategy_text']
             }
         }), 200
 
@@ -457,9 +654,100 @@ def log_round():
         }), 500
 
 
+@app.route('/api/log_rounds', methods=['POST'])
+@require_auth
+async def log_rounds():
+    """
+    Log several boxing rounds (e.g. a whole session) in one atomic write batch.
+
+    Requires: Authorization header with Bearer token
+
+    Expected JSON payload: a list of up to MAX_ROUNDS_PER_BATCH round objects,
+    each shaped like the /api/log_round payload.
+
+    Returns:
+        JSON with each stored round's ID, danger score, and recommended
+        strategy (in request order) and the number stored
+    """
+    if _firestore_client is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Firestore not available'
+        }), 503
+
+    try:
+        user = await get_current_user()
+        payload = await request.get_json()
+
+        if not payload or not isinstance(payload, list):
+            return jsonify({
+                'status': 'error',
+                'message': 'Expected a non-empty JSON list of rounds'
+            }), 400
+
+        if len(payload) > MAX_ROUNDS_PER_BATCH:
+            return jsonify({
+                'status': 'error',
+                'message': f'At most {MAX_ROUNDS_PER_BATCH} rounds per request'
+            }), 400
+
+        # Validate every round before writing any of them
+        rounds_in = []
+        for index, item in enumerate(payload):
+            try:
+                rounds_in.append(RoundIn.model_validate(item))
+            except ValidationError as e:
+                return jsonify({
+                    'status': 'error',
+                    'message': f'Round {index}: {_round_payload_error(e)}'
+                }), 400
+
+        round_docs = [_build_round_doc(round_in, user) for round_in in rounds_in]
+
+        # One commit RPC for all rounds; they are stored together or not at all
+        client = _next_client()
+        rounds_collection = client.collection('rounds')
+        batch = client.batch()
+        doc_refs = []
+        for round_doc in round_docs:
+            doc_ref = rounds_collection.document()
+            batch.create(doc_ref, round_doc)
+            doc_refs.append(doc_ref)
+        await batch.commit()
+        _invalidate_dashboard(user['id'])
+
+        return jsonify({
+            'status': 'success',
+            'rounds': [
+                {
+                    'id': doc_ref.id,
+                    'danger_score': round_doc['danger_score'],
+                    'strategy': {
+                        'title': round_doc['strategy_title'],
+                        'text': round_doc['strategy_text']
+                    }
+                }
+                for doc_ref, round_doc in zip(doc_refs, round_docs)
+            ],
+            'total': len(round_docs)
+        }), 200
+
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Invalid data type: {str(e)}'
+        }), 400
+    except Exception as e:
+        app.logger.error(f"Error logging rounds: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f'Internal server error: {str(e)}'
+        }), 500
+
+
 @app.route('/api/dashboard_stats', methods=['GET'])
 @require_auth
-def get_dashboard_stats():
+async def get_dashboard_stats():
     """
     Get aggregated statistics for the authenticated user.
 
@@ -472,68 +760,68 @@ def get_dashboard_stats():
         - next_game_plan: Recommended strategy based on most recent round
         - total_rounds: Total number of rounds logged by user
     """
-    if _rounds_collection is None:
+    if _firestore_client is None:
         return jsonify({
             'status': 'error',
             'message': 'Firestore not available'
         }), 503
 
     try:
-        user = get_current_user()
-
-        # Query only the current user's rounds
-        docs = list(_rounds_collection.where('user_id', '==', user['id']).stream())
-        count = len(docs)
-
-        totals = {
-            'pressure_score': 0.0,
-            'ring_control_score': 0.0,
-            'defense_score': 0.0,
-            'clean_shots_taken': 0.0
-        }
-
-        most_recent = None
-        most_recent_date = None
-
-        for d in docs:
-            data = d.to_dict() or {}
-
-            # Accumulate totals
-            for key in totals:
-                try:
-                    totals[key] += float(data.get(key, 0.0) or 0.0)
-                except Exception:
-                    totals[key] += 0.0
+        user = await get_current_user()
+
+        # Repeat views within the TTL skip Firestore entirely
+        cached = _get_cached_dashboard(user['id'])
+        if cached is not None:
+            return jsonify(cached), 200
+
+        # Aggregate the current user's rounds server-side
+        user_rounds = _rounds_collection().where(filter=firestore.FieldFilter('user_id', '==', user['id']))
+        aggregation = user_rounds.count(alias='total_rounds')
+        for key in DASHBOARD_FIELDS:
+            aggregation = aggregation.sum(key, alias=key)
+
+        # Most recent round (uses the user_id + date DESC composite index),
+        # fetched concurrently with the aggregation
+        aggregation_result, recent_docs = await asyncio.gather(
+            aggregation.get(),
+            user_rounds
+            .select(GAME_PLAN_FIELDS)
+            .order_by('date', direction=firestore.AsyncQuery.DESCENDING)
+            .limit(1)
+            .get()
+        )
 
-            # Track most recent round
-            date_val = data.get('date')
-            if date_val is not None:
-                if most_recent_date is None or date_val > most_recent_date:
-                    most_recent_date = date_val
-                    most_recent = data
+        results = {r.alias: r.value for r in aggregation_result[0]}
+        count = int(results.get('total_rounds') or 0)
+        most_recent = (recent_docs[0].to_dict() or {}) if recent_docs else None
+        most_recent_date = most_recent.get('date') if most_recent else None
 
-        # Calculate averages
+        # Calculate averages (missing fields count as 0, as before)
         if count == 0:
-            averages = {k: 0.0 for k in totals}
+            averages = {k: 0.0 for k in DASHBOARD_FIELDS}
         else:
-            averages = {k: round(totals[k] / count, 2) for k in totals}
+            averages = {
+                k: round(float(results.get(k) or 0.0) / count, 2)
+                for k in DASHBOARD_FIELDS
+            }
 
-        # Generate next game plan based on most recent round
+        # Next game plan: the strategy stored with the most recent round
         next_game_plan = {'title': None, 'text': None}
         if most_recent:
-            danger_score = calculate_danger(most_recent)
-            strategy_title, strategy_text = get_strategy(danger_score)
             next_game_plan = {
-                'title': strategy_title,
-                'text': strategy_text
+                'title': most_recent.get('strategy_title'),
+                'text': most_recent.get('strategy_text')
             }
 
-        return jsonify({
+        stats = {
             'averages': averages,
             'most_recent_round_date': _to_iso(most_recent_date),
             'next_game_plan': next_game_plan,
             'total_rounds': count
-        }), 200
+        }
+        _cache_dashboard(user['id'], stats)
+
+        return jsonify(stats), 200
 
     except Exception as e:
         app.logger.error(f"Error getting dashboard stats: {str(e)}")
@@ -545,7 +833,7 @@ def get_dashboard_stats():
 
 @app.route('/api/rounds_history', methods=['GET'])
 @require_auth
-def get_rounds_history():
+async def get_rounds_history():
     """
     Get history of user's rounds, sorted by date (most recent first).
 
@@ -553,51 +841,65 @@ def get_rounds_history():
 
     Query Parameters:
         limit (optional): Maximum number of rounds to return (default: 100)
+        fields (optional): Comma-separated round fields to return (default: ROUND_HISTORY_FIELDS)
 
     Returns:
         JSON with:
         - rounds: List of round objects
         - total: Total number of rounds
     """
-    if _rounds_collection is None:
+    if _firestore_client is None:
         return jsonify({
             'status': 'error',
             'message': 'Firestore not available'
         }), 503
 
     try:
-        user = get_current_user()
+        user = await get_current_user()
 
         # Get limit from query parameter
         limit = request.args.get('limit', default=100, type=int)
-        limit = min(limit, 1000)  # Cap at 1000 for safety
+        limit = max(1, min(limit, 1000))  # Clamp to 1..1000 for safety
 
-        # Query only the current user's rounds
-        docs = list(
-            _rounds_collection
-            .where('user_id', '==', user['id'])
+        # Optional projection, e.g. ?fields=danger_score,strategy_title
+        fields = _parse_fields_param(request.args.get('fields'))
+        if fields is False:
+            return jsonify({
+                'status': 'error',
+                'message': 'Invalid fields parameter'
+            }), 400
+
+        # Query only the current user's rounds, most recent first
+        # (served by the user_id + date DESC composite index)
+        docs = (
+            _rounds_collection()
+            .where(filter=firestore.FieldFilter('user_id', '==', user['id']))
+            .select(fields or ROUND_HISTORY_FIELDS)
+            .order_by('date', direction=firestore.AsyncQuery.DESCENDING)
             .limit(limit)
             .stream()
         )
 
-        rounds = []
-        for d in docs:
-            data = d.to_dict() or {}
-            data['id'] = d.id
-
-            # Convert Firestore timestamp to ISO string
-            date_val = data.get('date')
-            data['date'] = _to_iso(date_val)
-
-            rounds.append(data)
-
-        # Sort by date descending (most recent first)
-        rounds.sort(key=lambda x: x.get('date') or '', reverse=True)
-
-        return jsonify({
-            'rounds': rounds,
-            'total': len(rounds)
-        }), 200
+        # Wait for the first round here, so query errors still become a 500
+        # instead of breaking an already-started response
+        try:
+            first = await docs.__anext__()
+        except StopAsyncIteration:
+            first = None
+
+        async def generate():
+            # Each round is encoded and sent as it arrives from Firestore
+            yield b'{"rounds":['
+            total = 0
+            if first is not None:
+                yield _round_json(first)
+                total = 1
+                async for d in docs:
+                    yield b',' + _round_json(d)
+                    total += 1
+            yield b'],"total":%d}\n' % total
+
+        return app.response_class(generate(), mimetype='application/json'), 200
 
     except Exception as e:
         app.logger.error(f"Error getting rounds history: {str(e)}")
@@ -609,7 +911,7 @@ def get_rounds_history():
 
 @app.route('/api/rounds/<round_id>', methods=['DELETE'])
 @require_auth
-def delete_round(round_id):
+async def delete_round(round_id):
     """
     Delete a specific round.
 
@@ -622,18 +924,18 @@ def delete_round(round_id):
     Returns:
         Success message
     """
-    if _rounds_collection is None:
+    if _firestore_client is None:
         return jsonify({
             'status': 'error',
             'message': 'Firestore not available'
         }), 503
 
     try:
-        user = get_current_user()
+        user = await get_current_user()
 
-        # Get the round document
-        doc_ref = _rounds_collection.document(round_id)
-        doc = doc_ref.get()
+        # Get the round's owner (the only field the check needs)
+        doc_ref = _rounds_collection().document(round_id)
+        doc = await doc_ref.get(field_paths=['user_id'])
 
         if not doc.exists:
             return jsonify({
@@ -649,8 +951,15 @@ def delete_round(round_id):
                 'message': 'Not authorized to delete this round'
             }), 403
 
-        # Delete the round
-        doc_ref.delete()
+        # Delete the round, only if it is unchanged since the ownership check
+        try:
+            await doc_ref.delete(option=firestore.AsyncClient.write_option(last_update_time=doc.update_time))
+        except FailedPrecondition:
+            return jsonify({
+                'status': 'error',
+                'message': 'Round was modified, please retry'
+            }), 409
+        _invalidate_dashboard(user['id'])
 
         return jsonify({
             'status': 'success',
@@ -670,7 +979,7 @@ def delete_round(round_id):
 # ============================================================================
 
 @app.errorhandler(404)
-def not_found(error):
+async def not_found(error):
     """Handle 404 errors."""
     return jsonify({
         'status': 'error',
@@ -679,7 +988,7 @@ def not_found(error):
 
 
 @app.errorhandler(500)
-def internal_error(error):
+async def internal_error(error):
     """Handle 500 errors."""
     return jsonify({
         'status': 'error',
@@ -1,27 +1,53 @@
 """
-Flask authentication module using JWT tokens.
+Quart authentication module using JWT tokens.
 
-Adapts the FastAPI authentication logic for Flask applications.
-Uses the same JWT tokens and Firestore user store.
+Adapts the FastAPI authentication logic for the (async, Flask-compatible)
+Quart application. Uses the same JWT tokens and Firestore user store.
 """
+import asyncio
+import hashlib
+import itertools
 import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
-from typing import Optional
-from flask import request, jsonify
+from typing import Any, List, Optional, Tuple
+from quart import g, make_response, request, jsonify
 from datetime import datetime, timedelta
 import jwt
 from jwt.exceptions import InvalidTokenError
 from passlib.context import CryptContext
 from google.cloud import firestore
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing; BCRYPT_ROUNDS is the bcrypt cost factor (each +1 doubles hashing time)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 # JWT Configuration
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-this-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
+# Validated bearer tokens (until their exp) and the users they resolve to. User
+# records are held for USER_CACHE_TTL_SECONDS; this service never changes a user,
+# so deactivations and other profile edits made elsewhere (e.g. in the Firestore
+# console) take effect within that window.
+TOKEN_CACHE_MAXSIZE = int(os.getenv("TOKEN_CACHE_MAXSIZE", "10000"))
+USER_CACHE_MAXSIZE = int(os.getenv("USER_CACHE_MAXSIZE", "10000"))
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+
+# Firestore clients to round-robin across (one gRPC channel each), created once per worker
+FIRESTORE_CLIENT_POOL_SIZE = int(os.getenv("FIRESTORE_CLIENT_POOL_SIZE", str(os.cpu_count() or 4)))
+
+# Password hashing is CPU-bound, so it runs on this pool instead of the event loop
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 4)))
+password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+
 
 # ============================================================================
 # Password Functions
@@ -37,6 +63,20 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password pool without blocking the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(
+        password_executor, verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the password pool without blocking the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(
+        password_executor, get_password_hash, password
+    )
+
+
 # ============================================================================
 # JWT Token Functions
 # ============================================================================
@@ -84,19 +124,120 @@ def decode_token(token: str) -> Optional[dict]:
         return None
 
 
+# ============================================================================
+# Token -> User Cache
+# ============================================================================
+
+class _TTLCache:
+    """Thread-safe LRU cache whose entries expire at a per-entry deadline."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        """Return the cached value for key, or None if absent/expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Any, value: Any, expires_at: float) -> None:
+        """Store value until the epoch time expires_at, evicting the least recently used."""
+        if expires_at <= time.time():
+            return
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# blake2b(token) -> user id (JWT sub); only tokens that validated are stored
+_token_cache = _TTLCache(TOKEN_CACHE_MAXSIZE)
+
+# user id -> user dict loaded from Firestore
+_user_cache = _TTLCache(USER_CACHE_MAXSIZE)
+
+
+def _token_cache_key(token: str) -> bytes:
+    """Hash a raw bearer token into a compact cache key."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
 # ============================================================================
 # User Store (Firestore)
 # ============================================================================
 
+_firestore_pool: List[firestore.AsyncClient] = []
+_firestore_pool_cycle = None
+_firestore_pool_lock = threading.Lock()
+
+
+def _firestore_clients() -> List[firestore.AsyncClient]:
+    """Process-wide pool of async Firestore clients, created on first use."""
+    global _firestore_pool, _firestore_pool_cycle
+    if not _firestore_pool:
+        with _firestore_pool_lock:
+            if not _firestore_pool:
+                pool = [firestore.AsyncClient() for _ in range(max(1, FIRESTORE_CLIENT_POOL_SIZE))]
+                _firestore_pool_cycle = itertools.cycle(pool)
+                _firestore_pool = pool
+    return _firestore_pool
+
+
+def get_firestore_client() -> firestore.AsyncClient:
+    """
+    Process-wide async Firestore client (the first of the pool).
+
+    The auth store and the app share the pool instead of each paying for
+    client setup; gRPC channels are opened on the worker's event loop at first call.
+    """
+    return _firestore_clients()[0]
+
+
+def next_firestore_client() -> firestore.AsyncClient:
+    """
+    Pick the next pooled Firestore client (round-robin).
+
+    Spreading concurrent requests over several gRPC channels avoids queueing
+    them all behind one channel.
+    """
+    _firestore_clients()
+    return next(_firestore_pool_cycle)
+
+
 class UserStore:
     """User storage using Firestore."""
 
-    def __init__(self):
-        """Initialize Firestore client."""
-        self._db = firestore.Client()
-        self._users_collection = self._db.collection('users')
+    def __init__(self, client: Optional[firestore.AsyncClient] = None):
+        """
+        Initialize the user store.
+
+        Args:
+            client: Firestore client to use (defaults to the shared client pool)
+        """
+        # Fail at startup, not on the first request, if Firestore is unreachable
+        self._db = client if client is not None else get_firestore_client()
+        self._pinned = client is not None
+
+    @property
+    def _users_collection(self):
+        """Users collection on the pinned client, else on the next pooled client."""
+        db = self._db if self._pinned else next_firestore_client()
+        return db.collection('users')
 
-    def create_user(self, username: str, email: str, password: str, full_name: str = None) -> dict:
+    async def create_user(self, username: str, email: str, password: str, full_name: str = None) -> dict:
         """
         Create a new user.
 
@@ -112,46 +253,45 @@ class UserStore:
         Raises:
             ValueError: If username or email already exists
         """
-        # Check if username exists
-        existing = list(self._users_collection.where('username', '==', username).limit(1).get())
-        if existing:
-            raise ValueError(f"Username '{username}' already exists")
-
-        # Check if email exists
-        existing = list(self._users_collection.where('email', '==', email).limit(1).get())
+        # Check username and email uniqueness in a single query
+        existing = await self._users_collection.where(filter=firestore.Or([
+            firestore.FieldFilter('username', '==', username),
+            firestore.FieldFilter('email', '==', email)
+        ])).limit(1).get()
         if existing:
+            if (existing[0].to_dict() or {}).get('username') == username:
+                raise ValueError(f"Username '{username}' already exists")
             raise ValueError(f"Email '{email}' already exists")
 
         # Create user document
-        import uuid
-        user_id = str(uuid.uuid4())
+        user_id = secrets.token_hex(16)
         user_doc = {
             'id': user_id,
             'username': username,
             'email': email,
             'full_name': full_name,
-            'hashed_password': get_password_hash(password),
+            'hashed_password': await get_password_hash_async(password),
             'created_at': firestore.SERVER_TIMESTAMP,
             'is_active': True,
             'is_verified': False
         }
 
-        self._users_collection.document(user_id).set(user_doc)
+        await self._users_collection.document(user_id).set(user_doc)
 
         # Return created user (without password)
         user_doc.pop('hashed_password')
         return user_doc
 
-    def get_user_by_username(self, username: str) -> Optional[dict]:
+    async def get_user_by_username(self, username: str) -> Optional[dict]:
         """Get user by username."""
-        docs = list(self._users_collection.where('username', '==', username).limit(1).get())
+        docs = await self._users_collection.where(filter=firestore.FieldFilter('username', '==', username)).limit(1).get()
         if not docs:
             return None
         return docs[0].to_dict()
 
-    def get_user_by_id(self, user_id: str) -> Optional[dict]:
+    async def get_user_by_id(self, user_id: str) -> Optional[dict]:
         """Get user by ID."""
-        doc = self._users_collection.document(user_id).get()
+        doc = await self._users_collection.document(user_id).get()
         if not doc.exists:
             return None
         return doc.to_dict()
@@ -166,69 +306,104 @@ except Exception as e:
 
 
 # ============================================================================
-# Flask Authentication Decorators
+# Quart Authentication Decorators
 # ============================================================================
 
-def get_current_user() -> Optional[dict]:
+def _extract_bearer_token(auth_header: Optional[str]) -> Optional[str]:
+    """Return the token from a 'Bearer <token>' header without splitting the whole string."""
+    if not auth_header or len(auth_header) < 8 or auth_header[:7].lower() != 'bearer ':
+        return None
+    token = auth_header[7:].strip()
+    if not token or ' ' in token:
+        return None
+    return token
+
+
+async def _resolve_user() -> Tuple[Optional[dict], bool]:
     """
-    Get current user from request Authorization header.
+    Resolve the bearer token on the current request to an active user.
 
     Returns:
-        User dict if authenticated, None otherwise
+        (user or None, whether token and user both came from cache)
     """
     if user_store is None:
-        return None
-
-    # Get Authorization header
-    auth_header = request.headers.get('Authorization')
-    if not auth_header:
-        return None
+        return None, False
+
+    token = _extract_bearer_token(request.headers.get('Authorization'))
+    if token is None:
+        return None, False
+
+    # A hit means this exact (signed) token already validated and is unexpired
+    cache_key = _token_cache_key(token)
+    user_id = _token_cache.get(cache_key)
+    token_hit = user_id is not None
+    if not token_hit:
+        # Decode token
+        payload = decode_token(token)
+        if not payload:
+            return None, False
+
+        user_id = payload.get('sub')
+        if not user_id:
+            return None, False
+
+        _token_cache.set(cache_key, user_id, float(payload.get('exp', 0)))
+
+    # Get user, from Firestore at most once per USER_CACHE_TTL_SECONDS
+    user = _user_cache.get(user_id)
+    user_hit = user is not None
+    if not user_hit:
+        user = await user_store.get_user_by_id(user_id)
+        if user:
+            _user_cache.set(user_id, user, time.time() + USER_CACHE_TTL_SECONDS)
 
-    # Extract token
-    parts = auth_header.split()
-    if len(parts) != 2 or parts[0].lower() != 'bearer':
-        return None
+    if not user or not user.get('is_active', False):
+        return None, False
 
-    token = parts[1]
+    return user, token_hit and user_hit
 
-    # Decode token
-    payload = decode_token(token)
-    if not payload:
-        return None
 
-    user_id = payload.get('sub')
-    if not user_id:
-        return None
+async def get_current_user() -> Optional[dict]:
+    """
+    Get current user from request Authorization header.
 
-    # Get user from database
-    user = user_store.get_user_by_id(user_id)
-    if not user or not user.get('is_active', False):
-        return None
+    Resolved once per request; repeat calls (e.g. require_auth and then the
+    route) reuse the result.
 
-    return user
+    Returns:
+        User dict if authenticated, None otherwise
+    """
+    if 'auth_user' not in g:
+        g.auth_user, g.auth_cache_hit = await _resolve_user()
+    return g.auth_user
 
 
 def require_auth(f):
     """
-    Decorator to require authentication for Flask routes.
+    Decorator to require authentication for Quart routes.
+
+    Responses carry X-Auth-Cache: HIT or MISS, showing whether both the token
+    and the user were served from cache.
 
     Usage:
         @app.route('/protected')
         @require_auth
-        def protected_route():
-            user = get_current_user()
+        async def protected_route():
+            user = await get_current_user()
             return {'user': user['username']}
     """
     @wraps(f)
-    def decorated_function(*args, **kwargs):
-        user = get_current_user()
+    async def decorated_function(*args, **kwargs):
+        user = await get_current_user()
         if user is None:
             return jsonify({
                 'status': 'error',
                 'message': 'Authentication required'
             }), 401
 
-        return f(*args, **kwargs)
+        response = await make_response(await f(*args, **kwargs))
+        response.headers['X-Auth-Cache'] = 'HIT' if g.auth_cache_hit else 'MISS'
+        return response
 
     return decorated_function
 
@@ -241,15 +416,15 @@ def optional_auth(f):
     Usage:
         @app.route('/optional')
         @optional_auth
-        def optional_route():
-            user = get_current_user()
+        async def optional_route():
+            user = await get_current_user()
             if user:
                 return {'message': f'Hello {user["username"]}'}
             return {'message': 'Hello anonymous'}
     """
     @wraps(f)
-    def decorated_function(*args, **kwargs):
+    async def decorated_function(*args, **kwargs):
         # Authentication is optional, just continue
-        return f(*args, **kwargs)
+        return await f(*args, **kwargs)
 
     return decorated_function
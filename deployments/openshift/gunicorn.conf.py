@@ -0,0 +1,22 @@
+"""
+Gunicorn configuration for the SAMMO Fight IQ OpenShift deployment.
+
+The app is ASGI (Quart), so each pre-forked worker runs a Uvicorn event loop
+that keeps many Firestore round-trips in flight at once. Password hashing is
+CPU-bound and runs on a thread pool, so workers spread that work across cores
+(match GUNICORN_WORKERS to the pod's CPU limit). Keep-alive outlasts the
+router's idle timeout so clients reuse connections instead of reconnecting.
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+
+# Worker model
+workers = int(os.getenv("GUNICORN_WORKERS", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "75"))
+
+accesslog = "-"
+errorlog = "-"
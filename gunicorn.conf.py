@@ -0,0 +1,17 @@
+"""
+Gunicorn configuration for the JKD Coach Flask API.
+
+Request handlers spend most of their time waiting on Firestore round-trips,
+so each worker runs a thread pool (gthread) to keep many requests in flight
+instead of blocking a whole process per request.
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+
+# Worker model
+workers = int(os.getenv("GUNICORN_WORKERS", "2"))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "16"))
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
@@ -10,3 +10,6 @@ class BaseCoach:
 
     def chat(self, user_id: str, message: str, context_data: Optional[Dict] = None) -> str:
         return self.mem_llm.chat(self.agent_id, user_id, self.system_prompt, message, context_data)
+
+    async def chat_async(self, user_id: str, message: str, context_data: Optional[Dict] = None) -> str:
+        return await self.mem_llm.chat_async(self.agent_id, user_id, self.system_prompt, message, context_data)
@@ -0,0 +1,18 @@
+"""
+Backfill the username/email lookup index collections from existing users.
+
+Run once before deploying index-based lookups (safe to re-run):
+
+    python -m src.auth.backfill_user_index
+"""
+from .user_store import UserStore
+
+
+def main() -> None:
+    """Index every existing user and report how many were written."""
+    count = UserStore().backfill_lookup_indexes()
+    print(f"Indexed {count} users into username_to_uid and email_to_uid")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Small in-process caches for the authentication hot paths.
+
+Entries are process-local and bounded, so they are safe to use from
+multiple request threads but are not shared between workers.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire at a per-entry deadline."""
+
+    def __init__(self, maxsize: int):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries kept before evicting the least recently used
+        """
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None if absent or expired
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Any, value: Any, expires_at: float) -> None:
+        """
+        Store a value until an absolute deadline.
+
+        Args:
+            key: Cache key
+            value: Value to cache (must not be None)
+            expires_at: Epoch seconds after which the entry is dropped
+        """
+        if expires_at <= time.time():
+            return
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Any) -> Optional[Any]:
+        """
+        Remove an entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The removed value (even if already expired), or None if absent
+        """
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[1] if entry is not None else None
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -3,6 +3,7 @@ FastAPI authentication dependencies.
 
 Provides dependency injection for protected routes requiring authentication.
 """
+from functools import lru_cache
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -15,9 +16,13 @@ from .models import UserInDB, TokenData
 security = HTTPBearer()
 
 
+@lru_cache(maxsize=None)
 def get_user_store() -> UserStore:
     """
-    Dependency to get UserStore instance.
+    Dependency to get the shared UserStore instance.
+
+    One store (and Firestore client) per process, rather than a new client
+    per request.
 
     Returns:
         UserStore instance
@@ -57,7 +62,7 @@ async def get_current_user(
         raise credentials_exception
 
     # Get user from database
-    user = user_store.get_user_by_id(token_data.user_id)
+    user = await user_store.get_user_by_id_async(token_data.user_id)
 
     if user is None:
         raise credentials_exception
@@ -3,6 +3,7 @@ Authentication data models for SAMMO Fight IQ.
 
 Defines user models, token schemas, and authentication-related data structures.
 """
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel, EmailStr, Field
@@ -34,6 +35,21 @@ class UserInDB(UserBase):
     is_active: bool = True
     is_verified: bool = False
 
+    @classmethod
+    def from_doc(cls, doc_data: dict) -> "UserInDB":
+        """
+        Build a user from a Firestore document dict.
+
+        Unknown fields are ignored and missing flags take the model defaults.
+
+        Args:
+            doc_data: Document fields as returned by to_dict()
+
+        Returns:
+            UserInDB instance
+        """
+        return cls.model_validate(doc_data)
+
 
 class UserResponse(UserBase):
     """User response model (no sensitive data)."""
@@ -53,11 +69,15 @@ class Token(BaseModel):
     expires_in: int  # seconds
 
 
-class TokenData(BaseModel):
+# Internal and built per decoded token, so a slotted dataclass rather than a
+# validated model
+@dataclass(frozen=True, slots=True)
+class TokenData:
     """Data stored in JWT token."""
     user_id: str
     username: str
-    exp: datetime
+    exp: datetime  # naive UTC
+    exp_ts: Optional[int] = None  # Unix expiry, set when decoded from a token
 
 
 class RefreshToken(BaseModel):
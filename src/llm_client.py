@@ -1,6 +1,9 @@
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import Any, List, Dict
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
 
 @dataclass
@@ -15,29 +18,72 @@ class LocalLLMClient:
 
     def __init__(self, config: LLMConfig):
         self.config = config
+        # One keep-alive connection pool for every call; failed connects are
+        # retried, but a POST that reached the server is not resent
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.1),
+        )
+        self._session = requests.Session()
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def close(self) -> None:
+        self._session.close()
 
     def complete(self, messages: List[Dict[str, str]]) -> str:
-        payload = {
-            "model": self.config.model,
-            "messages": messages,
-            "temperature": self.config.temperature,
-            "max_tokens": 1024,
-        }
+        payload = _completion_payload(self.config, messages)
 
         try:
-            resp = requests.post(self.config.base_url, json=payload, timeout=self.config.timeout)
+            resp = self._session.post(self.config.base_url, json=payload, timeout=self.config.timeout)
             resp.raise_for_status()
-            data = resp.json()
-
-            if "choices" in data:
-                return data["choices"][0]["message"]["content"]
-            elif "response" in data:
-                return data["response"]
-            else:
-                raise ValueError(f"Unexpected response: {data}")
+            return _completion_text(resp.json())
         except requests.exceptions.RequestException as e:
             return f"[LLM Error: {str(e)}]"
 
+class AsyncLocalLLMClient:
+    """Async OpenAI-compatible client for local LLMs, for use from event-loop servers."""
+
+    def __init__(self, config: LLMConfig):
+        self.config = config
+        # Shared by all in-flight completions; over https, HTTP/2 multiplexes
+        # them on one connection (plain-http local servers stay on HTTP/1.1)
+        self._client = httpx.AsyncClient(
+            http2=True,
+            timeout=self.config.timeout,
+            limits=httpx.Limits(max_connections=64),
+        )
+
+    async def complete(self, messages: List[Dict[str, str]]) -> str:
+        payload = _completion_payload(self.config, messages)
+
+        try:
+            resp = await self._client.post(self.config.base_url, json=payload)
+            resp.raise_for_status()
+            return _completion_text(resp.json())
+        except httpx.HTTPError as e:
+            return f"[LLM Error: {str(e)}]"
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+def _completion_payload(config: LLMConfig, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+    return {
+        "model": config.model,
+        "messages": messages,
+        "temperature": config.temperature,
+        "max_tokens": 1024,
+    }
+
+def _completion_text(data: Dict[str, Any]) -> str:
+    if "choices" in data:
+        return data["choices"][0]["message"]["content"]
+    elif "response" in data:
+        return data["response"]
+    else:
+        raise ValueError(f"Unexpected response: {data}")
+
 def get_llm_config() -> LLMConfig:
     return LLMConfig(
         base_url=os.getenv("LLM_BASE_URL", "http://localhost:11434/v1/chat/completions"),
@@ -1,18 +1,41 @@
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Union
 import json
-from .llm_client import LocalLLMClient
+from .llm_client import AsyncLocalLLMClient, LocalLLMClient
 from .simple_memory import SimpleMemoryStore
 
 class MemoryBackedLLM:
     """LLM with persistent conversation memory."""
 
-    def __init__(self, llm_client: LocalLLMClient, mem_path: str = "mem_data/mem_store.jsonl"):
+    def __init__(self, llm_client: Union[LocalLLMClient, AsyncLocalLLMClient],
+                 mem_path: str = "mem_data/mem_store.jsonl"):
         self.llm = llm_client
         self.store = SimpleMemoryStore(mem_path)
 
     def chat(self, agent_id: str, user_id: str, system_prompt: str, 
              message: str, context_data: Optional[Dict] = None) -> str:
+        messages = self._build_messages(agent_id, user_id, system_prompt, message, context_data)
 
+        # Get response
+        reply = self.llm.complete(messages)
+
+        # Store interaction
+        self.store.append(agent_id, user_id, f"User: {message}\nCoach: {reply}")
+
+        return reply
+
+    async def chat_async(self, agent_id: str, user_id: str, system_prompt: str,
+                         message: str, context_data: Optional[Dict] = None) -> str:
+        """chat() for an AsyncLocalLLMClient: awaits the completion instead of blocking."""
+        messages = self._build_messages(agent_id, user_id, system_prompt, message, context_data)
+
+        reply = await self.llm.complete(messages)
+
+        self.store.append(agent_id, user_id, f"User: {message}\nCoach: {reply}")
+
+        return reply
+
+    def _build_messages(self, agent_id: str, user_id: str, system_prompt: str,
+                        message: str, context_data: Optional[Dict]) -> List[Dict[str, str]]:
         # Get recent history
         history_chunks = self.store.get_recent(agent_id, user_id, k=5)
         history_text = "\n".join(history_chunks)
@@ -27,11 +50,4 @@ class MemoryBackedLLM:
             messages.append({"role": "system", "content": f"Current stats:\n{json.dumps(context_data, indent=2)}"})
 
         messages.append({"role": "user", "content": message})
-
-        # Get response
-        reply = self.llm.complete(messages)
-
-        # Store interaction
-        self.store.append(agent_id, user_id, f"User: {message}\nCoach: {reply}")
-
-        return reply
+        return messages
@@ -2,8 +2,17 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, Any
 
+import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernels run as plain NumPy without it
+    def njit(*args, **kwargs):
+        def decorator(fn):
+            return fn
+        return decorator
+
 @dataclass
 class RoundVideoStats:
     round_id: str
@@ -50,6 +59,36 @@ def video_form_and_danger(stats: Dict[str, Any]) -> Dict[str, Any]:
     out["video_focus_next_round"] = focus
     return out
 
+# No fastmath: danger is bucketed at 0.4/0.7 and must match video_form_and_danger exactly
+@njit(cache=True)
+def _video_form_danger_kernel(guard_down, pose_cov):
+    danger = np.clip(0.6 * guard_down + 0.4 * (1.0 - pose_cov), 0.0, 1.0)
+    form = np.clip(10.0 - guard_down * 5.0 - (1.0 - pose_cov) * 2.0, 0.0, 10.0)
+    return danger, form
+
+def video_form_and_danger_df(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized video_form_and_danger for a whole table of rounds (e.g. from load_rounds_from_csv).
+
+    Input: DataFrame with guard_down_ratio and pose_coverage columns (missing ones count as 0.0).
+    Output: copy of df plus video_danger_score, video_form_score, video_focus_next_round.
+    """
+    zeros = np.zeros(len(df), dtype=np.float64)
+    guard_down = df["guard_down_ratio"].to_numpy(dtype=np.float64) if "guard_down_ratio" in df else zeros
+    pose_cov = df["pose_coverage"].to_numpy(dtype=np.float64) if "pose_coverage" in df else zeros
+
+    danger, form = _video_form_danger_kernel(guard_down, pose_cov)
+    focus = np.select(
+        [danger >= 0.7, danger >= 0.4],
+        ["defense_first", "ring_cutting"],
+        default="pressure_and_body",
+    )
+    return df.assign(
+        video_danger_score=danger,
+        video_form_score=form,
+        video_focus_next_round=focus,
+    )
+
 def load_rounds_from_csv(csv_path: str) -> pd.DataFrame:
     """
     Convenience loader for data/video_round_stats.csv
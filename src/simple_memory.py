@@ -1,37 +1,75 @@
 import json
+import threading
+from collections import defaultdict, deque
 from pathlib import Path
-from typing import List, Dict
+from typing import Deque, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:  # orjson is optional; the stdlib parser reads the same lines
+    _json_loads = json.loads
+    _json_dumps = json.dumps
 
 class SimpleMemoryStore:
     """Ultra-simple persistent memory using JSONL."""
 
-    def __init__(self, path: str = "mem_store.jsonl"):
+    def __init__(self, path: str = "mem_store.jsonl", recent_maxlen: int = 64):
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
         if not self.path.exists():
             self.path.write_text("")
+        # Last recent_maxlen contents per (agent_id, user_id), seeded from the
+        # file by one pass on first read and kept current by append()
+        self.recent_maxlen = recent_maxlen
+        self._recent: Optional[Dict[Tuple[str, str], Deque[str]]] = None
+        self._lock = threading.Lock()
 
     def append(self, agent_id: str, user_id: str, content: str):
         record = {"agent_id": agent_id, "user_id": user_id, "content": content}
-        with self.path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(record) + "\n")
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(_json_dumps(record) + "\n")
+            if self._recent is not None:
+                self._recent[(agent_id, user_id)].append(content)
+
+    def _read_records(self) -> List[dict]:
+        records = []
+        # Raw byte lines go straight to the parser (both accept bytes and the
+        # trailing newline); blank or corrupt lines fail to parse and are skipped
+        with self.path.open("rb") as f:
+            for line in f:
+                try:
+                    records.append(_json_loads(line))
+                except ValueError:
+                    continue
+        return records
+
+    def _load_recent(self) -> Dict[Tuple[str, str], Deque[str]]:
+        recent: Dict[Tuple[str, str], Deque[str]] = defaultdict(
+            lambda: deque(maxlen=self.recent_maxlen)
+        )
+        for rec in self._read_records():
+            if "content" in rec:
+                recent[(rec.get("agent_id"), rec.get("user_id"))].append(rec["content"])
+        return recent
 
     def get_recent(self, agent_id: str, user_id: str, k: int = 5) -> List[str]:
         if not self.path.exists():
             return []
 
-        lines = []
-        with self.path.open("r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    try:
-                        lines.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
-
-        filtered = [
-            rec["content"] for rec in lines
-            if rec.get("agent_id") == agent_id and rec.get("user_id") == user_id
-        ]
-        return filtered[-k:]
+        # Deeper history than the in-memory window: fall back to a full scan
+        if k <= 0 or k > self.recent_maxlen:
+            filtered = [
+                rec["content"] for rec in self._read_records()
+                if rec.get("agent_id") == agent_id and rec.get("user_id") == user_id
+            ]
+            return filtered[-k:]
+
+        with self._lock:
+            if self._recent is None:
+                self._recent = self._load_recent()
+            recent = self._recent.get((agent_id, user_id))
+            return list(recent)[-k:] if recent else []
@@ -4,91 +4,347 @@ Video Analysis Module for JKD Coach
 Uses MediaPipe Pose to extract boxing metrics from sparring videos.
 Based on logic from notebooks/02_video_processing.ipynb
 """
-from typing import Dict, Any
+import multiprocessing
+import os
+import queue
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from operator import itemgetter
+from typing import Dict, Any, List, Optional
 import cv2
 import mediapipe as mp
 import numpy as np
 
+try:
+    import av
+    from av.codec.hwaccel import HWAccel
+except ImportError:  # PyAV is optional; frames are decoded with OpenCV without it
+    av = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernel runs as plain NumPy without it
+    def njit(*args, **kwargs):
+        def decorator(fn):
+            return fn
+        return decorator
+
+
+# Pose landmark indices the metrics are computed from, in the order
+# analyze_video stores their (x, y) coordinates per frame. Plain ints, not
+# PoseLandmark members, so per-frame indexing skips the enum.
+_PoseLandmark = mp.solutions.pose.PoseLandmark
+METRIC_LANDMARKS = tuple(lm.value for lm in (
+    _PoseLandmark.LEFT_SHOULDER, _PoseLandmark.RIGHT_SHOULDER,
+    _PoseLandmark.LEFT_WRIST, _PoseLandmark.RIGHT_WRIST,
+    _PoseLandmark.LEFT_HIP, _PoseLandmark.RIGHT_HIP,
+    _PoseLandmark.NOSE,
+    _PoseLandmark.LEFT_ANKLE, _PoseLandmark.RIGHT_ANKLE,
+))
+_get_metric_landmarks = itemgetter(*METRIC_LANDMARKS)
+(_L_SHOULDER, _R_SHOULDER, _L_WRIST, _R_WRIST,
+ _L_HIP, _R_HIP, _NOSE, _L_ANKLE, _R_ANKLE) = range(len(METRIC_LANDMARKS))
+
+# Guard "down" threshold (wrist below shoulder by this much)
+GUARD_DOWN_THRESHOLD = 0.15
+
+
+# Optional MediaPipe Tasks model (e.g. pose_landmarker_lite.task, or a bundle
+# with an int8-quantized landmark model). When set, frames go through the
+# Tasks PoseLandmarker instead of the legacy solution.
+POSE_MODEL_ASSET_PATH = os.getenv("POSE_MODEL_ASSET_PATH")
+
+# Run the Tasks PoseLandmarker on the GPU delegate ("gpu"), falling back to
+# CPU if the delegate can't be created (no GPU / no GL context). The legacy
+# solution used without POSE_MODEL_ASSET_PATH always runs on the CPU.
+POSE_DELEGATE = os.getenv("POSE_DELEGATE", "cpu").lower()
+
+# Legacy solution model: 0 = lite, 1 = full, 2 = heavy
+POSE_MODEL_COMPLEXITY = int(os.getenv("POSE_MODEL_COMPLEXITY", "1"))
+
+# Frames per second fed to pose detection; guard/hip metrics don't need the
+# full 30-60 fps. Other frames are grabbed but not decoded. 0 = every frame.
+POSE_SAMPLE_FPS = float(os.getenv("POSE_SAMPLE_FPS", "10"))
+
+# Longest side (pixels) frames are downscaled to before pose detection.
+# Landmarks are normalized to the frame, so the metric formulas don't change,
+# and the pose models run at 256px anyway. 0 = feed full resolution.
+POSE_INPUT_MAX_SIDE = int(os.getenv("POSE_INPUT_MAX_SIDE", "640"))
+
+# Video decoder: "opencv" (default), "pyav", or "auto" (PyAV when the optional
+# av package is installed). PyAV decodes on FFmpeg threads and converts/
+# downscales straight to RGB in one libswscale pass; OpenCV can only hand back
+# BGR frames.
+POSE_VIDEO_DECODER = os.getenv("POSE_VIDEO_DECODER", "opencv").lower()
+
+# FFmpeg hardware device for PyAV decoding (e.g. "cuda", "vaapi",
+# "videotoolbox"); falls back to software decoding if it can't be used
+POSE_HWACCEL = os.getenv("POSE_HWACCEL", "")
+
+# Threads OpenCV may use for resize/cvtColor on the reader thread. Half the
+# cores by default, leaving the rest to MediaPipe's inference threads.
+POSE_OPENCV_THREADS = int(os.getenv("POSE_OPENCV_THREADS", str(max(1, (os.cpu_count() or 2) // 2))))
+
+# Frames whose 64x36 thumbnail differs from the last frame sent to the pose
+# model by less than this mean absolute difference (0-255) reuse that frame's
+# landmarks instead of running inference (e.g. 2.0). Off by default: reused
+# frames count toward pose_coverage, which feeds the video danger score.
+POSE_STATIC_FRAME_DIFF = float(os.getenv("POSE_STATIC_FRAME_DIFF", "0"))
+_STATIC_THUMB_SIZE = (64, 36)
+
+# Decoded RGB frames the reader thread may buffer ahead of pose detection
+POSE_FRAME_QUEUE_SIZE = int(os.getenv("POSE_FRAME_QUEUE_SIZE", "8"))
+
+
+@njit(cache=True)
+def _aggregate_metrics_kernel(coords, guard_down_threshold):
+    """
+    Reduce (frames, len(METRIC_LANDMARKS), 2) landmark coordinates to
+    (guard_down_frames, avg_left_guard_height, avg_right_guard_height,
+    avg_hip_rotation, avg_stance_width, head_y_std).
+    """
+    x = coords[:, :, 0]
+    y = coords[:, :, 1]
+
+    # Guard height: wrist Y relative to shoulder Y
+    # (lower value = hands higher, better guard)
+    left_guard = y[:, _L_WRIST] - y[:, _L_SHOULDER]
+    right_guard = y[:, _R_WRIST] - y[:, _R_SHOULDER]
+    # Hip rotation: horizontal distance between hips
+    hip_rotation = np.abs(x[:, _L_HIP] - x[:, _R_HIP])
+    # Stance width: horizontal distance between ankles
+    stance_width = np.abs(x[:, _L_ANKLE] - x[:, _R_ANKLE])
+
+    # Guard is down when either wrist drops below the threshold
+    guard_down_frames = np.count_nonzero(
+        (left_guard > guard_down_threshold) | (right_guard > guard_down_threshold)
+    )
+    return (guard_down_frames, left_guard.mean(), right_guard.mean(),
+            hip_rotation.mean(), stance_width.mean(), y[:, _NOSE].std())
+
+
+def _put_until_stopped(frames: queue.Queue, item, stop: threading.Event) -> bool:
+    """Queue item, giving up (returning False) once stop is set."""
+    while not stop.is_set():
+        try:
+            frames.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _read_sampled_frames(cap, stride: int, frames: queue.Queue, stop: threading.Event,
+                         max_side: int = 0) -> None:
+    """
+    Decode every stride-th frame to RGB and queue it for pose detection.
+
+    Frames with a side longer than max_side (if set) are downscaled, keeping
+    the aspect ratio, before the color conversion.
+
+    Runs on the reader thread, so decoding and color conversion overlap with
+    inference. Queues (frame_idx, rgb) per sampled frame, then
+    (total_frames, None) at the end of the video, or (None, error) if reading failed.
+    """
+    try:
+        # Decode and convert into reused buffers instead of allocating two
+        # frames per sample. An RGB buffer is handed to the consumer, which
+        # holds at most one while up to maxsize more wait in the queue, so a
+        # ring of maxsize + 2 is never overwritten while still in use.
+        bgr = small = None
+        small_size = None
+        ring = [None] * (frames.maxsize + 2)
+        slot = 0
+
+        frame_idx = 0
+        while not stop.is_set():
+            # grab() advances without decoding; only sampled frames are retrieved
+            if not cap.grab():
+                break
+
+            frame_idx += 1
+            if (frame_idx - 1) % stride:
+                continue
+
+            ret, bgr = cap.retrieve(bgr)
+            if not ret:
+                continue
+
+            if small_size is None:
+                height, width = bgr.shape[:2]
+                scale = max_side / max(height, width) if max_side > 0 else 1.0
+                small_size = (round(width * scale), round(height * scale)) if scale < 1.0 else ()
+            if small_size:
+                small = cv2.resize(bgr, small_size, dst=small, interpolation=cv2.INTER_AREA)
+
+            # Convert BGR (OpenCV) to RGB (MediaPipe). A frame[..., ::-1] view
+            # doesn't avoid this pass: mp.Image rejects non-contiguous arrays
+            # and the legacy solution makes a much slower strided copy itself.
+            rgb = ring[slot] = cv2.cvtColor(
+                small if small_size else bgr, cv2.COLOR_BGR2RGB, dst=ring[slot]
+            )
+            slot = (slot + 1) % len(ring)
+            if not _put_until_stopped(frames, (frame_idx, rgb), stop):
+                return
+        _put_until_stopped(frames, (frame_idx, None), stop)
+    except Exception as e:
+        _put_until_stopped(frames, (None, e), stop)
+
+
+def _open_av_container(video_path: str):
+    """Open video_path with PyAV, on the POSE_HWACCEL device if one is set."""
+    if POSE_HWACCEL:
+        try:
+            return av.open(video_path, hwaccel=HWAccel(device_type=POSE_HWACCEL))
+        except av.FFmpegError:
+            pass  # No such device here; decode in software
+    return av.open(video_path)
+
+
+def _read_sampled_av_frames(container, stride: int, frames: queue.Queue, stop: threading.Event,
+                            max_side: int = 0) -> None:
+    """
+    PyAV counterpart of _read_sampled_frames, with the same queue protocol.
+
+    Every frame is decoded (as with grab()), but only sampled frames are
+    converted: to_ndarray() does the RGB conversion and any downscaling in a
+    single libswscale pass, so no BGR frame or cvtColor pass is needed.
+    """
+    try:
+        stream = container.streams.video[0]
+        stream.thread_type = "AUTO"
+        size = None
+
+        frame_idx = 0
+        for frame in container.decode(stream):
+            if stop.is_set():
+                return
+
+            frame_idx += 1
+            if (frame_idx - 1) % stride:
+                continue
+
+            if size is None:
+                scale = max_side / max(frame.width, frame.height) if max_side > 0 else 1.0
+                size = ({"width": round(frame.width * scale), "height": round(frame.height * scale)}
+                        if scale < 1.0 else {})
+            rgb = frame.to_ndarray(format="rgb24", interpolation="AREA", **size)
+
+            # Apply the display rotation, as OpenCV does for phone videos
+            if frame.rotation:
+                rgb = np.ascontiguousarray(np.rot90(rgb, frame.rotation // 90))
+            if not _put_until_stopped(frames, (frame_idx, rgb), stop):
+                return
+        _put_until_stopped(frames, (frame_idx, None), stop)
+    except Exception as e:
+        _put_until_stopped(frames, (None, e), stop)
+
 
 class VideoAnalyzer:
     """Analyzes boxing videos using MediaPipe Pose detection."""
 
-    def __init__(self):
-        """Initialize MediaPipe Pose."""
+    def __init__(self, model_asset_path: Optional[str] = None,
+                 model_complexity: Optional[int] = None):
+        """
+        Initialize MediaPipe Pose.
+
+        Args:
+            model_asset_path: PoseLandmarker .task model; defaults to POSE_MODEL_ASSET_PATH
+            model_complexity: Legacy Pose model complexity; defaults to POSE_MODEL_COMPLEXITY
+        """
         self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(
-            static_image_mode=False,
-            model_complexity=1,
-            enable_segmentation=False,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5,
+        model_asset_path = model_asset_path or POSE_MODEL_ASSET_PATH
+
+        # Make sure OpenCV's SIMD (IPP/AVX2) kernels are on and its thread
+        # pool doesn't oversubscribe the cores pose inference runs on
+        cv2.setUseOptimized(True)
+        cv2.setNumThreads(POSE_OPENCV_THREADS)
+
+        # Start of the next video on the Tasks landmarker's clock, which must
+        # keep increasing when the analyzer is reused
+        self._timestamp_ms = 0
+
+        if model_asset_path:
+            if POSE_DELEGATE == "gpu":
+                try:
+                    self.landmarker = self._create_landmarker(
+                        model_asset_path, mp.tasks.BaseOptions.Delegate.GPU
+                    )
+                except (RuntimeError, ValueError):
+                    pass
+            if not hasattr(self, 'landmarker'):
+                self.landmarker = self._create_landmarker(
+                    model_asset_path, mp.tasks.BaseOptions.Delegate.CPU
+                )
+        else:
+            self.pose = self.mp_pose.Pose(
+                static_image_mode=False,
+                model_complexity=POSE_MODEL_COMPLEXITY if model_complexity is None else model_complexity,
+                enable_segmentation=False,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5,
+            )
+
+        # Close the graph when the analyzer is collected, or at exit at the
+        # latest: MediaPipe's close() hangs if left to interpreter teardown
+        graph = self.landmarker if hasattr(self, 'landmarker') else self.pose
+        self._finalizer = weakref.finalize(self, graph.close)
+
+    @staticmethod
+    def _create_landmarker(model_asset_path: str, delegate):
+        """Create a VIDEO-mode PoseLandmarker on the given delegate."""
+        vision = mp.tasks.vision
+        return vision.PoseLandmarker.create_from_options(
+            vision.PoseLandmarkerOptions(
+                base_options=mp.tasks.BaseOptions(
+                    model_asset_path=model_asset_path, delegate=delegate
+                ),
+                running_mode=vision.RunningMode.VIDEO,
+                num_poses=1,
+                min_pose_detection_confidence=0.5,
+                min_tracking_confidence=0.5,
+            )
         )
 
-    def __del__(self):
+    def close(self):
         """Clean up MediaPipe resources."""
-        if hasattr(self, 'pose'):
-            self.pose.close()
+        self._finalizer()
 
-    def _extract_frame_metrics(self, landmarks) -> Dict[str, float]:
+    def _detect_landmarks(self, rgb: np.ndarray, timestamp_ms: int):
         """
-        Extract boxing metrics from pose landmarks for a single frame.
+        Run pose detection on one RGB frame.
 
         Args:
-            landmarks: MediaPipe pose landmarks
+            rgb: Contiguous uint8 RGB frame
+            timestamp_ms: Frame timestamp (must increase, used by the Tasks API)
 
         Returns:
-            Dict with per-frame metrics
+            List of landmarks indexable by PoseLandmark, or None if no pose
         """
-        lmk = landmarks
-
-        # Get key landmarks
-        left_shoulder = lmk[self.mp_pose.PoseLandmark.LEFT_SHOULDER]
-        right_shoulder = lmk[self.mp_pose.PoseLandmark.RIGHT_SHOULDER]
-        left_wrist = lmk[self.mp_pose.PoseLandmark.LEFT_WRIST]
-        right_wrist = lmk[self.mp_pose.PoseLandmark.RIGHT_WRIST]
-        left_hip = lmk[self.mp_pose.PoseLandmark.LEFT_HIP]
-        right_hip = lmk[self.mp_pose.PoseLandmark.RIGHT_HIP]
-        nose = lmk[self.mp_pose.PoseLandmark.NOSE]
-        left_ankle = lmk[self.mp_pose.PoseLandmark.LEFT_ANKLE]
-        right_ankle = lmk[self.mp_pose.PoseLandmark.RIGHT_ANKLE]
-
-        # Guard height: wrist Y relative to shoulder Y
-        # (lower value = hands higher, better guard)
-        left_guard_height = left_wrist.y - left_shoulder.y
-        right_guard_height = right_wrist.y - right_shoulder.y
-
-        # Hip rotation: horizontal distance between hips
-        hip_rotation = abs(left_hip.x - right_hip.x)
-
-        # Stance width: horizontal distance between ankles
-        stance_width = abs(left_ankle.x - right_ankle.x)
-
-        # Head position
-        head_y = nose.y
+        if hasattr(self, 'landmarker'):
+            image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+            result = self.landmarker.detect_for_video(image, timestamp_ms)
+            return result.pose_landmarks[0] if result.pose_landmarks else None
 
-        # Calculate head movement (can use vertical displacement)
-        # For now, just track Y position
+        results = self.pose.process(rgb)
+        return results.pose_landmarks.landmark if results.pose_landmarks else None
 
-        return {
-            "left_guard_height": left_guard_height,
-            "right_guard_height": right_guard_height,
-            "hip_rotation": hip_rotation,
-            "stance_width": stance_width,
-            "head_y": head_y,
-        }
-
-    def analyze_video(self, video_path: str) -> Dict[str, Any]:
+    def analyze_video(self, video_path: str, sample_fps: Optional[float] = None) -> Dict[str, Any]:
         """
         Analyze a boxing video and extract aggregate metrics.
 
         Args:
             video_path: Path to video file
+            sample_fps: Frames per second to analyze; defaults to POSE_SAMPLE_FPS (0 = all).
+                Frames in between are skipped before RGB conversion.
 
         Returns:
             Dict with aggregated metrics:
-                - total_frames: Total frames in video
-                - pose_frames: Frames where pose was detected
-                - pose_coverage: Ratio of pose_frames/total_frames
+                - total_frames: Total frames in video (including skipped ones)
+                - pose_frames: Sampled frames where pose was detected
+                - pose_coverage: Ratio of pose_frames/sampled frames
                 - guard_down_ratio: % of frames where guard was down
                 - avg_left_guard_height: Average left guard height
                 - avg_right_guard_height: Average right guard height
@@ -96,79 +352,125 @@ class VideoAnalyzer:
                 - avg_stance_width: Average stance width
                 - head_movement_score: Head movement metric
         """
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            raise ValueError(f"Could not open video: {video_path}")
-
-        frame_idx = 0
+        if POSE_VIDEO_DECODER in ("auto", "pyav") and av is not None:
+            try:
+                source = _open_av_container(video_path)
+            except av.FFmpegError as e:
+                raise ValueError(f"Could not open video: {video_path}") from e
+            stream = source.streams.video[0]
+            fps = float(stream.average_rate or 0) or 30.0
+            frame_count = stream.frames
+            read_frames, release = _read_sampled_av_frames, source.close
+        else:
+            source = cv2.VideoCapture(video_path)
+            if not source.isOpened():
+                raise ValueError(f"Could not open video: {video_path}")
+            fps = source.get(cv2.CAP_PROP_FPS) or 30.0
+            frame_count = int(source.get(cv2.CAP_PROP_FRAME_COUNT))
+            read_frames, release = _read_sampled_frames, source.release
+
+        sampled_frames = 0
         pose_detected_frames = 0
-        guard_down_frames = 0
-
-        # Accumulators for averaging
-        left_guard_sum = 0.0
-        right_guard_sum = 0.0
-        hip_rotation_sum = 0.0
-        stance_width_sum = 0.0
-        head_y_sum = 0.0
-        head_y_values = []
 
-        # Guard "down" threshold (wrist below shoulder by this much)
-        GUARD_DOWN_THRESHOLD = 0.15
+        # Analyze every stride-th frame
+        sample_fps = POSE_SAMPLE_FPS if sample_fps is None else sample_fps
+        stride = max(1, round(fps / sample_fps)) if sample_fps > 0 else 1
 
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
+        # Landmark x/y per pose frame; metrics are computed from these in one
+        # pass after the loop. Sized from the container's frame count, grown if
+        # that is short. float64 keeps the guard threshold test exact at the boundary.
+        capacity = max(frame_count // stride + 1, 1)
+        coords = np.empty((capacity, len(METRIC_LANDMARKS), 2), dtype=np.float64)
 
-            frame_idx += 1
-
-            # Convert BGR (OpenCV) to RGB (MediaPipe)
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.pose.process(rgb)
-
-            if results.pose_landmarks:
-                pose_detected_frames += 1
-
-                # Extract metrics for this frame
-                metrics = self._extract_frame_metrics(results.pose_landmarks.landmark)
-
-                # Accumulate for averaging
-                left_guard_sum += metrics["left_guard_height"]
-                right_guard_sum += metrics["right_guard_height"]
-                hip_rotation_sum += metrics["hip_rotation"]
-                stance_width_sum += metrics["stance_width"]
-                head_y_sum += metrics["head_y"]
-                head_y_values.append(metrics["head_y"])
-
-                # Check if guard is down
-                if (metrics["left_guard_height"] > GUARD_DOWN_THRESHOLD or
-                    metrics["right_guard_height"] > GUARD_DOWN_THRESHOLD):
-                    guard_down_frames += 1
-
-        cap.release()
+        # Tracking state must not carry over from a previous video
+        if hasattr(self, 'pose'):
+            self.pose.reset()
+        timestamp_ms = self._timestamp_ms
+
+        # Thumbnail of the last frame that went through inference, and
+        # whether a pose was found in it
+        ref_thumb = None
+        detected = False
+
+        # A reader thread decodes ahead into a bounded queue while this
+        # thread runs pose detection
+        frames: queue.Queue = queue.Queue(maxsize=max(1, POSE_FRAME_QUEUE_SIZE))
+        stop = threading.Event()
+        reader = threading.Thread(
+            target=read_frames, args=(source, stride, frames, stop, POSE_INPUT_MAX_SIDE),
+            name="video-reader", daemon=True,
+        )
+        reader.start()
+
+        try:
+            while True:
+                frame_idx, rgb = frames.get()
+                if isinstance(rgb, Exception):
+                    raise rgb
+                if rgb is None:
+                    # End of video; frame_idx is the total frame count
+                    break
+                sampled_frames += 1
+
+                # Near-identical frames (static camera, no movement) reuse the
+                # last inference result. Comparing against the last inferred
+                # frame, not the previous one, keeps slow drift from chaining.
+                landmarks = None
+                if POSE_STATIC_FRAME_DIFF > 0:
+                    thumb = cv2.resize(rgb, _STATIC_THUMB_SIZE, interpolation=cv2.INTER_AREA)
+                    static = (ref_thumb is not None and
+                              cv2.absdiff(thumb, ref_thumb).mean() < POSE_STATIC_FRAME_DIFF)
+                    if not static:
+                        ref_thumb = thumb
+                else:
+                    static = False
+
+                if not static:
+                    timestamp_ms = self._timestamp_ms + int(frame_idx * 1000 / fps)
+                    landmarks = self._detect_landmarks(rgb, timestamp_ms)
+                    detected = landmarks is not None
+
+                if detected:
+                    if pose_detected_frames == capacity:
+                        capacity *= 2
+                        grown = np.empty((capacity,) + coords.shape[1:], dtype=np.float64)
+                        grown[:pose_detected_frames] = coords
+                        coords = grown
+
+                    if landmarks is not None:
+                        coords[pose_detected_frames] = [
+                            (lm.x, lm.y) for lm in _get_metric_landmarks(landmarks)
+                        ]
+                    else:
+                        coords[pose_detected_frames] = coords[pose_detected_frames - 1]
+                    pose_detected_frames += 1
+        finally:
+            stop.set()
+            reader.join()
+            release()
+            self._timestamp_ms = timestamp_ms + 1
 
         # Calculate aggregated metrics
         total_frames = frame_idx
-        pose_coverage = pose_detected_frames / total_frames if total_frames > 0 else 0.0
-        guard_down_ratio = guard_down_frames / pose_detected_frames if pose_detected_frames > 0 else 0.0
+        pose_coverage = pose_detected_frames / sampled_frames if sampled_frames > 0 else 0.0
 
         # Averages (only over frames where pose was detected)
         if pose_detected_frames > 0:
-            avg_left_guard = left_guard_sum / pose_detected_frames
-            avg_right_guard = right_guard_sum / pose_detected_frames
-            avg_hip_rotation = hip_rotation_sum / pose_detected_frames
-            avg_stance_width = stance_width_sum / pose_detected_frames
-            avg_head_y = head_y_sum / pose_detected_frames
+            (guard_down_frames, avg_left_guard, avg_right_guard,
+             avg_hip_rotation, avg_stance_width, head_y_std) = _aggregate_metrics_kernel(
+                coords[:pose_detected_frames], GUARD_DOWN_THRESHOLD
+            )
+            guard_down_ratio = int(guard_down_frames) / pose_detected_frames
 
             # Head movement score: standard deviation of head Y position
             # Higher = more head movement (good for defense)
-            head_movement_score = float(np.std(head_y_values)) if len(head_y_values) > 1 else 0.0
+            head_movement_score = float(head_y_std) if pose_detected_frames > 1 else 0.0
         else:
+            guard_down_ratio = 0.0
             avg_left_guard = 0.0
             avg_right_guard = 0.0
             avg_hip_rotation = 0.0
             avg_stance_width = 0.0
-            avg_head_y = 0.0
             head_movement_score = 0.0
 
         # Convert hip rotation from normalized distance to approximate degrees
@@ -191,15 +493,65 @@ class VideoAnalyzer:
         }
 
 
-def analyze_video_file(video_path: str) -> Dict[str, Any]:
+# One analyzer per process, so the MediaPipe graph is built once rather than
+# per video. The lock serializes use of the graph, which isn't thread-safe.
+_shared_analyzer: Optional[VideoAnalyzer] = None
+_shared_analyzer_lock = threading.Lock()
+
+
+def analyze_video_file(video_path: str, sample_fps: Optional[float] = None) -> Dict[str, Any]:
     """
-    Convenience function to analyze a video file.
+    Convenience function to analyze a video file with the shared analyzer.
 
     Args:
         video_path: Path to video file
+        sample_fps: Frames per second to analyze; defaults to POSE_SAMPLE_FPS
 
     Returns:
         Dict with video analysis metrics
     """
-    analyzer = VideoAnalyzer()
-    return analyzer.analyze_video(video_path)
+    with _shared_analyzer_lock:
+        return _get_shared_analyzer().analyze_video(video_path, sample_fps)
+
+
+def _get_shared_analyzer() -> VideoAnalyzer:
+    """Return this process's analyzer, creating it on first use (hold the lock)."""
+    global _shared_analyzer
+    if _shared_analyzer is None:
+        _shared_analyzer = VideoAnalyzer()
+    return _shared_analyzer
+
+
+def _init_worker() -> None:
+    """Build the worker's MediaPipe graph before its first video arrives."""
+    with _shared_analyzer_lock:
+        _get_shared_analyzer()
+
+
+def analyze_video_files(video_paths: List[str], n_workers: Optional[int] = None,
+                        sample_fps: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Analyze several video files in parallel worker processes.
+
+    Each worker keeps its own VideoAnalyzer, so MediaPipe graphs aren't
+    shared across threads and the GIL doesn't serialize the per-frame work.
+
+    Args:
+        video_paths: Paths to video files
+        n_workers: Worker processes; defaults to half the CPU count
+        sample_fps: Frames per second to analyze; defaults to POSE_SAMPLE_FPS
+
+    Returns:
+        Video analysis metrics for each path, in order
+    """
+    if n_workers is None:
+        n_workers = (os.cpu_count() or 2) // 2
+    n_workers = max(1, min(n_workers, len(video_paths)))
+
+    # spawn, not fork: forking after MediaPipe/reader threads start is unsafe
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+    ) as executor:
+        return list(executor.map(partial(analyze_video_file, sample_fps=sample_fps), video_paths))
@@ -5,7 +5,7 @@ Run with: pytest tests/test_auth.py -v
 """
 import pytest
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 from src.auth.jwt_handler import (
     create_access_token,
@@ -48,6 +48,55 @@ class TestPasswordHashing:
         assert verify_password(password, hash1) is True
         assert verify_password(password, hash2) is True
 
+    def test_repeated_verification_cached(self):
+        """Test that a repeated verification skips bcrypt."""
+        password = "CachedPassword123!"
+        hashed = get_password_hash(password)
+
+        assert verify_password(password, hashed) is True
+        with patch("src.auth.jwt_handler.pwd_context.verify") as bcrypt_verify:
+            assert verify_password(password, hashed) is True
+            bcrypt_verify.assert_not_called()
+
+            # A different password is a different key and still hits bcrypt
+            bcrypt_verify.return_value = False
+            assert verify_password("OtherPassword123!", hashed) is False
+            bcrypt_verify.assert_called_once()
+
+    def test_failed_verification_not_cached(self):
+        """Test that wrong passwords pay full bcrypt cost on every attempt."""
+        hashed = get_password_hash("RightPassword123!")
+
+        with patch("src.auth.jwt_handler.pwd_context.verify", return_value=False) as bcrypt_verify:
+            assert verify_password("WrongPassword123!", hashed) is False
+            assert verify_password("WrongPassword123!", hashed) is False
+
+        assert bcrypt_verify.call_count == 2
+
+    def test_new_hashes_are_argon2id(self):
+        """Test that new hashes use Argon2id and need no rehash."""
+        from src.auth.jwt_handler import password_needs_rehash
+
+        hashed = get_password_hash("Argon2Password123!")
+
+        assert hashed.startswith("$argon2id$")
+        assert password_needs_rehash(hashed) is False
+
+    def test_legacy_bcrypt_hash_verifies_and_needs_rehash(self):
+        """Test that bcrypt hashes from before the switch still verify."""
+        from passlib.context import CryptContext
+        from src.auth.jwt_handler import password_needs_rehash
+
+        legacy = CryptContext(schemes=["bcrypt"]).hash("LegacyPassword123!")
+
+        assert verify_password("LegacyPassword123!", legacy) is True
+        assert password_needs_rehash(legacy) is True
+
+    def test_non_bcrypt_hash_rejected(self):
+        """Test that hashes without an Argon2id or bcrypt prefix are rejected outright."""
+        assert verify_password("password", "") is False
+        assert verify_password("password", "plaintext-password") is False
+
 
 class TestJWTTokens:
     """Test JWT token generation and validation."""
@@ -105,6 +154,31 @@ class TestJWTTokens:
         # Token should be invalid due to expiration
         assert verify_token(token) is False
 
+    def test_tampered_signature_rejected(self):
+        """Test that a token with a modified signature is rejected."""
+        token = create_access_token({"sub": "user123", "username": "testuser"})
+        header, payload, signature = token.split(".")
+        forged = signature[:-2] + ("AA" if signature[-2:] != "AA" else "BB")
+
+        assert decode_token(f"{header}.{payload}.{forged}") is None
+
+    def test_unsigned_token_rejected(self):
+        """Test that alg=none tokens are rejected."""
+        token = create_access_token({"sub": "user123", "username": "testuser"})
+        _, payload, _ = token.split(".")
+        header = "eyJhbGciOiJub25lIiwidHlwIjoiSldUIn0"  # {"alg":"none","typ":"JWT"}
+
+        assert decode_token(f"{header}.{payload}.") is None
+
+    def test_repeated_decode_cached(self):
+        """Test that a valid token is only verified once while cached."""
+        token = create_access_token({"sub": "cached-user", "username": "testuser"})
+        first = decode_token(token)
+
+        with patch("src.auth.jwt_handler._fast_decode") as fast_decode:
+            assert decode_token(token) is first
+            fast_decode.assert_not_called()
+
     def test_token_expiration_time(self):
         """Test that token expiration is set correctly."""
         data = {"sub": "user123", "username": "testuser"}
@@ -120,6 +194,14 @@ class TestJWTTokens:
         time_diff = abs((decoded.exp - expected_exp).total_seconds())
         assert time_diff < 60  # Within 1 minute
 
+    def test_decoded_expiry_timestamp(self):
+        """Test that decoded tokens carry the raw Unix expiry alongside the datetime."""
+        token = create_access_token({"sub": "user123", "username": "testuser"})
+        decoded = decode_token(token)
+
+        assert isinstance(decoded.exp_ts, int)
+        assert decoded.exp == datetime.utcfromtimestamp(decoded.exp_ts)
+
 
 class TestHeaderExtraction:
     """Test token extraction from authorization headers."""
@@ -154,6 +236,10 @@ class TestHeaderExtraction:
         # None header
         assert extract_token_from_header(None) is None
 
+        # Prefix with no token
+        assert extract_token_from_header("Bearer ") is None
+        assert extract_token_from_header("Bearertoken.string") is None
+
     def test_extract_multiple_spaces(self):
         """Test that extra spaces break extraction."""
         token = "test.token.string"
@@ -218,6 +304,24 @@ class TestAuthModels:
                 password="short"  # Too short (min 8)
             )
 
+    def test_user_in_db_from_doc(self):
+        """Test building UserInDB from a stored document dict."""
+        from src.auth.models import UserInDB
+
+        user = UserInDB.from_doc({
+            "id": "user123",
+            "username": "testuser",
+            "email": "test@example.com",
+            "hashed_password": "$2b$12$hash",
+            "created_at": datetime(2024, 1, 1),
+            "last_seen": "ignored",
+        })
+
+        assert user.id == "user123"
+        assert user.full_name is None
+        assert user.is_active is True
+        assert user.is_verified is False
+
     def test_user_login_validation(self):
         """Test UserLogin model validation."""
         from src.auth.models import UserLogin
@@ -245,5 +349,301 @@ class TestAuthModels:
         assert token.expires_in == 1800
 
 
+class TestLogin:
+    """Test the login route."""
+
+    def test_unknown_user_still_verifies_password(self):
+        """Test that an unknown username costs a bcrypt verification like a wrong password."""
+        import asyncio
+        from fastapi import HTTPException
+        from src.auth import routes
+        from src.auth.models import UserLogin
+
+        user_store = Mock()
+        user_store.get_user_by_username_async = AsyncMock(return_value=None)
+        credentials = UserLogin(username="nobody", password="SecurePass123!")
+
+        with patch("src.auth.routes.verify_password_async", return_value=False) as verify:
+            with pytest.raises(HTTPException) as exc_info:
+                asyncio.run(routes.login(credentials, user_store=user_store))
+
+        assert exc_info.value.status_code == 401
+        verify.assert_called_once_with("SecurePass123!", routes._DUMMY_HASH)
+
+    def test_legacy_hash_rehashed_on_login(self):
+        """Test that a successful login with a bcrypt hash stores an Argon2id hash."""
+        import asyncio
+        from passlib.context import CryptContext
+        from src.auth import routes
+        from src.auth.models import UserInDB, UserLogin
+
+        user = UserInDB(
+            id="user123",
+            username="legacy",
+            email="legacy@example.com",
+            hashed_password=CryptContext(schemes=["bcrypt"]).hash("SecurePass123!"),
+            created_at=datetime.utcnow(),
+        )
+        user_store = Mock()
+        user_store.get_user_by_username_async = AsyncMock(return_value=user)
+        user_store.update_password_hash_async = AsyncMock(return_value=True)
+        credentials = UserLogin(username="legacy", password="SecurePass123!")
+
+        asyncio.run(routes.login(credentials, user_store=user_store))
+
+        user_id, new_hash = user_store.update_password_hash_async.call_args.args
+        assert user_id == "user123"
+        assert new_hash.startswith("$argon2id$")
+        assert verify_password("SecurePass123!", new_hash) is True
+
+
+class TestCurrentUser:
+    """Test the bearer-token dependency."""
+
+    def test_token_validation_never_hashes_password(self):
+        """Test that resolving a token to a user does no password hashing."""
+        import asyncio
+        from src.auth.dependencies import get_current_user
+        from src.auth.models import UserInDB
+
+        user = UserInDB(
+            id="user123",
+            username="testuser",
+            email="test@example.com",
+            hashed_password="$argon2id$stored",
+            created_at=datetime.utcnow(),
+        )
+        user_store = Mock()
+        user_store.get_user_by_id_async = AsyncMock(return_value=user)
+        credentials = Mock(credentials=create_access_token(data={"sub": "user123", "username": "testuser"}))
+
+        with patch("src.auth.jwt_handler.pwd_context") as pwd_context:
+            result = asyncio.run(get_current_user(credentials, user_store=user_store))
+
+        assert result.id == "user123"
+        assert pwd_context.method_calls == []
+
+
+class TestUserStore:
+    """Test UserStore lookups, caching and listing over a mocked Firestore client."""
+
+    @pytest.fixture
+    def store(self):
+        """UserStore over a mocked Firestore client, with an empty cache."""
+        from src.auth import user_store
+
+        user_store._user_cache.clear()
+        with patch("src.auth.user_store.firestore.Client"):
+            store = user_store.UserStore()
+        yield store
+        user_store._user_cache.clear()
+
+    @staticmethod
+    def _doc(user_id="user123"):
+        doc = Mock(exists=True)
+        doc.to_dict.return_value = {
+            "id": user_id,
+            "username": "testuser",
+            "email": "test@example.com",
+            "hashed_password": "$2b$12$hash",
+            "created_at": datetime(2024, 1, 1),
+        }
+        return doc
+
+    def test_lookup_cached_under_all_keys(self, store):
+        """Test that one Firestore read serves id, username and email lookups."""
+        users = store._users_collection
+        users.document.return_value.get.return_value = self._doc()
+
+        user = store.get_user_by_id("user123")
+
+        assert store.get_user_by_id("user123") is user
+        assert store.get_user_by_username("testuser") is user
+        assert store.get_user_by_email("test@example.com") is user
+        users.document.return_value.get.assert_called_once()
+        users.where.assert_not_called()
+
+    def test_missing_user_cached_and_deactivation_invalidates(self, store):
+        """Test negative caching and invalidation on profile changes."""
+        users = store._users_collection
+        users.document.return_value.get.return_value = Mock(exists=False)
+
+        assert store.get_user_by_id("ghost") is None
+        reads = users.document.return_value.get.call_count
+        assert store.get_user_by_id("ghost") is None
+        assert users.document.return_value.get.call_count == reads
+
+        # A cached user is replaced by the written state when its profile changes
+        users.document.return_value.get.return_value = self._doc()
+        store.get_user_by_id("user123")
+        reads = users.document.return_value.get.call_count
+        assert store.deactivate_user("user123") is True
+        assert store.get_user_by_username("testuser").is_active is False
+        assert users.document.return_value.get.call_count == reads
+
+    def test_update_not_undone_by_stale_read(self, store):
+        """Test that a lookup after a profile change never returns the pre-change snapshot."""
+        from src.auth import user_store
+
+        old_doc = self._doc()
+        new_doc = self._doc()
+        new_doc.to_dict.return_value["is_active"] = False
+        new_doc.to_dict.return_value["hashed_password"] = "$argon2id$new"
+
+        def get(**kwargs):
+            # A stale read still sees the document as it was before the update
+            return old_doc if kwargs.get("read_time") is not None else new_doc
+
+        users = store._users_collection
+        users.document.return_value.get.side_effect = get
+
+        store.update_password_hash("user123", "$argon2id$new")
+        store.deactivate_user("user123")
+
+        # Uncached (e.g. another worker): the user document is read strongly
+        user = store.get_user_by_id("user123")
+        assert user.is_active is False
+        assert user.hashed_password == "$argon2id$new"
+        assert all(c.kwargs.get("read_time") is None for c in users.document.return_value.get.call_args_list)
+
+        # Cached: the written state replaces the cached user
+        user_store._user_cache.clear()
+        users.document.return_value.get.side_effect = None
+        users.document.return_value.get.return_value = old_doc
+        assert store.get_user_by_id("user123").is_active is True
+        store.deactivate_user("user123")
+        assert store.get_user_by_id("user123").is_active is False
+
+    def test_stale_index_miss_rechecked_with_strong_read(self, store):
+        """Test that an index entry missing from the stale snapshot is re-read at the current time."""
+        index_entry = Mock(exists=True)
+        index_entry.get.return_value = "user123"
+        store._username_index = Mock()
+        index_get = store._username_index.document.return_value.get
+        index_get.side_effect = [Mock(exists=False), index_entry]
+        store._users_collection.document.return_value.get.return_value = self._doc()
+
+        assert store.get_user_by_username("testuser") is not None
+
+        stale_call, strong_call = index_get.call_args_list
+        assert stale_call.kwargs["read_time"] is not None
+        assert strong_call.kwargs == {}
+        assert store._users_collection.document.return_value.get.call_args.kwargs == {}
+
+    def test_list_users_iter_projects_out_hash(self, store):
+        """Test that listings skip hashed_password unless asked for it."""
+        query = store._users_collection.limit.return_value
+        doc = self._doc()
+        del doc.to_dict.return_value["hashed_password"]
+        query.select.return_value.stream.return_value = iter([doc])
+
+        users = list(store.list_users_iter(limit=10))
+
+        assert "hashed_password" not in query.select.call_args.args[0]
+        assert [u.hashed_password for u in users] == [""]
+
+    def test_create_user_skips_reread(self, store):
+        """Test that registration writes in one transaction and serves the new user from cache."""
+        from src.auth.models import UserCreate
+
+        user_data = UserCreate(
+            email="new@example.com", username="newuser", password="SecurePass123!"
+        )
+        with patch("src.auth.user_store._create_user_txn") as create_txn, \
+                patch("src.auth.user_store.get_password_hash", return_value="$2b$12$hash"):
+            user = store.create_user(user_data)
+
+        create_txn.assert_called_once()
+        assert create_txn.call_args.args[-1]["username"] == "newuser"
+        store._users_collection.document.return_value.get.assert_not_called()
+        assert store.get_user_by_username("newuser") is user
+
+    def test_username_lookup_reads_index_then_user(self, store):
+        """Test that username lookups are two document gets, with no query."""
+        index_entry = Mock(exists=True)
+        index_entry.get.return_value = "user123"
+        store._username_index = Mock()
+        store._username_index.document.return_value.get.return_value = index_entry
+        store._users_collection.document.return_value.get.return_value = self._doc()
+
+        user = store.get_user_by_username("test_user.name")
+
+        assert user.id == "user123"
+        store._username_index.document.assert_called_once_with("test%5Fuser%2Ename")
+        store._users_collection.document.assert_called_once_with("user123")
+        store._users_collection.where.assert_not_called()
+
+    def test_async_username_lookup_shares_cache(self, store):
+        """Test that async lookups go through the AsyncClient and fill the shared cache."""
+        import asyncio
+
+        index_entry = Mock(exists=True)
+        index_entry.get.return_value = "user123"
+        doc_ref = Mock()
+        doc_ref.get = AsyncMock(side_effect=[index_entry, self._doc()])
+        store._async_client = Mock()
+        store._async_client.collection.return_value.document.return_value = doc_ref
+
+        user = asyncio.run(store.get_user_by_username_async("testuser"))
+
+        assert user.id == "user123"
+        assert doc_ref.get.await_count == 2
+        assert store.get_user_by_id("user123") is user
+        store._users_collection.document.assert_not_called()
+
+    def test_create_user_txn_checks_uniqueness_in_one_read(self):
+        """Test that username and email clashes are found with one batched read."""
+        from src.auth.user_store import _create_user_txn
+
+        transaction = Mock()
+        username_ref, email_ref = Mock(path="username_to_uid/newuser"), Mock(path="email_to_uid/taken")
+        taken = Mock(exists=True, reference=email_ref)
+        transaction.get_all.return_value = iter([Mock(exists=False, reference=username_ref), taken])
+        user_doc = {"id": "user123", "username": "newuser", "email": "taken@example.com"}
+
+        with pytest.raises(ValueError, match="Email 'taken@example.com' already exists"):
+            _create_user_txn.to_wrap(transaction, Mock(), username_ref, email_ref, user_doc)
+
+        transaction.get_all.assert_called_once_with([username_ref, email_ref])
+        transaction.create.assert_not_called()
+
+    def test_unindexed_user_found_and_indexed(self, store):
+        """Test that a user created before the lookup indexes is found by query and indexed."""
+        store._username_index = Mock()
+        index_ref = store._username_index.document.return_value
+        index_ref.get.return_value = Mock(exists=False)
+        legacy_doc = self._doc("legacy123")
+        legacy_doc.id = "legacy123"
+        query = store._users_collection.where.return_value.limit.return_value
+        query.stream.return_value = iter([legacy_doc])
+
+        user = store.get_user_by_username("testuser")
+
+        assert user.id == "legacy123"
+        assert store._users_collection.where.call_args.kwargs["filter"].field_path == "username"
+        index_ref.set.assert_called_once_with({"uid": "legacy123"})
+
+    def test_create_user_txn_rejects_unindexed_duplicate(self):
+        """Test that registration checks users missing from the lookup indexes."""
+        from src.auth.user_store import _create_user_txn
+
+        transaction = Mock()
+        username_ref, email_ref = Mock(path="username_to_uid/testuser"), Mock(path="email_to_uid/new")
+        transaction.get_all.return_value = iter([
+            Mock(exists=False, reference=username_ref), Mock(exists=False, reference=email_ref)
+        ])
+        user_ref = Mock()
+        user_ref.parent.where.side_effect = lambda filter: Mock(
+            limit=Mock(return_value=Mock(field=filter.field_path))
+        )
+        # Only the username query matches an existing (unindexed) user
+        transaction.get.side_effect = lambda query: iter([self._doc()] if query.field == "username" else [])
+        user_doc = {"id": "user123", "username": "testuser", "email": "new@example.com"}
+
+        with pytest.raises(ValueError, match="Username 'testuser' already exists"):
+            _create_user_txn.to_wrap(transaction, user_ref, username_ref, email_ref, user_doc)
+
+        transaction.create.assert_not_called()
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
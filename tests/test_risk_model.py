@@ -33,3 +33,25 @@ class TestVideoFormAndDanger:
         result = video_form_and_danger(stats)
         assert 0.0 <= result["video_danger_score"] <= 1.0
         assert 0.0 <= result["video_form_score"] <= 10.0
+
+
+class TestVideoFormAndDangerDf:
+    def test_matches_scalar_function(self):
+        """Test that the vectorized version matches video_form_and_danger row by row."""
+        import pandas as pd
+        from src.risk_model import video_form_and_danger_df
+
+        df = pd.DataFrame({
+            "round_id": ["r1", "r2", "r3", "r4", "r5", "r6"],
+            # r5 and r6 land on the 0.7 and 0.4 focus boundaries
+            "guard_down_ratio": [0.05, 0.4, 0.8, 1.5, 0.5, 0.0],
+            "pose_coverage": [0.9, 0.6, 0.3, -0.5, 0.0, 0.0],
+        })
+        result = video_form_and_danger_df(df)
+
+        for row, enriched in zip(df.to_dict("records"), result.to_dict("records")):
+            expected = video_form_and_danger(row)
+            assert enriched["video_danger_score"] == expected["video_danger_score"]
+            assert enriched["video_form_score"] == expected["video_form_score"]
+            assert enriched["video_focus_next_round"] == expected["video_focus_next_round"]
+        assert "video_danger_score" not in df
@@ -0,0 +1,43 @@
+"""
+Tests for the JSONL conversation memory store.
+
+Run with: pytest tests/test_simple_memory.py -v
+"""
+from unittest.mock import patch
+
+from src.simple_memory import SimpleMemoryStore
+
+
+class TestSimpleMemoryStore:
+    """Test recent-history reads over the JSONL file."""
+
+    def test_get_recent_filters_by_agent_and_user(self, tmp_path):
+        """Test that only the pair's last k records come back, oldest first."""
+        store = SimpleMemoryStore(str(tmp_path / "mem.jsonl"))
+        for i in range(4):
+            store.append("coach", "alice", f"a{i}")
+            store.append("coach", "bob", f"b{i}")
+
+        assert store.get_recent("coach", "alice", k=2) == ["a2", "a3"]
+        assert store.get_recent("coach", "carol", k=2) == []
+
+    def test_file_read_once_then_served_from_memory(self, tmp_path):
+        """Test that appends after the first read don't trigger another file scan."""
+        path = tmp_path / "mem.jsonl"
+        SimpleMemoryStore(str(path)).append("coach", "alice", "from disk")
+        store = SimpleMemoryStore(str(path))
+
+        assert store.get_recent("coach", "alice") == ["from disk"]
+        store.append("coach", "alice", "new")
+        with patch.object(store, "_read_records") as read_records:
+            assert store.get_recent("coach", "alice") == ["from disk", "new"]
+            read_records.assert_not_called()
+
+    def test_deep_history_falls_back_to_full_scan(self, tmp_path):
+        """Test that k beyond the in-memory window still returns every matching record."""
+        store = SimpleMemoryStore(str(tmp_path / "mem.jsonl"), recent_maxlen=2)
+        for i in range(5):
+            store.append("coach", "alice", f"a{i}")
+
+        assert store.get_recent("coach", "alice", k=2) == ["a3", "a4"]
+        assert store.get_recent("coach", "alice", k=4) == ["a1", "a2", "a3", "a4"]
@@ -0,0 +1,153 @@
+"""
+Tests for the video analyzer's frame reader.
+
+Run with: pytest tests/test_video_analyzer.py -v
+"""
+import queue
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("mediapipe")
+
+from src import video_analyzer
+from src.video_analyzer import VideoAnalyzer, _read_sampled_frames
+
+
+class _FakeCapture:
+    """
+    cv2.VideoCapture stand-in whose BGR frames are solid (n, 0, 255) for frame n.
+
+    values optionally overrides the blue channel per frame.
+    """
+
+    def __init__(self, count, shape=(36, 64, 3), values=None, fps=30.0):
+        self.count = count
+        self.shape = shape
+        self.values = values
+        self.fps = fps
+        self.pos = 0
+
+    def isOpened(self):
+        return True
+
+    def get(self, prop):
+        return self.fps if prop == video_analyzer.cv2.CAP_PROP_FPS else self.count
+
+    def grab(self):
+        if self.pos == self.count:
+            return False
+        self.pos += 1
+        return True
+
+    def retrieve(self, image=None):
+        # Like OpenCV, decode into the caller's buffer when one is passed
+        if image is None:
+            image = np.empty(self.shape, dtype=np.uint8)
+        image[...] = (self.pos if self.values is None else self.values[self.pos - 1], 0, 255)
+        return True, image
+
+    def release(self):
+        pass
+
+
+def _consume(cap, stride, max_side=0, queue_size=2, delay=0.0):
+    """
+    Run _read_sampled_frames on a reader thread and consume its queue.
+
+    Each frame is checked when received and again after delay seconds of
+    "processing", while the reader runs ahead into the ring.
+
+    Returns:
+        (sampled frame indexes, total frame count, shapes seen, distinct buffers seen)
+    """
+    frames = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    reader = threading.Thread(
+        target=_read_sampled_frames, args=(cap, stride, frames, stop, max_side), daemon=True
+    )
+    reader.start()
+    indexes, shapes, buffers = [], set(), set()
+    try:
+        while True:
+            frame_idx, rgb = frames.get(timeout=5)
+            if isinstance(rgb, Exception):
+                raise rgb
+            if rgb is None:
+                return indexes, frame_idx, shapes, len(buffers)
+            assert (rgb[..., 2] == frame_idx).all() and (rgb[..., 0] == 255).all()
+            time.sleep(delay)
+            assert (rgb[..., 2] == frame_idx).all(), f"frame {frame_idx} overwritten"
+            indexes.append(frame_idx)
+            shapes.add(rgb.shape)
+            buffers.add(id(rgb))
+    finally:
+        stop.set()
+        reader.join()
+
+
+class TestReadSampledFrames:
+    """Test the reader thread's sampling and reused RGB buffers."""
+
+    def test_stride_sampling_indices(self):
+        """Test that every stride-th frame is queued, starting with the first."""
+        indexes, total, shapes, _ = _consume(_FakeCapture(20), stride=3)
+
+        assert indexes == [1, 4, 7, 10, 13, 16, 19]
+        assert total == 20
+        assert shapes == {(36, 64, 3)}
+
+    def test_slow_consumer_keeps_own_pixels(self):
+        """Test that ring buffers are reused but never overwritten while still held."""
+        indexes, total, _, buffers = _consume(
+            _FakeCapture(40), stride=1, queue_size=2, delay=0.005
+        )
+
+        assert indexes == list(range(1, 41))
+        assert total == 40
+        # The ring did wrap around, within its maxsize + 2 slots
+        assert buffers <= 2 + 2
+
+    def test_downscaled_frames_keep_own_pixels(self):
+        """Test that the resize(dst=...) path keeps the aspect ratio and each frame's pixels."""
+        indexes, _, shapes, _ = _consume(
+            _FakeCapture(12), stride=2, max_side=32, queue_size=1, delay=0.005
+        )
+
+        assert indexes == [1, 3, 5, 7, 9, 11]
+        assert shapes == {(18, 32, 3)}
+
+
+class TestStaticFrameGate:
+    """Test that near-identical frames reuse the last inference result."""
+
+    def test_static_frames_skip_inference(self, monkeypatch):
+        """Test that only frames that differ from the last inferred one run pose detection."""
+        monkeypatch.setattr(video_analyzer, 'POSE_STATIC_FRAME_DIFF', 2.0)
+        monkeypatch.setattr(video_analyzer, 'POSE_VIDEO_DECODER', 'opencv')
+        monkeypatch.setattr(video_analyzer, 'POSE_FRAME_QUEUE_SIZE', 1)
+        cap = _FakeCapture(10, values=[10] * 6 + [200] * 4)
+        landmarks = [SimpleNamespace(x=0.5, y=0.5)] * 33
+        inferred = []
+
+        def detect(rgb, timestamp_ms):
+            inferred.append(int(rgb[0, 0, 2]))
+            return landmarks
+
+        analyzer = VideoAnalyzer(model_complexity=0)
+        try:
+            with patch.object(video_analyzer.cv2, 'VideoCapture', return_value=cap), \
+                    patch.object(analyzer, '_detect_landmarks', side_effect=detect):
+                result = analyzer.analyze_video('clip.mp4', sample_fps=0)
+        finally:
+            analyzer.close()
+
+        assert inferred == [10, 200]
+        assert result['total_frames'] == 10
+        assert result['pose_frames'] == 10
+        assert result['pose_coverage'] == 1.0